@@ -16,14 +16,20 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from config import BrainConfig
-    from brain import BiologicalBrain
+    from brain import BiologicalBrain, BiologicalBrainPopulation, FAST_FORWARD_CHUNK
+    from history import RingHistory
+    from rng import BufferedRNG
 except ImportError:
     
     from wneura.config import BrainConfig
-    from wneura.brain import BiologicalBrain
+    from wneura.brain import BiologicalBrain, BiologicalBrainPopulation, FAST_FORWARD_CHUNK
+    from wneura.history import RingHistory
+    from wneura.rng import BufferedRNG
 
 class NeuroAgent:
-    def __init__(self, action_dim: int, config: BrainConfig, history_limit: int = 1000):
+    def __init__(self, action_dim: int, config: BrainConfig, history_limit: int = 1000,
+                 use_kernel: bool = False, rng: Any = None, history_policy: Any = None,
+                 brain_history_policy: Any = None):
         """
         Nörolojik ajanı başlatır.
         
@@ -31,19 +37,29 @@ class NeuroAgent:
             action_dim (int): Yapılabilecek toplam eylem sayısı.
             config (BrainConfig): Beyin ayarları.
             history_limit (int): Geçmiş verilerin hafızada tutulacağı maksimum adım.
+            use_kernel (bool): Beyin güncellemesi için derlenmiş step kernel'ini kullan.
+            rng: Ajanın kendi rastgele akışı (BufferedRNG, Generator, SeedSequence ya da int tohum).
+            history_policy: Ajan geçmişi için kayıt politikası (bkz. recording.py; None = her adım).
+            brain_history_policy: Beyin geçmişi için ayrı bir kayıt politikası nesnesi.
         """
-        self.brain = BiologicalBrain(config)
+        self.brain = BiologicalBrain(config, use_kernel=use_kernel, history_policy=brain_history_policy)
         self.action_dim = action_dim
+        self.rng = rng if isinstance(rng, BufferedRNG) else BufferedRNG(rng)
         self.q_table = np.zeros(action_dim) 
         self.history_limit = history_limit
         
         
-        self.history = {
-            "rpe": [],
-            "q_values": [],
-            "actions": [],
-            "agency": []
-        }
+        self.history = RingHistory({
+            "rpe": np.float64,
+            "actions": np.int64,
+            "agency": np.float64
+        }, capacity=history_limit, policy=history_policy)
+
+    def reset(self):
+        """Ajanı başlangıç durumuna döndürür (Q-tablosu, beyin ve geçmiş)."""
+        self.q_table[:] = 0.0
+        self.brain.reset()
+        self.history.clear()
 
     def act(self, exploration_rate: float = 0.1) -> int:
         """
@@ -53,10 +69,12 @@ class NeuroAgent:
         
         adjusted_exploration = exploration_rate * self.brain.agency
         
-        if np.random.rand() < adjusted_exploration:
-            return np.random.randint(self.action_dim)
+        if self.rng.random() < adjusted_exploration:
+            return self.rng.randint(self.action_dim)
         
-        return int(np.argmax(self.q_table))
+        if self.action_dim == 1:
+            return 0
+        return int(self.q_table.argmax())
 
     def learn(self, action: int, reward: float) -> Dict[str, float]:
         """
@@ -67,19 +85,20 @@ class NeuroAgent:
             raise ValueError(f"Geçersiz aksiyon indeksi: {action}")
 
         
-        prediction = self.q_table[action]
+        # Python float: beyin kernel'i NumPy skalerleriyle çalıştığında adım başına birkaç µs kaybeder.
+        prediction = float(self.q_table[action])
         delta = reward - prediction 
         
        
         surprise = abs(delta)
-        self.brain.update_amygdala(surprise)
-        current_agency = self.brain.update_agency(delta)
+        current_agency = self.brain.step(surprise, delta)
         
        
         learning_efficacy = self.brain.cfg.base_learning_rate * current_agency
         
         
-        self.q_table[action] += learning_efficacy * delta
+        q_value = prediction + learning_efficacy * delta
+        self.q_table[action] = q_value
         
         
         self._update_history(delta, action, current_agency)
@@ -89,19 +108,178 @@ class NeuroAgent:
             "agency": float(current_agency),
             "cortisol": float(self.brain.cortisol),
             "learning_efficacy": float(learning_efficacy),
-            "q_value": float(self.q_table[action])
+            "q_value": float(q_value)
+        }
+
+    def fast_forward(self, k: int, reward: float, exploration_rate: float = 0.1) -> Dict[str, float]:
+        """
+        Sabit ödülle k adım ilerler; `learn(act(exploration_rate), reward)` döngüsünün k kez
+        çalıştırılmasıyla bit-bit aynı sonucu (Q-tablosu, beyin, geçmiş ve RNG konumu) verir.
+
+        Q-tablosunun donduğu aralıklarda (güncelleme yuvarlamayla sıfırlanıyor ya da agency == 0)
+        beyin sabit girdiyle BiologicalBrain.fast_forward üzerinden ilerletilir; act()'in RNG
+        tüketimi ve keşif eylemleri BufferedRNG.explore ile vektörel taklit edilir.
+        Diğer adımlar tek tek koşturulur.
+
+        Returns:
+            Son adımın learn() çıktısıyla aynı sözlük.
+        """
+        remaining = int(k)
+        rate = exploration_rate
+        lr = self.brain.cfg.base_learning_rate
+        info = None
+        while remaining > 0:
+            action = int(np.argmax(self.q_table))
+            q = self.q_table[action]
+            delta = reward - q
+
+            # Q güncellemesi erişilebilir en büyük agency'de bile yuvarlamayla sıfırlanıyorsa Q donar
+            # (yuvarlama monoton: daha küçük agency de sıfırlanır). Keşif eylemi ise yalnızca tek
+            # eylemli ajanda, rate == 0 iken ya da tüm Q değerleri eşitken girdiyi değiştirmez.
+            frozen = (q + (lr * max(1.0, self.brain.agency)) * delta == q
+                      and (self.action_dim == 1 or rate == 0 or bool(np.all(self.q_table == q))))
+            # agency == 0: keşif olasılığı ve öğrenme etkinliği sıfır; agency yükseldiği adımda durulur.
+            helpless = not frozen and self.brain.agency == 0.0
+            if not (frozen or helpless):
+                info = self.learn(self.act(rate), reward)
+                remaining -= 1
+                continue
+
+            previous = [self.brain.agency]
+
+            def advance(agencies, count):
+                if np.ndim(agencies) == 0 and count > FAST_FORWARD_CHUNK:
+                    # Sabit noktadaki uzun kuyruk: eylem dizileri parça parça üretilir.
+                    for start in range(0, count, FAST_FORWARD_CHUNK):
+                        advance(agencies, min(FAST_FORWARD_CHUNK, count - start))
+                    return
+                actions = action
+                if rate:
+                    before = np.r_[previous[0], agencies[:-1]] if np.ndim(agencies) else agencies
+                    if self.action_dim > 1:
+                        explored, draws = self.rng.explore(count, rate * before)
+                        if len(explored):
+                            actions = np.full(count, action, dtype=np.int64)
+                            actions[explored] = np.minimum((draws * self.action_dim).astype(np.int64),
+                                                           self.action_dim - 1)
+                    else:
+                        self.rng.skip(count, rate * before)
+                else:
+                    self.rng.skip(count)
+                previous[0] = agencies[-1] if np.ndim(agencies) else agencies
+                self.history.extend(delta, actions, agencies, count=count)
+
+            steps = self.brain._fast_forward(remaining, abs(delta), delta,
+                                             stop_above=None if frozen else 0.0, on_agency=advance)
+            if helpless:
+                self.q_table[action] += (lr * self.brain.agency) * delta
+            remaining -= steps
+            info = None
+
+        if info is None:
+            current_agency = self.brain.agency
+            info = {
+                "rpe": float(delta),
+                "agency": float(current_agency),
+                "cortisol": float(self.brain.cortisol),
+                "learning_efficacy": float(self.brain.cfg.base_learning_rate * current_agency),
+                "q_value": float(self.q_table[action])
+            }
+        return info
+
+    def consolidate(self, batch: Any, memory: Any = None, weights: Any = None,
+                    update_brain: bool = False, reduction: str = "mean") -> Dict[str, Any]:
+        """
+        Rüya modu (uyku konsolidasyonu): Hipokampüs replay partisini tek seferde Q-tablosuna işler.
+
+        Tüm RPE'ler parti başındaki Q değerlerine göre hesaplanır ve güncellemeler
+        np.add.at ile eylem başına toplanır; anı başına beyin güncellemesi yapılmaz.
+        Eylem başına tek anıda "mean" indirgemesi learn()'ün Q güncellemesiyle aynıdır.
+
+        Args:
+            batch: Hippocampus.get_replay_batch() listesi (MemoryTrace), ColumnarHippocampus
+                   kolon sözlüğü (get_replay_batch / sample) ya da 'memory' ile slot indeksleri.
+            memory: İndeks verildiğinde kolonları toplayacak ColumnarHippocampus.
+            weights: Anı başına ağırlık (varsayılan: partideki 'weights' kolonu ya da 1).
+            update_brain: True ise ortalama sürpriz/RPE ile tek bir toplu amigdala/agency güncellemesi.
+            reduction: "mean" (eylem başına ağırlıklı ortalama RPE) ya da "sum" (anı başına tam adım).
+
+        Returns:
+            {"replayed", "rpe", "agency", "cortisol", "learning_efficacy", "q_table"}
+        """
+        if reduction not in ("mean", "sum"):
+            raise ValueError(f"Bilinmeyen indirgeme: {reduction}")
+
+        if isinstance(batch, dict):
+            columns = batch
+        elif memory is not None:
+            columns = memory.gather(batch)
+        else:
+            columns = {
+                "action": [m.action for m in batch],
+                "reward": [m.reward for m in batch]
+            }
+        actions = np.asarray(columns["action"], dtype=np.intp)
+        rewards = np.asarray(columns["reward"], dtype=np.float64)
+        if weights is None:
+            weights = columns.get("weights", 1.0)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), actions.shape)
+
+        if np.any(actions >= self.action_dim) or np.any(actions < 0):
+            raise ValueError("Replay partisinde geçersiz aksiyon indeksi.")
+
+        replayed = len(actions)
+        mean_rpe = 0.0
+        learning_efficacy = self.brain.cfg.base_learning_rate * self.brain.agency
+        if replayed:
+            deltas = rewards - self.q_table[actions]
+            totals = np.zeros(self.action_dim)
+            np.add.at(totals, actions, weights * deltas)
+            if reduction == "mean":
+                mass = np.zeros(self.action_dim)
+                np.add.at(mass, actions, weights)
+                totals = np.divide(totals, mass, out=np.zeros_like(totals), where=mass > 0)
+            self.q_table += learning_efficacy * totals
+
+            weight_sum = weights.sum()
+            if weight_sum > 0:
+                mean_rpe = float(np.dot(weights, deltas) / weight_sum)
+                if update_brain:
+                    surprise = float(np.dot(weights, np.abs(deltas)) / weight_sum)
+                    self.brain.step(surprise, mean_rpe)
+
+        return {
+            "replayed": replayed,
+            "rpe": mean_rpe,
+            "agency": float(self.brain.agency),
+            "cortisol": float(self.brain.cortisol),
+            "learning_efficacy": float(learning_efficacy),
+            "q_table": self.q_table.copy()
         }
 
     def _update_history(self, rpe, action, agency):
-        """Yardımcı Fonksiyon: Geçmişi kaydeder ve belleği temizler."""
-        self.history["rpe"].append(float(rpe))
-        self.history["actions"].append(int(action))
-        self.history["agency"].append(float(agency))
-       
-        if len(self.history["rpe"]) > self.history_limit:
-            self.history["rpe"].pop(0)
-            self.history["actions"].pop(0)
-            self.history["agency"].pop(0)
+        """Yardımcı Fonksiyon: Geçmişi sabit kapasiteli ring buffer'a kaydeder (O(1))."""
+        self.history.append(rpe, action, agency)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için tam durum: Q-tablosu, beyin, geçmiş ve RNG akışı."""
+        return {
+            "q_table": self.q_table.copy(),
+            "brain": self.brain.state_dict(),
+            "history": self.history.state_dict(),
+            "rng": self.rng.state_dict()
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        q_table = np.asarray(state["q_table"], dtype=float)
+        if q_table.shape != self.q_table.shape:
+            raise ValueError(f"Q-tablosu boyutu uyuşmuyor: {q_table.shape} != {self.q_table.shape}")
+        self.q_table[:] = q_table
+        self.brain.load_state_dict(state["brain"])
+        self.history.load_state_dict(state["history"])
+        if "rng" in state:
+            self.rng.load_state_dict(state["rng"])
 
     def save_state(self, filepath: str):
         """Ajanın beynini ve öğrendiklerini JSON olarak kaydeder."""
@@ -110,6 +288,7 @@ class NeuroAgent:
             "brain_state": {
                 "agency": self.brain.agency,
                 "cortisol": self.brain.cortisol,
+                "resistance": self.brain._resistance,
                 "amygdala": self.brain.amygdala
             }
         }
@@ -127,12 +306,82 @@ class NeuroAgent:
             state = json.load(f)
             
         self.q_table = np.array(state["q_table"])
-        self.brain.agency = state["brain_state"]["agency"]
-        self.brain.cortisol = state["brain_state"]["cortisol"]
+        self.brain._agency = state["brain_state"]["agency"]
+        self.brain._cortisol = state["brain_state"]["cortisol"]
+        self.brain._resistance = state["brain_state"].get("resistance", 1.0)
         self.brain.amygdala = state["brain_state"]["amygdala"]
         print(f"♻️ Beyin durumu geri yüklendi: {filepath}")
 
 
+class NeuroAgentPopulation:
+    def __init__(self, size: int, action_dim: int, config: Any, rng: Any = None):
+        """
+        N adet NeuroAgent'ı tek seferde çalıştıran toplu (batched) ajan.
+        Q-tabloları (N, action_dim) matrisinde, beyinler BiologicalBrainPopulation'da tutulur.
+
+        Args:
+            size (int): Ajan sayısı (N).
+            action_dim (int): Yapılabilecek toplam eylem sayısı.
+            config: Tek bir BrainConfig ya da ajan başına bir config listesi.
+            rng: Popülasyonun rastgele akışı (np.random.Generator, SeedSequence ya da int tohum).
+        """
+        self.brain = BiologicalBrainPopulation(config, size)
+        self.size = self.brain.size
+        self.action_dim = action_dim
+        self.q_table = np.zeros((self.size, action_dim))
+        self._rows = np.arange(self.size)
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def act(self, exploration_rate: float = 0.1) -> np.ndarray:
+        """
+        Tüm ajanlar için eylem seçer (vektörel Epsilon-Greedy).
+        Keşif olasılığı her ajan için kendi agency değeriyle ölçeklenir.
+        """
+        adjusted_exploration = exploration_rate * self.brain.agency
+
+        explore = self.rng.random(self.size) < adjusted_exploration
+        random_actions = self.rng.integers(self.action_dim, size=self.size)
+        greedy_actions = np.argmax(self.q_table, axis=1)
+
+        return np.where(explore, random_actions, greedy_actions)
+
+    def learn(self, actions, rewards) -> Dict[str, np.ndarray]:
+        """
+        Tüm ajanlar için RPE güncellemesini fancy indexing ile uygular.
+
+        Args:
+            actions: (N,) eylem indeksleri.
+            rewards: Skaler ya da (N,) ödül dizisi.
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        if actions.shape != (self.size,):
+            raise ValueError(f"Aksiyon dizisi boyutu hatalı: {actions.shape}, beklenen ({self.size},)")
+        if np.any(actions >= self.action_dim) or np.any(actions < 0):
+            raise ValueError("Geçersiz aksiyon indeksi.")
+
+        prediction = self.q_table[self._rows, actions]
+        delta = rewards - prediction
+
+        surprise = np.abs(delta)
+        self.brain.update_amygdala(surprise)
+        current_agency = self.brain.update_agency(delta)
+
+        learning_efficacy = self.brain.base_learning_rate * current_agency
+
+        self.q_table[self._rows, actions] += learning_efficacy * delta
+
+        return {
+            "rpe": delta,
+            "agency": current_agency.copy(),
+            "cortisol": self.brain.cortisol.copy(),
+            "learning_efficacy": learning_efficacy,
+            "q_value": self.q_table[self._rows, actions]
+        }
+
+
 if __name__ == "__main__":
     print("🧪 Agent Modülü Test Ediliyor...", flush=True)
     
@@ -0,0 +1,336 @@
+"""
+WNEURA BENCHMARK SUITE v1.0
+Developer: Efeatagul
+
+Description:
+    Motorun sıcak yollarının (hot path) bileşen bazında throughput ölçümü.
+        - brain.*        : BiologicalBrain update_amygdala + update_agency (ve fused kernel)
+        - agent.*        : NeuroAgent act + learn
+        - chemistry.*    : NeuroChemistry.update (ve NeuroChemistryPopulation, sinaps başına)
+        - hippocampus.*  : encode_experience / decay_memories / get_replay_batch (çeşitli kapasiteler)
+                           ve recall (durum benzerliği, 10^5 anı)
+        - runner.*       : Uçtan uca 'python runner.py' (1e3 .. 1e7 adım, binary çıktı)
+
+    Her ölçüm 'repeats' kez tekrarlanır ve en iyi süre alınır (gürültüye karşı).
+    Sonuçlar makinece okunabilir bir JSON baseline'a yazılır; --compare modu yeni
+    ölçümleri baseline ile karşılaştırır ve eşiği aşan yavaşlamaları işaretler
+    (regresyon varsa çıkış kodu 1).
+
+Kullanım:
+    py benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    py benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --threshold 0.15
+    py benchmarks/run_benchmarks.py --only brain,agent --quick
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from config import BrainConfig
+from brain import BiologicalBrain
+from agent import NeuroAgent
+from neuromodulator import NeuroChemistry, NeuroChemistryPopulation
+from hippocampus import Hippocampus, ColumnarHippocampus
+
+
+BASELINE_VERSION = 1
+HIPPOCAMPUS_CAPACITIES = (50, 500, 5000)
+RECALL_CAPACITY = 100_000
+RECALL_STATE_DIM = 4
+RUNNER_STEPS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+_BENCHMARKS: Dict[str, Callable[[float], Dict[str, float]]] = {}
+
+
+def benchmark(name: str):
+    """Ölçüm fonksiyonunu kaydeder. Fonksiyon (scale) alır, {"ops", "seconds"} döndürür."""
+    def register(fn):
+        _BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def _quiet():
+    """Başlatma banner'larını bastırır."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _timed(fn: Callable[[], Any], ops: int) -> Dict[str, float]:
+    t0 = time.perf_counter()
+    fn()
+    return {"ops": ops, "seconds": time.perf_counter() - t0}
+
+
+def _inputs(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, 6, n).tolist(), rng.uniform(-5, 5, n).tolist()
+
+
+@benchmark("brain.update")
+def bench_brain_update(scale: float):
+    n = int(200_000 * scale)
+    surprises, rpes = _inputs(n)
+    with _quiet():
+        brain = BiologicalBrain(BrainConfig(), history_limit=1000)
+
+    def run():
+        for s, r in zip(surprises, rpes):
+            brain.update_amygdala(s)
+            brain.update_agency(r)
+    return _timed(run, n)
+
+
+@benchmark("brain.step_kernel")
+def bench_brain_kernel(scale: float):
+    n = int(200_000 * scale)
+    surprises, rpes = _inputs(n)
+    with _quiet():
+        brain = BiologicalBrain(BrainConfig(), history_limit=1000, use_kernel=True)
+
+    def run():
+        for s, r in zip(surprises, rpes):
+            brain.step(s, r)
+    return _timed(run, n)
+
+
+@benchmark("agent.act_learn")
+def bench_agent(scale: float):
+    n = int(100_000 * scale)
+    rewards = np.random.default_rng(1).integers(-5, 5, n).tolist()
+    with _quiet():
+        agent = NeuroAgent(action_dim=4, config=BrainConfig(), rng=0)
+
+    def run():
+        for reward in rewards:
+            agent.learn(agent.act(), reward)
+    return _timed(run, n)
+
+
+@benchmark("chemistry.update")
+def bench_chemistry(scale: float):
+    n = int(200_000 * scale)
+    rewards, stress = _inputs(n, seed=2)
+    with _quiet():
+        chem = NeuroChemistry()
+
+    def run():
+        for r, s in zip(rewards, stress):
+            chem.update(r, s / 6.0, True)
+    return _timed(run, n)
+
+
+@benchmark("chemistry.population_1024")
+def bench_chemistry_population(scale: float):
+    calls = int(2_000 * scale)
+    size = 1024
+    rng = np.random.default_rng(3)
+    rewards = rng.uniform(-5, 5, (calls, size))
+    stress = rng.uniform(0, 1, (calls, size))
+    chem = NeuroChemistryPopulation(size)
+
+    def run():
+        for r, s in zip(rewards, stress):
+            chem.update(r, s, True)
+    return _timed(run, calls * size)
+
+
+def _hippocampus_benchmarks(cls, label: str, capacity: int):
+    def _filled(decay_rate: float):
+        with _quiet():
+            hippo = cls(capacity=capacity, decay_rate=decay_rate)
+        rng = np.random.default_rng(4)
+        for step, (s, c) in enumerate(zip(rng.uniform(0, 5, capacity).tolist(), rng.uniform(0, 1, capacity).tolist())):
+            hippo.encode_experience(step, None, 0, 1.0, s, c)
+        return hippo
+
+    @benchmark(f"hippocampus.{label}.encode_{capacity}")
+    def bench_encode(scale: float):
+        n = int(50_000 * scale)
+        hippo = _filled(0.05)
+        surprises, cortisol = _inputs(n, seed=5)
+
+        def run():
+            for step, (s, c) in enumerate(zip(surprises, cortisol)):
+                hippo.encode_experience(step, None, 0, 1.0, s, c / 6.0)
+        return _timed(run, n)
+
+    @benchmark(f"hippocampus.{label}.decay_{capacity}")
+    def bench_decay(scale: float):
+        n = int(50_000 * scale)
+        hippo = _filled(1e-6)
+
+        def run():
+            for _ in range(n):
+                hippo.decay_memories()
+        return _timed(run, n)
+
+    @benchmark(f"hippocampus.{label}.replay_{capacity}")
+    def bench_replay(scale: float):
+        n = int(20_000 * scale)
+        hippo = _filled(0.05)
+
+        def run():
+            for _ in range(n):
+                hippo.get_replay_batch(batch_size=32)
+        return _timed(run, n)
+
+
+for _capacity in HIPPOCAMPUS_CAPACITIES:
+    _hippocampus_benchmarks(Hippocampus, "heap", _capacity)
+    _hippocampus_benchmarks(ColumnarHippocampus, "columnar", _capacity)
+
+
+@benchmark(f"hippocampus.columnar.recall_{RECALL_CAPACITY}")
+def bench_recall(scale: float):
+    n = int(5_000 * scale)
+    with _quiet():
+        hippo = ColumnarHippocampus(capacity=RECALL_CAPACITY, decay_rate=0.0, state_dim=RECALL_STATE_DIM)
+    rng = np.random.default_rng(6)
+    states = rng.normal(size=(RECALL_CAPACITY + n, RECALL_STATE_DIM))
+    surprises = rng.uniform(0, 5, RECALL_CAPACITY + n).tolist()
+    for step in range(RECALL_CAPACITY):
+        hippo.encode_experience(step, states[step], 0, 1.0, surprises[step], 0.5)
+    queries = rng.normal(size=(n, RECALL_STATE_DIM))
+    hippo.recall(queries[0], k=10)
+
+    def run():
+        # Adım döngüsündeki gibi: her adımda bir yeni anı + bir hatırlama sorgusu.
+        for i in range(n):
+            step = RECALL_CAPACITY + i
+            hippo.encode_experience(step, states[step], 0, 1.0, surprises[step], 0.5)
+            hippo.recall(queries[i], k=10)
+    return _timed(run, n)
+
+
+def _runner_benchmark(steps: int):
+    @benchmark(f"runner.end_to_end_{steps:.0e}".replace("+0", "").replace("+", ""))
+    def bench_runner(scale: float):
+        with tempfile.TemporaryDirectory() as tmp:
+            command = [sys.executable, os.path.join(ROOT, "runner.py"), "--steps", str(steps),
+                       "--format", "binary", "--seed", "0", "--output", os.path.join(tmp, "bench.wnt")]
+            t0 = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return {"ops": steps, "seconds": time.perf_counter() - t0}
+    bench_runner.max_steps = steps
+
+
+for _steps in RUNNER_STEPS:
+    _runner_benchmark(_steps)
+
+
+def run_benchmarks(names: List[str], scale: float = 1.0, repeats: int = 3) -> Dict[str, Any]:
+    """Seçilen ölçümleri koşturur; her biri için en iyi süreyi (ops/sn) döndürür."""
+    results = {}
+    for name in names:
+        fn = _BENCHMARKS[name]
+        best = None
+        runs = 1 if name.startswith("runner.") else repeats
+        for _ in range(runs):
+            sample = fn(scale)
+            if best is None or sample["seconds"] < best["seconds"]:
+                best = sample
+        best["ops_per_sec"] = best["ops"] / best["seconds"] if best["seconds"] > 0 else float("inf")
+        results[name] = best
+        print(f"   {name:<40} {best['ops_per_sec']:>14,.0f} ops/s", flush=True)
+
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.time(),
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "scale": scale,
+        "results": results
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.15) -> List[str]:
+    """
+    Throughput'u baseline ile karşılaştırır.
+
+    Returns:
+        (1 - threshold) oranının altına düşen ölçümlerin adları.
+    """
+    regressions = []
+    if baseline.get("scale") != current.get("scale"):
+        print(f"⚠️ Scale mismatch (baseline={baseline.get('scale')}, current={current.get('scale')}); fixed overheads may skew ratios.")
+    if baseline.get("machine") != current.get("machine"):
+        print("⚠️ Baseline was recorded on a different machine/environment.")
+    print(f"\n{'BENCHMARK':<40} {'BASELINE':>14} {'CURRENT':>14} {'RATIO':>8}")
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<40} {'-':>14} {result['ops_per_sec']:>14,.0f} {'new':>8}")
+            continue
+        ratio = result["ops_per_sec"] / base["ops_per_sec"]
+        flag = ""
+        if ratio < 1.0 - threshold:
+            regressions.append(name)
+            flag = "  ❌ REGRESSION"
+        print(f"{name:<40} {base['ops_per_sec']:>14,.0f} {result['ops_per_sec']:>14,.0f} {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def select(only: Optional[str], max_runner_steps: int) -> List[str]:
+    """--only önek listesine ve runner adım sınırına göre ölçüm adlarını seçer."""
+    prefixes = [p.strip() for p in only.split(",")] if only else None
+    names = []
+    for name, fn in _BENCHMARKS.items():
+        if prefixes and not any(name.startswith(p) for p in prefixes):
+            continue
+        if getattr(fn, "max_steps", 0) > max_runner_steps:
+            continue
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WNEURA Benchmark Suite")
+    parser.add_argument('--output', type=str, default=None, help='Sonuçların yazılacağı baseline JSON dosyası')
+    parser.add_argument('--compare', type=str, default=None, help='Karşılaştırılacak baseline JSON dosyası')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Regresyon eşiği (0.15 = %%15 yavaşlama)')
+    parser.add_argument('--only', type=str, default=None, help='Virgülle ayrılmış ad önekleri (ör. brain,hippocampus.columnar)')
+    parser.add_argument('--repeats', type=int, default=3, help='Ölçüm tekrarı (en iyi süre alınır)')
+    parser.add_argument('--quick', action='store_true', help='Döngüleri 10 kat kısalt (duman testi)')
+    parser.add_argument('--max_runner_steps', type=float, default=1e6, help='Uçtan uca runner için en büyük adım sayısı (1e7 dahil etmek için 1e7)')
+    args = parser.parse_args()
+
+    names = select(args.only, int(args.max_runner_steps))
+    scale = 0.1 if args.quick else 1.0
+    print(f"⏱️ WNEURA BENCHMARKS: {len(names)} benchmarks (scale={scale})")
+    current = run_benchmarks(names, scale=scale, repeats=args.repeats)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=4)
+        print(f"💾 Baseline saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
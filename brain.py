@@ -13,7 +13,7 @@ import json
 import os
 import sys
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Optional
 
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -26,17 +26,63 @@ except ImportError:
     class BrainConfig:
         pass
 
+try:
+    from history import RingHistory, monotonic_timestamp
+    from kernel import compile_step_kernel
+except ImportError:
+    from wneura.history import RingHistory, monotonic_timestamp
+    from wneura.kernel import compile_step_kernel
+
+
+FAST_FORWARD_CHUNK = 4096
+
+
+def _clipped_accumulate(start: float, deltas: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    [DAHİLİ] x = clip(x + d, low, high) özyinelemesini sıralı olarak (bit-bit aynı) hesaplar.
+    np.add.accumulate soldan sağa toplar; yalnızca sınır geçişlerinde yeniden başlatılır.
+    Sınırda dururken dışarı iten adımlar (ör. agency = 1.0 iken d >= 0) tek seferde atlanır.
+    """
+    n = len(deltas)
+    out = np.empty(n)
+    x = start
+    i = 0
+    while i < n:
+        if x == high or x == low:
+            outward = deltas[i:] >= 0 if x == high else deltas[i:] <= 0
+            run = n - i if outward.all() else int(np.argmin(outward))
+            out[i:i + run] = x
+            i += run
+            if i >= n:
+                break
+
+        path = np.add.accumulate(np.r_[x, deltas[i:]])[1:]
+        crossed = np.flatnonzero((path < low) | (path > high))
+        if not crossed.size:
+            out[i:] = path
+            break
+        j = int(crossed[0])
+        out[i:i + j] = path[:j]
+        x = min(max(path[j], low), high)
+        out[i + j] = x
+        i += j + 1
+    return out
+
 class BiologicalBrain:
-    def __init__(self, config: Any, history_limit: int = 1000):
+    def __init__(self, config: Any, history_limit: int = 1000, use_kernel: bool = False,
+                 history_policy: Any = None):
         """
         Biyolojik motoru başlatır.
         
         Args:
             config: Ayar nesnesi (BrainConfig).
             history_limit: RAM koruması için tutulacak maksimum log sayısı.
+            use_kernel: True ise step() derlenmiş (fused) adım kernel'ini kullanır.
+            history_policy: Geçmiş için kayıt politikası (bkz. recording.py; None = her adım).
         """
         self.cfg = config
         self.history_limit = history_limit
+        self._kernel = compile_step_kernel(config) if use_kernel else None
         
         
         self.amygdala = 0.0 
@@ -53,13 +99,13 @@ class BiologicalBrain:
             print(f"⚠️ DİKKAT: Erosion ({erosion}) <= Repair ({repair}). Hysteresis oluşmayabilir!")
 
        
-        self.history = {
-            "timestamp": [],
-            "cortisol": [],
-            "agency": [],
-            "delta_agency": [],
-            "resistance": []
-        }
+        self.history = RingHistory({
+            "timestamp": np.int64,
+            "cortisol": np.float64,
+            "agency": np.float64,
+            "delta_agency": np.float64,
+            "resistance": np.float64
+        }, capacity=history_limit, policy=history_policy)
         
         print(f"[{datetime.now().strftime('%H:%M:%S')}] 🧠 WNEURA Brain Initialized. Agency: {self._agency:.2f}")
 
@@ -84,7 +130,7 @@ class BiologicalBrain:
             self._resistance += 0.01 
         
        
-        self._resistance = np.clip(self._resistance, 0.5, 1.5)
+        self._resistance = min(max(self._resistance, 0.5), 1.5)
 
     def update_amygdala(self, surprise_signal: float) -> float:
         """
@@ -105,7 +151,7 @@ class BiologicalBrain:
         
     
         self._cortisol = (self._cortisol * cortisol_decay) + synthesis
-        self._cortisol = np.clip(self._cortisol, 0.0, 1.0)
+        self._cortisol = min(max(self._cortisol, 0.0), 1.0)
         
         return self._cortisol
 
@@ -137,25 +183,190 @@ class BiologicalBrain:
         self._agency += d_agency
         
         
-        self._agency = np.clip(self._agency, 0.0, 1.0)
+        self._agency = min(max(self._agency, 0.0), 1.0)
         
        
         self._log_state(d_agency)
         
         return self._agency
 
+    def compile_kernel(self):
+        """Config'i dondurup step() için fused kernel'i (yeniden) derler."""
+        self._kernel = compile_step_kernel(self.cfg)
+
+    def step(self, surprise_signal: float, rpe: float) -> float:
+        """
+        Tek adım: update_amygdala + update_agency.
+        Kernel derlenmişse iki güncelleme tek bir float çağrısında yapılır (bit-bit aynı sonuç).
+        """
+        if self._kernel is None:
+            self.update_amygdala(surprise_signal)
+            return self.update_agency(rpe)
+
+        self.amygdala = float(surprise_signal)
+        self._cortisol, self._resistance, self._agency, d_agency = self._kernel(
+            self._cortisol, self._resistance, self._agency, surprise_signal, rpe
+        )
+        self._log_state(d_agency)
+        return self._agency
+
+    def fast_forward(self, k: int, surprise_signal: float, rpe: float) -> float:
+        """
+        Sabit girdiyle k adım ilerler; step(surprise_signal, rpe)'nin k kez çağrılmasıyla
+        bit-bit aynı durumu (ve history'yi, zaman damgaları hariç) üretir.
+
+        - surprise == 0: Kortizolün geometrik sönümü, direncin çarpımsal/doğrusal rampası ve
+          agency'nin onarım/aşınma adımları parça parça NumPy accumulate ile hesaplanır.
+        - surprise > 0: Kortizol ve direnç sabitlenene kadar adım adım, sonrasında agency
+          sabit adımla (clip sınırlarında yeniden başlatılarak) birikimli hesaplanır.
+        Durum tam bir kayan nokta sabit noktasına oturduğunda kalan adımlar O(1)'de atlanır.
+        """
+        self._fast_forward(int(k), float(surprise_signal), float(rpe))
+        return self._agency
+
+    def _fast_forward(self, k: int, surprise: float, rpe: float, stop_above: Optional[float] = None,
+                      on_agency: Optional[Callable[[Any, int], None]] = None) -> int:
+        """
+        [DAHİLİ] fast_forward çekirdeği.
+
+        Args:
+            stop_above: Verilirse agency bu değeri ilk aştığı adımda (o adım dahil) durulur.
+            on_agency: Her parça için (agency dizisi ya da sabit değer, adım sayısı) ile çağrılır.
+
+        Returns:
+            İlerlenen adım sayısı.
+        """
+        if k <= 0:
+            return 0
+
+        decay = float(getattr(self.cfg, 'cortisol_decay', 0.9))
+        gain = float(getattr(self.cfg, 'amygdala_gain', 0.1))
+        analytic = surprise == 0.0 and 0.0 <= decay <= 1.0 and gain >= 0.0
+        kernel = self._kernel or compile_step_kernel(self.cfg)
+        self.amygdala = surprise
+
+        done = 0
+        while done < k:
+            n = min(k - done, FAST_FORWARD_CHUNK)
+            before = (self._cortisol, self._resistance, self._agency)
+            if analytic:
+                c, r, a, d = self._decay_trajectory(n, rpe)
+            else:
+                c, r, a, d = self._stepped_trajectory(n, surprise, rpe, kernel)
+
+            stopped = False
+            if stop_above is not None:
+                over = np.flatnonzero(a > stop_above)
+                if over.size:
+                    n = int(over[0]) + 1
+                    c, r, a, d = c[:n], r[:n], a[:n], d[:n]
+                    stopped = True
+
+            self.history.extend(monotonic_timestamp(), c, a, d, r)
+            self._cortisol, self._resistance, self._agency = float(c[-1]), float(r[-1]), float(a[-1])
+            done += n
+            if on_agency is not None:
+                on_agency(a, n)
+            if stopped:
+                break
+
+            if n > 1:
+                before = (c[-2], r[-2], a[-2])
+            if done < k and before == (c[-1], r[-1], a[-1]):
+                rest = k - done
+                self.history.extend(monotonic_timestamp(), c[-1], a[-1], d[-1], r[-1], count=rest)
+                if on_agency is not None:
+                    on_agency(float(a[-1]), rest)
+                done = k
+
+        return done
+
+    def _decay_trajectory(self, n: int, rpe: float):
+        """[DAHİLİ] surprise == 0 için n adımlık (kortizol, direnç, agency, d_agency) dizileri."""
+        decay = float(getattr(self.cfg, 'cortisol_decay', 0.9))
+        stress_threshold = getattr(self.cfg, 'stress_threshold', 0.5)
+        erosion_rate = getattr(self.cfg, 'erosion_rate', 0.01)
+        mastery_threshold = getattr(self.cfg, 'mastery_threshold', 0.1)
+        repair_rate = getattr(self.cfg, 'repair_rate', 0.02)
+
+        cortisol = np.multiply.accumulate(np.r_[self._cortisol, np.full(n, decay)])[1:]
+
+        # Kortizol azalan olduğu için burnout (> 0.8) adımları her zaman baştaki bir öneki oluşturur.
+        previous = np.r_[self._cortisol, cortisol[:-1]]
+        burnout = int(np.count_nonzero(previous > 0.8))
+        resistance = np.empty(n)
+        start = self._resistance
+        if burnout:
+            resistance[:burnout] = np.maximum(
+                np.multiply.accumulate(np.r_[start, np.full(burnout, 0.99)])[1:], 0.5)
+            start = resistance[burnout - 1]
+        if burnout < n:
+            resistance[burnout:] = np.minimum(
+                np.add.accumulate(np.r_[start, np.full(n - burnout, 0.01)])[1:], 1.5)
+
+        stress_gap = cortisol - stress_threshold
+        erosion_factor = np.where(stress_gap > 0, erosion_rate * np.float_power(stress_gap, 2) * 5.0, 0.0)
+        repair_factor = repair_rate if rpe > mastery_threshold else 0.0
+        d_agency = repair_factor - erosion_factor
+
+        agency = _clipped_accumulate(self._agency, d_agency, 0.0, 1.0)
+        return cortisol, resistance, agency, d_agency
+
+    def _stepped_trajectory(self, n: int, surprise: float, rpe: float, kernel):
+        """[DAHİLİ] Kortizol/direnç sabitlenene kadar adım adım, sonra agency birikimli."""
+        cortisol, resistance, agency, d_agency = np.empty(n), np.empty(n), np.empty(n), np.empty(n)
+        c, r, a = self._cortisol, self._resistance, self._agency
+        i = 0
+        settled = False
+        while i < n and not settled:
+            c_next, r_next, a, d = kernel(c, r, a, surprise, rpe)
+            settled = c_next == c and r_next == r
+            c, r = c_next, r_next
+            cortisol[i], resistance[i], agency[i], d_agency[i] = c, r, a, d
+            i += 1
+
+        if i < n:
+            cortisol[i:] = c
+            resistance[i:] = r
+            d_agency[i:] = d
+            agency[i:] = _clipped_accumulate(a, d_agency[i:], 0.0, 1.0)
+        return cortisol, resistance, agency, d_agency
+
     def _log_state(self, delta_agency):
-        """Geçmişi kaydeder ve RAM şişmesini önler."""
-        self.history["timestamp"].append(datetime.now().isoformat())
-        self.history["cortisol"].append(float(self._cortisol))
-        self.history["agency"].append(float(self._agency))
-        self.history["delta_agency"].append(float(delta_agency))
-        self.history["resistance"].append(float(self._resistance))
+        """Geçmişi sabit kapasiteli ring buffer'a kaydeder (O(1), RAM sabit)."""
+        self.history.append(
+            monotonic_timestamp(),
+            self._cortisol,
+            self._agency,
+            delta_agency,
+            self._resistance
+        )
 
-       
-        if len(self.history["timestamp"]) > self.history_limit:
-            for key in self.history:
-                self.history[key].pop(0)
+    def reset(self):
+        """Beyni başlangıç durumuna döndürür (nesneyi yeniden oluşturmadan, banner basmadan)."""
+        self.amygdala = 0.0
+        self._cortisol = 0.0
+        self._agency = getattr(self.cfg, 'initial_agency', 1.0)
+        self._resistance = 1.0
+        self.history.clear()
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için tam durum (geçmiş dahil)."""
+        return {
+            "cortisol": self._cortisol,
+            "agency": self._agency,
+            "resistance": self._resistance,
+            "amygdala": self.amygdala,
+            "history": self.history.state_dict()
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        self._cortisol = float(state["cortisol"])
+        self._agency = float(state["agency"])
+        self._resistance = float(state["resistance"])
+        self.amygdala = float(state["amygdala"])
+        self.history.load_state_dict(state["history"])
 
     def save_brain_state(self, filename="brain_dump.json"):
         """Beynin kimyasını kaydeder (Persistence)."""
@@ -189,3 +400,129 @@ class BiologicalBrain:
             print(f"♻️ Brain state loaded. Agency: {self._agency}")
         except Exception as e:
             print(f"❌ Load Error: {e}")
+
+
+class BiologicalBrainPopulation:
+    def __init__(self, config: Any, size: Optional[int] = None):
+        """
+        N adet BiologicalBrain'i tek çağrıda ilerleten vektörel motor (Struct-of-Arrays).
+        Kortizol, agency, direnç ve amigdala durumları uzunluğu N olan NumPy dizilerinde tutulur.
+
+        Args:
+            config: Tüm popülasyon için tek bir BrainConfig ya da beyin başına bir config listesi.
+            size: Popülasyon büyüklüğü (N). Config listesi verilirse listenin uzunluğu kullanılır.
+
+        Not: Config değerleri başlatma anında okunur; sonradan yapılan değişiklikler yansımaz.
+        History tutulmaz, son adımın agency değişimi `delta_agency` dizisinde saklanır.
+        """
+        if isinstance(config, (list, tuple)):
+            configs = list(config)
+            if size is None:
+                size = len(configs)
+            if len(configs) != size:
+                raise ValueError(f"Config sayısı ({len(configs)}) popülasyon boyutuyla ({size}) uyuşmuyor.")
+        else:
+            if size is None:
+                raise ValueError("Tek bir config verildiğinde 'size' zorunludur.")
+            configs = [config]
+
+        self.cfg = config
+        self.size = int(size)
+        self._configs = configs
+
+        self.amygdala_gain = self._param('amygdala_gain', 0.1)
+        self.cortisol_decay = self._param('cortisol_decay', 0.9)
+        self.stress_threshold = self._param('stress_threshold', 0.5)
+        self.erosion_rate = self._param('erosion_rate', 0.01)
+        self.mastery_threshold = self._param('mastery_threshold', 0.1)
+        self.repair_rate = self._param('repair_rate', 0.02)
+        self.base_learning_rate = self._param('base_learning_rate', 0.1)
+
+        self.amygdala = np.zeros(self.size)
+        self._cortisol = np.zeros(self.size)
+        self._agency = np.zeros(self.size) + self._param('initial_agency', 1.0)
+        self._resistance = np.ones(self.size)
+        self.delta_agency = np.zeros(self.size)
+
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] 🧠 WNEURA Brain Population Initialized. N: {self.size}")
+
+    def _param(self, name: str, default: float):
+        """Config alanını okur: tüm beyinlerde aynıysa float, değilse (N,) dizi döndürür."""
+        values = [float(getattr(c, name, default)) for c in self._configs]
+        if all(v == values[0] for v in values):
+            return values[0]
+        return np.array(values)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def cortisol(self) -> np.ndarray:
+        """Kortizol seviyelerini okur (Read-Only)"""
+        return self._cortisol
+
+    @property
+    def agency(self) -> np.ndarray:
+        """Agency seviyelerini okur (Read-Only)"""
+        return self._agency
+
+    @property
+    def resistance(self) -> np.ndarray:
+        """Homeostatik direnç seviyelerini okur (Read-Only)"""
+        return self._resistance
+
+    def _calculate_homeostasis(self):
+        """[DAHİLİ] BiologicalBrain._calculate_homeostasis'in maskeli versiyonu."""
+        burnout = self._cortisol > 0.8
+        self._resistance = np.where(burnout, self._resistance * 0.99, self._resistance + 0.01)
+        np.clip(self._resistance, 0.5, 1.5, out=self._resistance)
+
+    def update_amygdala(self, surprise_signal) -> np.ndarray:
+        """
+        Kortizol Dinamikleri (Denklem 2.2 + Homeostasis), N beyin için.
+
+        Args:
+            surprise_signal: Skaler ya da (N,) dizi.
+        """
+        self._calculate_homeostasis()
+
+        surprise = np.broadcast_to(np.asarray(surprise_signal, dtype=float), (self.size,))
+        self.amygdala = surprise.copy()
+
+        effective_gain = self.amygdala_gain / self._resistance
+        synthesis = effective_gain * surprise
+
+        self._cortisol = (self._cortisol * self.cortisol_decay) + synthesis
+        np.clip(self._cortisol, 0.0, 1.0, out=self._cortisol)
+
+        return self._cortisol
+
+    def update_agency(self, rpe) -> np.ndarray:
+        """
+        Agency Dinamikleri (Denklem 2.3 - Hysteresis Core), N beyin için.
+
+        Args:
+            rpe: Skaler ya da (N,) ödül tahmin hatası dizisi.
+        """
+        stress_gap = self._cortisol - self.stress_threshold
+
+        # float_power, skaler yoldaki `stress_gap ** 2` ile aynı libm pow sonucunu verir.
+        erosion_factor = np.where(
+            stress_gap > 0,
+            self.erosion_rate * np.float_power(stress_gap, 2) * 5.0,
+            0.0
+        )
+        repair_factor = np.where(np.asarray(rpe) > self.mastery_threshold, self.repair_rate, 0.0)
+
+        d_agency = repair_factor - erosion_factor
+        self._agency = self._agency + d_agency
+        np.clip(self._agency, 0.0, 1.0, out=self._agency)
+
+        self.delta_agency = d_agency
+
+        return self._agency
+
+    def step(self, surprise_signal, rpe) -> np.ndarray:
+        """Amigdala ve agency güncellemesini tek çağrıda yapar (update_amygdala + update_agency)."""
+        self.update_amygdala(surprise_signal)
+        return self.update_agency(rpe)
@@ -0,0 +1,259 @@
+"""
+WNEURA RESULT CACHE v1.0
+Developer: Efeatagul
+
+Description:
+    Runner sonuçları için içerik adresli (content-addressed) disk önbelleği.
+    Anahtar; kanonik BrainConfig + senaryo + adım + tohum + çıktı biçimi + motor
+    sürümünün SHA-256 özetidir. Aynı istek tekrar geldiğinde simülasyon koşturulmaz,
+    sonuç dosyası önbellekten kopyalanır.
+
+    - Yazımlar atomiktir (geçici dosya + os.replace); yarım dosya asla görünmez.
+    - Boyut sınırlıdır: toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayan
+      (LRU, dosya mtime'ı) sonuçlar silinir. Her isabet dosyanın mtime'ını yeniler.
+    - Eşzamanlı runner süreçleri için güvenlidir: tahliye ve istatistik güncellemeleri
+      dizin kilidi (.lock, fcntl/msvcrt) altında yapılır; okuma sırasında silinen bir
+      nesne ıska (miss) sayılır.
+    - İsabet/ıska/kayıt/tahliye sayaçları stats.json içinde tutulur.
+
+Dizin düzeni:
+    <cache_dir>/objects/<key[:2]>/<key>.<format>
+    <cache_dir>/stats.json
+    <cache_dir>/.lock
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# Simülasyon çıktısını değiştiren her motor değişikliğinde artırılmalıdır
+# (eski sonuçlar böylece kendiliğinden geçersiz olur).
+ENGINE_VERSION = "1.2.0"
+DEFAULT_MAX_BYTES = 1 << 30
+STAT_KEYS = ("hits", "misses", "stores", "evictions")
+
+
+def canonical_json(value: Any) -> str:
+    """Anahtar üretimi için deterministik JSON (sıralı anahtarlar, boşluksuz, float repr)."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = dataclasses.asdict(value)
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), allow_nan=True)
+
+
+def result_key(config: Any, scenario: Dict[str, Any], steps: int, seed: Optional[int],
+               output: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Simülasyon isteğinin içerik adresi.
+
+    Args:
+        config: BrainConfig (ya da sözlük).
+        scenario: Scenario.to_dict() çıktısı.
+        output: Sonuç dosyasının biçimini etkileyen ayarlar (format, binary_dtype, ...).
+    """
+    payload = {
+        "engine": ENGINE_VERSION,
+        "config": dataclasses.asdict(config) if dataclasses.is_dataclass(config) else config,
+        "scenario": scenario,
+        "steps": int(steps),
+        "seed": seed,
+        "output": output or {}
+    }
+    return hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _locked(path: str):
+    """[DAHİLİ] Süreçler arası özel kilit (POSIX: flock, Windows: msvcrt.locking)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _atomic_copy(src: str, dst: str, transform=None):
+    """
+    [DAHİLİ] src'yi dst'nin dizininde geçici dosyaya kopyalayıp os.replace ile yerleştirir.
+    transform(giriş, çıkış) verilirse düz kopya yerine o çağrılır (ikili dosya nesneleri).
+    """
+    directory = os.path.dirname(os.path.abspath(dst))
+    fd, tmp_path = tempfile.mkstemp(prefix=".wneura-cache-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out, open(src, "rb") as f:
+            if transform is None:
+                shutil.copyfileobj(f, out, 1 << 20)
+            else:
+                transform(f, out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ResultCache:
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Önbellek dizini (yoksa oluşturulur).
+            max_bytes: Toplam nesne boyutu sınırı; aşılırsa LRU tahliye yapılır.
+        """
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.objects = os.path.join(directory, "objects")
+        self._lock_path = os.path.join(directory, ".lock")
+        self._stats_path = os.path.join(directory, "stats.json")
+        os.makedirs(self.objects, exist_ok=True)
+
+    def path(self, key: str, fmt: str = "json") -> str:
+        return os.path.join(self.objects, key[:2], f"{key}.{fmt}")
+
+    def _read_stats(self) -> Dict[str, int]:
+        try:
+            with open(self._stats_path, "r") as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        return {name: int(stats.get(name, 0)) for name in STAT_KEYS}
+
+    def _bump(self, **deltas):
+        """[DAHİLİ] Kilit altında çağrılır; sayaçları atomik olarak günceller."""
+        stats = self._read_stats()
+        for name, delta in deltas.items():
+            stats[name] += delta
+        fd, tmp_path = tempfile.mkstemp(prefix=".wneura-stats-", dir=self.directory)
+        with os.fdopen(fd, "w") as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, self._stats_path)
+
+    def fetch(self, key: str, destination: str, fmt: str = "json", transform=None) -> bool:
+        """
+        Sonuç önbellekteyse destination'a (atomik) kopyalar ve LRU zamanını yeniler.
+
+        Args:
+            transform: transform(giriş, çıkış) — kopyalarken içeriği yeniden yazar
+                       (ör. koşuya özgü 'parameters' bloğu). Önbellekteki nesne değişmez.
+
+        Returns:
+            True (isabet) ya da False (ıska).
+        """
+        source = self.path(key, fmt)
+        try:
+            _atomic_copy(source, destination, transform)
+            hit = True
+        except FileNotFoundError:
+            hit = False
+        if hit:
+            try:
+                os.utime(source)
+            except FileNotFoundError:
+                pass
+
+        with _locked(self._lock_path):
+            self._bump(**{"hits" if hit else "misses": 1})
+        return hit
+
+    def store(self, key: str, source: str, fmt: str = "json") -> str:
+        """Sonuç dosyasını önbelleğe atomik olarak ekler ve gerekirse tahliye yapar."""
+        target = self.path(key, fmt)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _atomic_copy(source, target)
+        with _locked(self._lock_path):
+            evicted = self._evict()
+            self._bump(stores=1, evictions=evicted)
+        return target
+
+    def _entries(self):
+        """[DAHİLİ] (mtime, boyut, yol) listesi, en eskiden yeniye."""
+        entries = []
+        for root, _, files in os.walk(self.objects):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def _evict(self) -> int:
+        """[DAHİLİ] Kilit altında çağrılır; toplam boyut sınırın altına inene kadar LRU siler."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Sayaçlar + güncel nesne sayısı ve toplam boyut."""
+        entries = self._entries()
+        stats = self._read_stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0
+        })
+        return stats
+
+    def clear(self):
+        """Tüm nesneleri siler (sayaçlar korunur)."""
+        with _locked(self._lock_path):
+            shutil.rmtree(self.objects, ignore_errors=True)
+            os.makedirs(self.objects, exist_ok=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Kullanım: py cache.py <cache_dir> [--clear]")
+        sys.exit(1)
+    cache = ResultCache(sys.argv[1])
+    if "--clear" in sys.argv:
+        cache.clear()
+        print(f"🧹 Cache cleared: {sys.argv[1]}")
+    print(json.dumps(cache.stats(), indent=4))
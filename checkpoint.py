@@ -0,0 +1,189 @@
+"""
+WNEURA CHECKPOINT SYSTEM v1.0
+Developer: Efeatagul
+
+Description:
+    Ajan, beyin, kimya (NeuroChemistry) ve hipokampüs durumlarının, RNG durumu
+    ve geçmiş (history) tamponları dahil, tek bir sürümlü .npz dosyasına
+    kaydedilmesi. Yazım atomiktir (geçici dosya + os.replace); yarıda kesilen
+    bir yazım önceki checkpoint'i bozmaz. Geri yüklenen koşu bit-bit aynı devam eder.
+
+Dosya düzeni:
+    "meta"                  -> JSON (sürüm, adım, bileşen listesi)
+    "<bileşen>/<alan>/..."  -> bileşenin state_dict() içeriği (iç içe sözlükler '/' ile düzleştirilir)
+    "rng/..."               -> np.random global MT19937 durumu
+    "streams/<ad>/..."      -> adlandırılmış akışlar: BufferedRNG / senaryo akışları (generator durumu
+                               + tampon), runner timeline tamponu ve sink'i (yazılan satır / dosya konumu)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from typing import Dict, Any, Optional
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+CHECKPOINT_VERSION = 1
+COMPONENTS = ("agent", "brain", "chemistry", "hippocampus")
+
+
+def _flatten(prefix: str, value: Any, out: Dict[str, np.ndarray]):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}/{key}", item, out)
+    else:
+        out[prefix] = np.asarray(value)
+
+
+def _unflatten(arrays: Dict[str, np.ndarray], prefix: str) -> Dict[str, Any]:
+    tree: Dict[str, Any] = {}
+    for key, value in arrays.items():
+        if not key.startswith(prefix + "/"):
+            continue
+        parts = key[len(prefix) + 1:].split("/")
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value[()] if value.ndim == 0 else value
+    return tree
+
+
+def get_rng_state() -> Dict[str, Any]:
+    """np.random global durumunu sözlük olarak döndürür."""
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return {"keys": keys, "pos": pos, "has_gauss": has_gauss, "cached_gaussian": cached_gaussian}
+
+
+def set_rng_state(state: Dict[str, Any]):
+    """get_rng_state() çıktısını geri yükler."""
+    np.random.set_state((
+        "MT19937",
+        np.asarray(state["keys"], dtype=np.uint32),
+        int(state["pos"]),
+        int(state["has_gauss"]),
+        float(state["cached_gaussian"])
+    ))
+
+
+def save_checkpoint(path: str, step: int = 0, agent=None, brain=None, chemistry=None,
+                    hippocampus=None, include_rng: bool = True,
+                    streams: Optional[Dict[str, Any]] = None,
+                    extra: Optional[Dict[str, Any]] = None):
+    """
+    Verilen bileşenlerin tam durumunu atomik olarak kaydeder.
+
+    Args:
+        step: Koşunun devam edeceği adım indeksi.
+        agent: NeuroAgent (beyni ve kendi RNG akışını da kapsar).
+        streams: Ad -> BufferedRNG (ör. {"environment": env.rng}).
+        extra: meta içine yazılacak JSON uyumlu ek bilgiler.
+    """
+    components = dict(zip(COMPONENTS, (agent, brain, chemistry, hippocampus)))
+    arrays: Dict[str, np.ndarray] = {}
+    saved = []
+    for name, component in components.items():
+        if component is not None:
+            _flatten(name, component.state_dict(), arrays)
+            saved.append(name)
+
+    if include_rng:
+        _flatten("rng", get_rng_state(), arrays)
+
+    for name, stream in (streams or {}).items():
+        _flatten(f"streams/{name}", stream.state_dict(), arrays)
+
+    meta = {
+        "version": CHECKPOINT_VERSION,
+        "step": int(step),
+        "components": saved,
+        "rng": include_rng,
+        "streams": sorted(streams or {}),
+        "hippocampus_type": type(hippocampus).__name__ if hippocampus is not None else None,
+        "created": time.time(),
+        **(extra or {})
+    }
+    arrays["meta"] = np.array(json.dumps(meta))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".wneura-ckpt-", suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return meta
+
+
+def load_checkpoint(path: str, agent=None, brain=None, chemistry=None,
+                    hippocampus=None, restore_rng: bool = True,
+                    streams: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Checkpoint'i verilen (önceden oluşturulmuş) bileşenlere geri yükler.
+
+    Returns:
+        meta sözlüğü ("step" = devam edilecek adım).
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    meta = json.loads(str(arrays["meta"][()]))
+    if meta.get("version", 0) > CHECKPOINT_VERSION:
+        raise ValueError(f"Desteklenmeyen checkpoint sürümü: {meta.get('version')}")
+
+    components = dict(zip(COMPONENTS, (agent, brain, chemistry, hippocampus)))
+    for name, component in components.items():
+        if component is None:
+            continue
+        if name not in meta["components"]:
+            raise ValueError(f"Checkpoint '{name}' bileşenini içermiyor: {path}")
+        if name == "hippocampus" and meta.get("hippocampus_type") != type(component).__name__:
+            raise ValueError(f"Hipokampüs tipi uyuşmuyor: {meta.get('hippocampus_type')}")
+        component.load_state_dict(_unflatten(arrays, name))
+
+    if restore_rng and meta.get("rng"):
+        set_rng_state(_unflatten(arrays, "rng"))
+
+    for name, stream in (streams or {}).items():
+        if name not in meta.get("streams", []):
+            raise ValueError(f"Checkpoint '{name}' RNG akışını içermiyor: {path}")
+        stream.load_state_dict(_unflatten(arrays, f"streams/{name}"))
+
+    return meta
+
+
+class Checkpointer:
+    def __init__(self, path: str, every: int = 0, **components):
+        """
+        Her K adımda bir checkpoint alan yardımcı.
+
+        Args:
+            path: Checkpoint dosyası (her seferinde atomik olarak üzerine yazılır).
+            every: K (0 = yalnızca save() çağrıldığında).
+            components: save_checkpoint'e iletilecek bileşenler (agent=..., chemistry=..., streams=...).
+        """
+        self.path = path
+        self.every = int(every)
+        self.components = components
+        self.saves = 0
+
+    def maybe_save(self, step: int) -> bool:
+        """'step' K'nın katıysa kaydeder."""
+        if self.every and step % self.every == 0:
+            self.save(step)
+            return True
+        return False
+
+    def save(self, step: int):
+        save_checkpoint(self.path, step=step, **self.components)
+        self.saves += 1
@@ -0,0 +1,243 @@
+"""
+WNEURA TIMELINE DOWNSAMPLER v1.0
+Developer: Efeatagul
+
+Description:
+    WSharp grafik başına ~2000 nokta çizer; 10M adımlık bir timeline'ın tamamını
+    göndermek gereksizdir. DownsamplingSink, runner'ın timeline parçalarını koşu
+    sırasında (akış halinde, kova başına vektörel) şekli koruyarak seyreltir ve
+    sonucu alttaki sink'e (JSON / NDJSON / binary) iletir.
+
+    Yöntemler (cortisol, agency ve rpe serileri için):
+        - "lttb"   : Largest-Triangle-Three-Buckets. Kova başına, önceki seçilen nokta ve
+                     sonraki kovanın ortalamasıyla en büyük üçgeni kuran nokta seçilir
+                     (bir kova gecikmeli; bellek O(kova boyutu)).
+        - "minmax" : Kova başına her serinin min ve max noktası (tepe/çukur kaybolmaz).
+    Seriler aynı satırları paylaşır: kovadaki seçimlerin birleşimi yazılır; kova sayısı,
+    birleşim en kötü durumda bile max_points'i aşmayacak şekilde seçilir.
+    İlk ve son adım her zaman korunur.
+
+    Eşik geçişleri (ör. agency 0.4 / 0.8, kortizol stress_threshold) kesin olarak korunur:
+    geçişin olduğu her adım, seçimden bağımsız olarak tabloya yazılır ve "crossing"
+    kolonunda bit maskesiyle işaretlenir (bit anlamları özetteki "crossing_bits" içindedir).
+    Bu satırlar max_points bütçesine dahil değildir.
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+
+DOWNSAMPLE_SERIES = ("cortisol", "agency", "rpe")
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+class DownsamplingSink:
+    def __init__(self, sink: Any, steps: int, max_points: int, method: str = "lttb",
+                 thresholds: Optional[Dict[str, List[float]]] = None,
+                 series=DOWNSAMPLE_SERIES):
+        """
+        Args:
+            sink: Seyreltilmiş parçaların iletileceği timeline sink'i.
+            steps: Koşunun toplam adım sayısı (kova sınırları buna göre sabitlenir).
+            max_points: Seçilen satır bütçesi (eşik geçişleri hariç).
+            method: "lttb" ya da "minmax".
+            thresholds: Seri -> eşik listesi (geçiş adımları kesin korunur).
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Bilinmeyen seyreltme yöntemi: {method} (seçenekler: {DOWNSAMPLE_METHODS})")
+        if max_points < 8:
+            raise ValueError(f"max_points en az 8 olmalı: {max_points}")
+
+        self.target = sink
+        self.steps = int(steps)
+        self.max_points = int(max_points)
+        self.method = method
+        self.series = tuple(series)
+
+        self.crossing_bits: Dict[str, int] = {}
+        self._checks = []
+        for name, values in (thresholds or {}).items():
+            for value in values:
+                bit = 1 << len(self._checks)
+                self.crossing_bits[f"{name}@{value:g}"] = bit
+                self._checks.append((name, float(value), bit))
+        self.crossings = {label: 0 for label in self.crossing_bits}
+        self._previous: Optional[Dict[str, float]] = None
+
+        picks_per_bucket = len(self.series) * (1 if method == "lttb" else 2)
+        inner = self.steps - 2
+        self.passthrough = self.steps <= self.max_points
+        self.buckets = 0 if self.passthrough else max(1, min(inner, (self.max_points - 2) // picks_per_bucket))
+        self._edges = 1 + (np.arange(self.buckets + 1, dtype=np.int64) * inner) // max(self.buckets, 1)
+
+        self._pending: Optional[Dict[str, np.ndarray]] = None
+        self._bucket = 0
+        self._anchor: Optional[np.ndarray] = None
+        self._anchor_x: Optional[np.ndarray] = None
+        self._received = 0
+        self.source_rows = 0
+        self.rows = 0
+        self._finished = None
+
+    # --- Sink arayüzü ---
+
+    def write_header(self, header: Dict[str, Any]):
+        self.target.write_header(header)
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        n = len(chunk["step"]) if chunk else 0
+        if not n:
+            return
+        chunk = dict(chunk)
+        chunk["crossing"] = self._mark_crossings(chunk)
+        self.source_rows += n
+        self._received = int(chunk["step"][-1]) + 1
+
+        if self.passthrough:
+            self._emit(chunk, np.arange(n))
+            return
+
+        if self._pending is None:
+            self._emit(chunk, np.array([0]))
+            self._anchor = np.array([float(chunk[s][0]) for s in self.series])[:, None]
+            self._anchor_x = np.full((len(self.series), 1), float(chunk["step"][0]))
+            chunk = {name: col[1:] for name, col in chunk.items()}
+            self._pending = chunk
+        else:
+            self._pending = {name: np.concatenate([self._pending[name], col]) for name, col in chunk.items()}
+        self._drain_buckets()
+
+    def write_footer(self, footer: Dict[str, Any]):
+        self.target.write_footer(footer)
+
+    def drain(self):
+        drain = getattr(self.target, "drain", None)
+        if drain is not None:
+            drain()
+
+    def close(self):
+        self.finish()
+        self.target.close()
+
+    def to_dict(self) -> Dict[str, list]:
+        self.finish()
+        return self.target.to_dict()
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için açık kova, çapa ve sayaçlar (+ alttaki sink'in durumu)."""
+        state = {
+            "target": self.target.state_dict(),
+            "bucket": self._bucket,
+            "received": self._received,
+            "source_rows": self.source_rows,
+            "rows": self.rows,
+            "crossings": dict(self.crossings)
+        }
+        if self._previous is not None:
+            state["previous"] = dict(self._previous)
+        if self._pending is not None:
+            state["pending"] = dict(self._pending)
+            state["anchor"] = self._anchor
+            state["anchor_x"] = self._anchor_x
+        return state
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        self.target.load_state_dict(state["target"])
+        self._bucket = int(state["bucket"])
+        self._received = int(state["received"])
+        self.source_rows = int(state["source_rows"])
+        self.rows = int(state["rows"])
+        self.crossings.update({label: int(count) for label, count in state.get("crossings", {}).items()})
+        previous = state.get("previous")
+        self._previous = {name: float(value) for name, value in previous.items()} if previous else None
+        if "pending" in state:
+            self._pending = {name: np.asarray(values) for name, values in state["pending"].items()}
+            self._anchor = np.asarray(state["anchor"])
+            self._anchor_x = np.asarray(state["anchor_x"])
+        else:
+            self._pending = self._anchor = self._anchor_x = None
+        self._finished = None
+
+    # --- Seyreltme ---
+
+    def finish(self) -> Dict[str, Any]:
+        """Kalan satırları (son kova + son adım) iletir ve özet döndürür (tekrar çağrılabilir)."""
+        if self._finished is None:
+            if self._pending is not None and len(self._pending["step"]):
+                pending = self._pending
+                keep = set(np.flatnonzero(pending["crossing"]).tolist())
+                keep.add(len(pending["step"]) - 1)
+                self._emit(pending, np.array(sorted(keep)))
+                self._pending = None
+            self._finished = {
+                "method": self.method if not self.passthrough else "none",
+                "max_points": self.max_points,
+                "buckets": int(self.buckets),
+                "source_rows": int(self.source_rows),
+                "rows": int(self.rows),
+                "crossing_bits": dict(self.crossing_bits),
+                "crossings": dict(self.crossings)
+            }
+        return self._finished
+
+    def _mark_crossings(self, chunk: Dict[str, np.ndarray]) -> np.ndarray:
+        """[DAHİLİ] Eşik geçişi olan satırlar için bit maskesi (önceki parçanın son değeri taşınır)."""
+        n = len(chunk["step"])
+        mask = np.zeros(n, dtype=np.int64)
+        for name, value, bit in self._checks:
+            column = np.asarray(chunk[name], dtype=np.float64)
+            above = column >= value
+            flips = np.empty(n, dtype=bool)
+            flips[1:] = above[1:] != above[:-1]
+            flips[0] = self._previous is not None and above[0] != (self._previous[name] >= value)
+            mask[flips] |= bit
+            self.crossings[f"{name}@{value:g}"] += int(flips.sum())
+        self._previous = {name: float(chunk[name][-1]) for name in {c[0] for c in self._checks}}
+        return mask
+
+    def _drain_buckets(self):
+        """[DAHİLİ] Kendisi ve (LTTB için) sonraki kovası tamamlanan kovaları kapatır."""
+        edges = self._edges
+        lttb = self.method == "lttb"
+        while self._bucket < self.buckets:
+            k = self._bucket
+            stop = int(edges[k + 1])
+            ready = stop if not lttb else (int(edges[k + 2]) if k + 1 < self.buckets else self.steps)
+            if self._received < ready:
+                return
+
+            pending = self._pending
+            count = int(np.searchsorted(pending["step"], stop))
+            if count == 0:
+                self._bucket += 1
+                continue
+            values = np.stack([np.asarray(pending[s][:count], dtype=np.float64) for s in self.series])
+
+            if lttb:
+                x = pending["step"][:count].astype(np.float64)
+                following = slice(count, int(np.searchsorted(pending["step"], ready)))
+                next_x = pending["step"][following].astype(np.float64)
+                next_y = np.stack([np.asarray(pending[s][following], dtype=np.float64) for s in self.series])
+                cx = next_x.mean() if next_x.size else x[-1]
+                cy = next_y.mean(axis=1, keepdims=True) if next_x.size else values[:, -1:]
+                ax, ay = self._anchor_x, self._anchor
+                area = np.abs((ax - cx) * (values - ay) - (ax - x) * (cy - ay))
+                picks = area.argmax(axis=1)
+                self._anchor = values[np.arange(len(self.series)), picks][:, None]
+                self._anchor_x = x[picks][:, None]
+                selected = picks
+            else:
+                selected = np.concatenate([values.argmin(axis=1), values.argmax(axis=1)])
+
+            selected = np.union1d(selected, np.flatnonzero(pending["crossing"][:count]))
+            self._emit(pending, selected)
+            self._pending = {name: col[count:] for name, col in pending.items()}
+            self._bucket += 1
+
+    def _emit(self, chunk: Dict[str, np.ndarray], rows: np.ndarray):
+        """[DAHİLİ] Seçilen satırları alttaki sink'e yazar."""
+        if not len(rows):
+            return
+        self.target.write_chunk({name: col[rows] for name, col in chunk.items()})
+        self.rows += len(rows)
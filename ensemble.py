@@ -0,0 +1,273 @@
+"""
+WNEURA MONTE CARLO ENSEMBLE v1.0
+Developer: Efeatagul
+
+Description:
+    M adet bağımsız replika (farklı ödül ve keşif rastgeleliği) koşturur ve her
+    kayıt adımı için replikalar arası istatistikleri *akış halinde* tutar:
+        - Ortalama / varyans : Welford (blok birleştirme: Chan vd. paralel formülü)
+        - Yüzdelikler        : P² algoritması (Jain & Chlamtac, 1985), adım başına
+                               5 işaretçi; tüm adımlar NumPy ile aynı anda güncellenir.
+    Timeline'lar saklanmaz: bellek O(kayıt adımı) kadardır ve M'den bağımsızdır.
+    Replikalar 'block_size' boyutlu NeuroAgentPopulation blokları halinde koşar; her
+    blok adım parçaları (chunk) halinde istatistiklere aktarılır, böylece blok
+    tamponu da O(block_size x chunk) ile sınırlıdır.
+
+    Çıktı, agency ve kortizol için kompakt yüzdelik bantlarıdır (kolon tabanlı JSON):
+        {"step": [...], "agency": {"mean": [...], "std": [...], "p05": [...], ...}, ...}
+"""
+
+import contextlib
+import os
+import sys
+import time
+from typing import Dict, Any, Optional, Sequence
+
+import numpy as np
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from config import BrainConfig
+    from agent import NeuroAgentPopulation
+    from rng import spawn_seeds
+    from scenario import ScenarioStream, load_scenario
+except ImportError:
+    from wneura.config import BrainConfig
+    from wneura.agent import NeuroAgentPopulation
+    from wneura.rng import spawn_seeds
+    from wneura.scenario import ScenarioStream, load_scenario
+
+
+ENSEMBLE_VARIABLES = ("agency", "cortisol")
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class WelfordAccumulator:
+    def __init__(self, shape):
+        """Eleman bazında akan ortalama/varyans (sayı, ortalama, M2)."""
+        self.count = np.zeros(shape[-1], dtype=np.int64)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update_batch(self, values: np.ndarray, sl: slice):
+        """
+        (..., B, n) bloğunu [sl] kolonlarına ekler; blok istatistikleri tek seferde
+        hesaplanıp mevcut özetle birleştirilir (sayısal olarak kararlı).
+        """
+        n_b = values.shape[-2]
+        n_a = self.count[sl][:1].astype(np.float64)
+        mean_b = values.mean(axis=-2)
+        m2_b = ((values - mean_b[..., None, :]) ** 2).sum(axis=-2)
+
+        total = n_a + n_b
+        delta = mean_b - self.mean[..., sl]
+        self.mean[..., sl] += delta * (n_b / total)
+        self.m2[..., sl] += m2_b + delta ** 2 * (n_a * n_b / total)
+        self.count[sl] += n_b
+
+    def variance(self, ddof: int = 1) -> np.ndarray:
+        dof = np.maximum(self.count - ddof, 1)
+        return np.where(self.count > ddof, self.m2 / dof, 0.0)
+
+
+class P2Quantiles:
+    def __init__(self, quantiles: Sequence[float], shape):
+        """
+        Kolon başına P² yüzdelik tahmincisi (her yüzdelik için 5 işaretçi).
+
+        Args:
+            quantiles: (0, 1) aralığında yüzdelikler.
+            shape: Tahmin edilen kolonların şekli, ör. (değişken, adım).
+        """
+        self.p = np.asarray(quantiles, dtype=np.float64)
+        if self.p.ndim != 1 or np.any((self.p <= 0) | (self.p >= 1)):
+            raise ValueError(f"Yüzdelikler (0, 1) aralığında olmalı: {quantiles}")
+
+        extra = (1,) * len(shape)
+        p = self.p.reshape(-1, *extra)
+        self._dn = np.stack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)], axis=1)
+        self._initial = np.stack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 * np.ones_like(p)], axis=1)
+
+        full = (len(self.p), 5) + tuple(shape)
+        self.heights = np.zeros(full)
+        self.positions = np.zeros(full)
+        self.desired = np.zeros(full)
+        self.count = np.zeros(shape[-1], dtype=np.int64)
+        self._first = np.zeros((5,) + tuple(shape))
+
+    def add(self, row: np.ndarray, sl: slice):
+        """Tek bir replikanın (..., n) gözlemlerini [sl] kolonlarına ekler."""
+        seen = int(self.count[sl][0])
+        self.count[sl] += 1
+        if seen < 5:
+            self._first[seen][..., sl] = row
+            if seen == 4:
+                self.heights[..., sl] = np.sort(self._first[..., sl], axis=0)[None]
+                self.positions[..., sl] = np.arange(1.0, 6.0).reshape(5, *(1,) * row.ndim)
+                self.desired[..., sl] = self._initial
+            return
+
+        q = self.heights[..., sl]
+        n = self.positions[..., sl]
+        want = self.desired[..., sl]
+        x = row[None]
+
+        n[:, 1:4] += x[:, None] < q[:, 1:4]
+        n[:, 4] += 1.0
+        np.minimum(q[:, 0], x, out=q[:, 0])
+        np.maximum(q[:, 4], x, out=q[:, 4])
+        want += self._dn
+
+        for i in (1, 2, 3):
+            d = want[:, i] - n[:, i]
+            up = (d >= 1.0) & (n[:, i + 1] - n[:, i] > 1.0)
+            down = (d <= -1.0) & (n[:, i - 1] - n[:, i] < -1.0)
+            move = up | down
+            if not move.any():
+                continue
+
+            s = np.where(up, 1.0, -1.0)
+            qm, qi, qp = q[:, i - 1], q[:, i], q[:, i + 1]
+            nm, ni, np_ = n[:, i - 1], n[:, i], n[:, i + 1]
+            parabolic = qi + s / (np_ - nm) * ((ni - nm + s) * (qp - qi) / (np_ - ni)
+                                               + (np_ - ni - s) * (qi - qm) / (ni - nm))
+            linear = np.where(up, qi + (qp - qi) / (np_ - ni), qi - (qm - qi) / (nm - ni))
+            adjusted = np.where((qm < parabolic) & (parabolic < qp), parabolic, linear)
+
+            q[:, i] = np.where(move, adjusted, qi)
+            n[:, i] += np.where(move, s, 0.0)
+
+    def update_batch(self, values: np.ndarray, sl: slice):
+        """(..., B, n) bloğunu replika replika ekler (her ekleme tüm kolonlarda vektörel)."""
+        for r in range(values.shape[-2]):
+            self.add(values[..., r, :], sl)
+
+    def estimates(self) -> np.ndarray:
+        """(Q, ...) tahminler; 5'ten az gözlem varsa kesin yüzdelikler kullanılır."""
+        seen = int(self.count.min()) if self.count.size else 0
+        if seen >= 5:
+            return self.heights[:, 2].copy()
+        if seen == 0:
+            return np.full((len(self.p),) + self.heights.shape[2:], np.nan)
+        return np.quantile(self._first[:seen], self.p, axis=0)
+
+
+class EnsembleStatistics:
+    def __init__(self, record_steps: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 variables: Sequence[str] = ENSEMBLE_VARIABLES):
+        """Kayıt adımı başına Welford + P² özetleri (değişken x kayıt adımı)."""
+        self.record_steps = np.asarray(record_steps, dtype=np.int64)
+        self.variables = tuple(variables)
+        self.quantiles = tuple(float(q) for q in quantiles)
+        shape = (len(self.variables), len(self.record_steps))
+        self.moments = WelfordAccumulator(shape)
+        self.p2 = P2Quantiles(self.quantiles, shape)
+
+    def update(self, values: np.ndarray, start: int):
+        """
+        Args:
+            values: (değişken, B, n) blok; kayıt kolonları [start, start + n).
+        """
+        sl = slice(start, start + values.shape[-1])
+        self.moments.update_batch(values, sl)
+        self.p2.update_batch(values, sl)
+
+    def bands(self, decimals: int = 6) -> Dict[str, Any]:
+        """Kompakt kolon tabanlı yüzdelik bantları."""
+        std = np.sqrt(self.moments.variance())
+        quantiles = self.p2.estimates()
+        out: Dict[str, Any] = {"step": self.record_steps.tolist()}
+        for v, name in enumerate(self.variables):
+            band = {
+                "mean": np.round(self.moments.mean[v], decimals).tolist(),
+                "std": np.round(std[v], decimals).tolist()
+            }
+            for q, p in enumerate(self.quantiles):
+                band[f"p{p * 100:02g}".replace(".", "_")] = np.round(quantiles[q, v], decimals).tolist()
+            out[name] = band
+        return out
+
+
+def record_schedule(steps: int, record_every: int = 1) -> np.ndarray:
+    """Kayıt adımları: her 'record_every' adımda bir, son adım her zaman dahil."""
+    if steps < 1:
+        raise ValueError(f"Adım sayısı en az 1 olmalı: {steps}")
+    if record_every < 1:
+        raise ValueError(f"record_every en az 1 olmalı: {record_every}")
+    return np.unique(np.append(np.arange(0, steps, record_every), steps - 1))
+
+
+def run_ensemble(replicas: int, steps: int, config: Optional[BrainConfig] = None,
+                 scenario: Any = "mixed", seed: Optional[int] = None, block_size: int = 256,
+                 record_every: int = 1, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 chunk_records: int = 1024) -> Dict[str, Any]:
+    """
+    M replikayı bloklar halinde koşturur ve yüzdelik bantlarını döndürür.
+
+    Args:
+        replicas: Replika sayısı (M).
+        block_size: Aynı anda koşan replika sayısı (NeuroAgentPopulation boyutu).
+        record_every: İstatistik tutulan adım aralığı (bellek = O(steps / record_every)).
+        chunk_records: Blok tamponunun istatistiklere aktarıldığı kayıt sayısı.
+    """
+    if replicas < 1:
+        raise ValueError(f"Replika sayısı en az 1 olmalı: {replicas}")
+    config = config or BrainConfig()
+    scenario = load_scenario(scenario)
+    record_steps = record_schedule(steps, record_every)
+    stats = EnsembleStatistics(record_steps, quantiles)
+    apply_stress = scenario.has_stress
+
+    blocks = [(s, min(s + block_size, replicas)) for s in range(0, replicas, block_size)]
+    seeds = spawn_seeds(seed, len(blocks))
+
+    print(f"🎲 ENSEMBLE: {replicas} replicas x {steps} steps, {len(blocks)} blocks, "
+          f"{len(record_steps)} recorded steps")
+    started = time.perf_counter()
+
+    for b, ((start, stop), block_seed) in enumerate(zip(blocks, seeds)):
+        agent_seed, env_seed = block_seed.spawn(2)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            population = NeuroAgentPopulation(stop - start, action_dim=1, config=config, rng=agent_seed)
+        environment = ScenarioStream(scenario, seed=env_seed, chunk_size=256, width=population.size)
+
+        buffer = np.empty((len(ENSEMBLE_VARIABLES), population.size, min(chunk_records, len(record_steps))))
+        flushed = 0
+        filled = 0
+        for t in range(steps):
+            actions = population.act()
+            rewards, stress = environment.step()
+            population.learn(actions, rewards)
+
+            if t == record_steps[flushed + filled]:
+                buffer[0, :, filled] = population.brain.agency
+                buffer[1, :, filled] = population.brain.cortisol
+                filled += 1
+                if filled == buffer.shape[-1] or flushed + filled == len(record_steps):
+                    stats.update(buffer[..., :filled], flushed)
+                    flushed += filled
+                    filled = 0
+
+            if apply_stress:
+                population.brain.update_amygdala(stress)
+
+        print(f"   ... Ensemble progress: {int((b + 1) / len(blocks) * 100)}%", flush=True)
+
+    final_agency = stats.moments.mean[0, -1]
+    return {
+        "replicas": int(replicas),
+        "steps": int(steps),
+        "scenario": scenario.name,
+        "block_size": int(block_size),
+        "record_every": int(record_every),
+        "quantiles": list(stats.quantiles),
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+        "final": {
+            "agency_mean": float(final_agency),
+            "agency_std": float(np.sqrt(stats.moments.variance()[0, -1])),
+            "cortisol_mean": float(stats.moments.mean[1, -1])
+        },
+        "bands": stats.bands()
+    }
@@ -1,22 +1,23 @@
 import matplotlib.pyplot as plt
-import numpy as np
 from config import BrainConfig
 from agent import NeuroAgent
+from rng import spawn_streams
 
-def run_hysteresis_experiment():
+def run_hysteresis_experiment(seed=None):
     print("DENEY 1: Hysteresis Proof")
     
     cfg = BrainConfig()
     cfg.erosion_rate = 0.1  
     cfg.repair_rate = 0.02 
     
-    agent = NeuroAgent(action_dim=1, config=cfg)
+    agent_rng, env_rng = spawn_streams(seed, 2)
+    agent = NeuroAgent(action_dim=1, config=cfg, rng=agent_rng)
     
     logs = {"cortisol": [], "agency": [], "rpe": []}
     
     for t in range(100):
         action = agent.act()
-        reward = np.random.choice([-1, -5, -2]) 
+        reward = env_rng.choice([-1, -5, -2]) 
         info = agent.learn(action, reward)
         logs["cortisol"].append(info["cortisol"])
         logs["agency"].append(info["agency"])
@@ -1,23 +1,24 @@
 import matplotlib.pyplot as plt
-import numpy as np
 from config import BrainConfig
 from agent import NeuroAgent
+from rng import spawn_streams
 
-def run_dissociation_experiment():
+def run_dissociation_experiment(seed=None):
     print("DENEY 2: Uncertainty vs Helplessness")
+    healthy_rng, helpless_rng, env_rng = spawn_streams(seed, 3)
     
     cfg_healthy = BrainConfig()
     cfg_healthy.erosion_rate = 0.0 
-    agent_healthy = NeuroAgent(action_dim=1, config=cfg_healthy)
+    agent_healthy = NeuroAgent(action_dim=1, config=cfg_healthy, rng=healthy_rng)
     
     cfg_helpless = BrainConfig()
     cfg_helpless.initial_agency = 0.01 
-    agent_helpless = NeuroAgent(action_dim=1, config=cfg_helpless)
+    agent_helpless = NeuroAgent(action_dim=1, config=cfg_helpless, rng=helpless_rng)
     
     logs = {"healthy_q": [], "helpless_q": []}
     
     for t in range(100):
-        reward_healthy = np.random.randint(-5, 6) 
+        reward_healthy = env_rng.randint(-5, 6) 
         agent_healthy.act()
         agent_healthy.learn(0, reward_healthy)
         
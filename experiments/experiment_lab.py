@@ -12,7 +12,6 @@ Senaryo:
 import time
 import sys
 import os
-import numpy as np
 
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -20,10 +19,14 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from wneura.config import BrainConfig
     from wneura.agent import NeuroAgent
+    from wneura.rng import BufferedRNG, spawn_seeds
+    from wneura.scenario import ScenarioStream
     from neuromodulator import NeuroChemistry 
 except ImportError:
     from config import BrainConfig
     from agent import NeuroAgent
+    from rng import BufferedRNG, spawn_seeds
+    from scenario import ScenarioStream
     from neuromodulator import NeuroChemistry
 
 def print_header():
@@ -37,7 +40,7 @@ def draw_bar(value, max_val=1.0, color_char="█", length=15):
     filled = int(normalized * length)
     return (color_char * filled).ljust(length, '░')
 
-def run_grand_experiment():
+def run_grand_experiment(seed=None):
     
     print("⚙️  Initializing Biological Systems...")
     
@@ -47,7 +50,9 @@ def run_grand_experiment():
     cfg.erosion_rate = 0.05
     cfg.repair_rate = 0.02
     
-    agent = NeuroAgent(action_dim=1, config=cfg) 
+    agent_seed, env_seed = spawn_seeds(seed, 2)
+    agent = NeuroAgent(action_dim=1, config=cfg, rng=BufferedRNG(agent_seed)) 
+    environment = ScenarioStream("grand_experiment", seed=env_seed, chunk_size=90)
     chem = NeuroChemistry()                      
     
     print_header()
@@ -59,27 +64,8 @@ def run_grand_experiment():
     for t in range(total_steps):
         
        
-        reward = 0
-        stress_input = 0.0
-        
-        if t < 30:
-            phase_name = "THE HUSTLE "
-            
-            reward = np.random.randint(2, 8) 
-            stress_input = np.random.uniform(0.1, 0.4) 
-            
-        elif t < 60:
-            phase_name = "BURNOUT "
-           
-            reward = np.random.randint(-5, 0)
-            stress_input = np.random.uniform(0.5, 0.9)
-            
-        else:
-            phase_name = "RECOVERY "
-           
-            reward = 3
-            stress_input = 0.0
-
+        reward, stress_input = environment.step()
+        phase_name = environment.phase_name.upper()
       
         action = agent.act()
     
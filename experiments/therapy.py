@@ -8,7 +8,6 @@ Description:
     süreçlerini simüle eder. Hysteresis etkisini (kalıcı hasar) test eder.
 """
 
-import numpy as np
 import sys
 import os
 import json
@@ -19,12 +18,16 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from wneura.config import BrainConfig
     from wneura.agent import NeuroAgent
+    from wneura.rng import BufferedRNG, spawn_seeds
+    from wneura.scenario import ScenarioStream
 except ImportError:
    
     from config import BrainConfig
     from agent import NeuroAgent
+    from rng import BufferedRNG, spawn_seeds
+    from scenario import ScenarioStream
 
-def run_therapy_session(repair_speed=0.01, experiment_name="Standard", save_log=False):
+def run_therapy_session(repair_speed=0.01, experiment_name="Standard", save_log=False, seed=None):
     print(f"\n{'='*60}")
     print(f"🧪 EXPERIMENT: {experiment_name} | Repair Rate: {repair_speed}")
     print(f"{'='*60}")
@@ -35,7 +38,9 @@ def run_therapy_session(repair_speed=0.01, experiment_name="Standard", save_log=
     cfg.repair_rate = repair_speed  
     
     
-    agent = NeuroAgent(action_dim=1, config=cfg)
+    agent_seed, env_seed = spawn_seeds(seed, 2)
+    agent = NeuroAgent(action_dim=1, config=cfg, rng=BufferedRNG(agent_seed))
+    environment = ScenarioStream("trauma_therapy", seed=env_seed, chunk_size=80)
     
     
     history = {"step": [], "agency": [], "cortisol": [], "phase": []}
@@ -46,7 +51,7 @@ def run_therapy_session(repair_speed=0.01, experiment_name="Standard", save_log=
     
     for t in range(40):
         action = agent.act()
-        reward = np.random.randint(-5, 0) 
+        reward, _ = environment.step()
         info = agent.learn(action, reward)
         
      
@@ -66,7 +71,7 @@ def run_therapy_session(repair_speed=0.01, experiment_name="Standard", save_log=
 
     for t in range(40):
         action = agent.act()
-        reward = 5 
+        reward, _ = environment.step()
         info = agent.learn(action, reward)
         
        
@@ -98,7 +103,7 @@ def run_therapy_session(repair_speed=0.01, experiment_name="Standard", save_log=
         filename = f"therapy_result_{experiment_name.lower().replace(' ', '_')}.json"
         output_data = {
             "experiment": experiment_name,
-            "parameters": {"repair_rate": repair_speed},
+            "parameters": {"repair_rate": repair_speed, "seed": seed},
             "result": status,
             "final_stats": {"agency": final_agency},
             "timeline": history
@@ -9,9 +9,20 @@ Description:
     yüksek olan olayları önceliklendirir.
 """
 
+import heapq
+import json
+from functools import cmp_to_key
 import numpy as np
 from dataclasses import dataclass, field
-from typing import List, Any
+from typing import List, Any, Dict, Optional
+
+# Hatırlama (recall) indeksi ayarları
+RECALL_BRUTE_FORCE = 4096      # Bu kapasiteye kadar tüm durum matrisi kaba kuvvetle taranır
+RECALL_LEAF_SIZE = 128         # KD-ağacı yaprak (kova) boyutu
+RECALL_MIN_IMPORTANCE = 1e-12  # Skor paydasının alt sınırı
+
+# Lazy silikleşmede yaklaşık anahtarın, silikleşme adımı başına kesin önemden en fazla göreli sapması
+DECAY_DRIFT = 4 * np.finfo(float).eps
 
 @dataclass
 class MemoryTrace:
@@ -26,20 +37,105 @@ class MemoryTrace:
   
     importance: float = 0.0 
 
+def _encode_states(states: List[Any]):
+    """[DAHİLİ] Anı durumlarını checkpoint'e yazılabilir forma çevirir (sayısal dizi ya da JSON)."""
+    if states and all(s is not None for s in states):
+        try:
+            return np.asarray(states, dtype=float)
+        except (TypeError, ValueError):
+            pass
+    return json.dumps([s.tolist() if hasattr(s, "tolist") else s for s in states])
+
+
+def _decode_states(encoded) -> List[Any]:
+    """[DAHİLİ] _encode_states çıktısını geri çevirir."""
+    if isinstance(encoded, np.ndarray) and encoded.dtype.kind == "f":
+        return list(encoded)
+    return json.loads(str(encoded))
+
+
+def _recall_scores(points: np.ndarray, query: np.ndarray, bases: np.ndarray, importance_weight: float):
+    """[DAHİLİ] Vektörel Öklid uzaklığı ve önem ağırlıklı hatırlama skoru (küçük = güçlü)."""
+    diff = points - query
+    distance = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+    if not importance_weight:
+        return distance, distance
+    return distance, distance / np.maximum(bases, RECALL_MIN_IMPORTANCE) ** importance_weight
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """[DAHİLİ] En küçük k skorun konumları, artan sırayla (tam sıralama yok)."""
+    if k < len(scores):
+        part = np.argpartition(scores, k - 1)[:k]
+        return part[np.argsort(scores[part], kind="stable")]
+    return np.argsort(scores, kind="stable")
+
+
+def _recall_query(query, dim: int, importance_weight: float) -> np.ndarray:
+    """[DAHİLİ] recall() argümanlarını doğrular, sorguyu (dim,) vektörüne çevirir."""
+    query = np.asarray(query, dtype=float).reshape(-1)
+    if query.shape != (dim,):
+        raise ValueError(f"Sorgu boyutu uyuşmuyor: {query.shape[0]} != {dim}")
+    if importance_weight < 0:
+        raise ValueError(f"importance_weight negatif olamaz: {importance_weight}")
+    return query
+
+
 class Hippocampus:
     def __init__(self, capacity: int = 50, decay_rate: float = 0.05):
         """
         Args:
             capacity: Hafızada tutulabilecek maksimum olay sayısı.
             decay_rate: Anıların her adımda ne kadar silikleşeceği.
+
+        İndeks yapısı:
+            - Silikleşme tek bir global ölçek çarpanıyla (lazy) uygulanır:
+              yaklaşık önem = taban önem * self._scale. Heap'ler bu anahtarla sıralanır.
+            - Bildirilen önem değerleri ise anı başına, yalnızca okunduğunda, eski
+              adım adım çarpımla (importance *= 1 - decay_rate) güncellenir; böylece
+              değerler, silme/taban eşiği kararları ve sıralamalar eski listeli
+              sınıfla bit düzeyinde aynıdır. Yaklaşık anahtarları birbirine çok yakın
+              (DECAY_DRIFT toleransı içinde) adaylar arasında karar kesin değerle verilir.
+            - Eşit önemli anılar eski listenin sırasıyla (bkz. _list_order) ayrılır.
+            - En önemsiz anı min-heap ile O(log n)'de silinir.
+            - Rüya modu için en güçlü k anı max-heap üzerinden sıralama yapmadan bulunur.
         """
         self.capacity = capacity
         self.decay_rate = decay_rate
-        self.memories: List[MemoryTrace] = []
+
+        self._scale = 1.0
+        self._seq = 0
+        self._epoch = 0
+        self._sorted_before = 0
+        self._alive: Dict[int, MemoryTrace] = {}
+        self._base: Dict[int, float] = {}
+        self._stamp: Dict[int, int] = {}
+        self._born: Dict[int, tuple] = {}
+        self._sorted_at: Dict[int, int] = {}
+        self._min_heap: List[tuple] = []
+        self._max_heap: List[tuple] = []
+        self._recall_cache = None
         
      
         print("🧠 [HIPPOCAMPUS] Memory buffer initialized inside 'wneuraa'.")
 
+    @property
+    def memories(self) -> List[MemoryTrace]:
+        """
+        Saklanan anıları güncel önem değerleriyle, eski listeyle aynı sırada döndürür:
+        son kapasite taşmasında saklı olanlar öneme göre (artan), sonra eklenenler ekleme sırasıyla.
+        """
+        head = []
+        tail = []
+        for seq in self._alive:
+            self._importance(seq)
+            (head if seq < self._sorted_before else tail).append(seq)
+        head.sort(key=cmp_to_key(self._list_order))
+        return [self._alive[seq] for seq in head + tail]
+
+    def __len__(self) -> int:
+        return len(self._alive)
+
     def encode_experience(self, step, state, action, reward, surprise, cortisol):
         """
         Duygusal Etiketleme (Amygdala-Hippocampal Tagging).
@@ -60,29 +156,752 @@ class Hippocampus:
             cortisol=cortisol,
             importance=emotional_weight
         )
-        
-        self.memories.append(new_memory)
+
+        seq = self._seq
+        self._seq += 1
+        base = emotional_weight / self._scale
+
+        self._alive[seq] = new_memory
+        self._base[seq] = base
+        self._stamp[seq] = self._epoch
+        self._born[seq] = (emotional_weight, self._epoch)
+        self._recall_cache = None
+        heapq.heappush(self._min_heap, (base, seq))
+        heapq.heappush(self._max_heap, (-base, seq))
         self._manage_capacity()
 
     def decay_memories(self):
-        """Zamanın geçmesiyle anıların silikleşmesi."""
-        for mem in self.memories:
-            mem.importance *= (1.0 - self.decay_rate)
-        
-        self.memories = [m for m in self.memories if m.importance > 0.05]
+        """Zamanın geçmesiyle anıların silikleşmesi (O(1) + eşiğe yaklaşan anı başına O(log n))."""
+        self._scale *= (1.0 - self.decay_rate)
+        self._epoch += 1
+
+        limit = 0.05 * (1.0 + self._tolerance())
+        survivors = []
+        while self._min_heap and self._min_heap[0][0] * self._scale <= limit:
+            entry = heapq.heappop(self._min_heap)
+            if self._importance(entry[1]) > 0.05:
+                survivors.append(entry)
+            else:
+                self._forget(entry[1])
+        for entry in survivors:
+            heapq.heappush(self._min_heap, entry)
+
+        if self._scale < 1e-100:
+            self._rebuild_index()
+        self._maybe_compact()
 
     def _manage_capacity(self):
-        """Hafıza dolarsa, en ESKİYİ değil, en ÖNEMSİZİ siler."""
-        if len(self.memories) > self.capacity:
-            self.memories.sort(key=lambda m: m.importance)
-            excess = len(self.memories) - self.capacity
-            self.memories = self.memories[excess:]
+        """Hafıza dolarsa, en ESKİYİ değil, en ÖNEMSİZİ siler (min-heap, O(log n))."""
+        if len(self._alive) > self.capacity:
+            for seq in range(self._sorted_before, self._seq):
+                if seq in self._alive:
+                    self._sorted_at[seq] = self._epoch
+            self._sorted_before = self._seq
+        while len(self._alive) > self.capacity:
+            self._forget(self._pop_least())
+
+        self._maybe_compact()
+
+    def _tolerance(self) -> float:
+        """[DAHİLİ] Yaklaşık anahtar (taban * ölçek) ile kesin önem arasındaki en büyük göreli fark."""
+        return (self._epoch + 2) * DECAY_DRIFT
+
+    def _importance(self, seq: int) -> float:
+        """[DAHİLİ] Anının önemini eski sınıfın adım adım çarpımıyla günceller (bit düzeyinde aynı)."""
+        memory = self._alive[seq]
+        lag = self._epoch - self._stamp[seq]
+        if lag:
+            factor = 1.0 - self.decay_rate
+            importance = memory.importance
+            for _ in range(lag):
+                importance *= factor
+            memory.importance = importance
+            self._stamp[seq] = self._epoch
+        return memory.importance
+
+    def _importance_at(self, seq: int, epoch: int) -> float:
+        """[DAHİLİ] Anının geçmişteki bir silikleşme adımındaki kesin önemi (yalnızca eşitlik çözümünde)."""
+        importance, born = self._born[seq]
+        factor = 1.0 - self.decay_rate
+        for _ in range(epoch - born):
+            importance *= factor
+        return importance
+
+    def _list_order(self, a: int, b: int) -> int:
+        """
+        [DAHİLİ] Eski sınıfın liste sırası (önce küçük önem). Eski sınıf her kapasite
+        taşmasında listeyi kararlı sıraladığından eşit önemli iki anının sırası, ikisinin
+        birlikte girdiği ilk sıralamadaki önemleriyle, o da eşitse ekleme sırasıyla belirlenir.
+        Yuvarlamayla sonradan eşitlenen değerler de böylece eski sırayı korur.
+        """
+        ia = self._importance(a)
+        ib = self._importance(b)
+        if ia == ib and a in self._sorted_at and b in self._sorted_at:
+            epoch = max(self._sorted_at[a], self._sorted_at[b])
+            ia = self._importance_at(a, epoch)
+            ib = self._importance_at(b, epoch)
+        if ia != ib:
+            return -1 if ia < ib else 1
+        return -1 if a < b else (1 if a > b else 0)
+
+    def _replay_order(self, a: int, b: int) -> int:
+        """[DAHİLİ] Eski replay sırası: önce büyük önem, eşitlikte eski liste sırası (kararlı sort)."""
+        ia = self._importance(a)
+        ib = self._importance(b)
+        if ia != ib:
+            return -1 if ia > ib else 1
+        return self._list_order(a, b)
+
+    def _pop_least(self) -> int:
+        """
+        [DAHİLİ] En önemsiz anıyı min-heap'ten çıkarır. Anahtarı tepeye tolerans içinde
+        yakın adaylar kesin önem ve eski liste sırasıyla karşılaştırılır; diğerleri geri konur.
+        """
+        first = heapq.heappop(self._min_heap)
+        bound = first[0] * (1.0 + 3.0 * self._tolerance())
+        candidates = [first]
+        while self._min_heap and self._min_heap[0][0] <= bound:
+            candidates.append(heapq.heappop(self._min_heap))
+        if len(candidates) == 1:
+            return first[1]
+
+        order = cmp_to_key(self._list_order)
+        victim = min(candidates, key=lambda entry: order(entry[1]))
+        for entry in candidates:
+            if entry is not victim:
+                heapq.heappush(self._min_heap, entry)
+        return victim[1]
+
+    def _maybe_compact(self):
+        """[DAHİLİ] Silinmiş girdiler birikirse max-heap'i temizler (O(n), amortize O(1))."""
+        if len(self._max_heap) > 2 * len(self._alive) + 64:
+            self._max_heap = [(-base, seq) for seq, base in self._base.items()]
+            heapq.heapify(self._max_heap)
+
+    def _rebuild_index(self):
+        """[DAHİLİ] Ölçeği taban önem değerlerine katlar ve heap'leri yeniden kurar (yalnızca ölçek çok küçülünce)."""
+        scale = self._scale
+        self._scale = 1.0
+        for seq in self._base:
+            self._base[seq] *= scale
+        self._recall_cache = None
+        self._build_heaps()
+
+    def _build_heaps(self):
+        """[DAHİLİ] Heap'leri canlı anılardan kurar."""
+        self._min_heap = [(base, seq) for seq, base in self._base.items()]
+        heapq.heapify(self._min_heap)
+        self._max_heap = [(-base, seq) for seq, base in self._base.items()]
+        heapq.heapify(self._max_heap)
+
+    def _forget(self, seq: int):
+        """[DAHİLİ] Anıyı indeksten siler (max-heap girdisi lazy olarak temizlenir)."""
+        del self._alive[seq]
+        del self._base[seq]
+        del self._stamp[seq]
+        del self._born[seq]
+        self._sorted_at.pop(seq, None)
+        self._recall_cache = None
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için tam durum (kesin ve taban önem değerleri + global ölçek)."""
+        seqs = list(self._alive)
+        traces = list(self._alive.values())
+        return {
+            "scale": self._scale,
+            "next_seq": self._seq,
+            "epoch": self._epoch,
+            "sorted_before": self._sorted_before,
+            "seq": np.array(seqs, dtype=np.int64),
+            "base": np.array([self._base[q] for q in seqs], dtype=float),
+            "importance": np.array([self._importance(q) for q in seqs], dtype=float),
+            "weight": np.array([self._born[q][0] for q in seqs], dtype=float),
+            "born": np.array([self._born[q][1] for q in seqs], dtype=np.int64),
+            "sorted_at": np.array([self._sorted_at.get(q, -1) for q in seqs], dtype=np.int64),
+            "step_id": np.array([m.step_id for m in traces], dtype=np.int64),
+            "action": np.array([m.action for m in traces], dtype=np.int64),
+            "reward": np.array([m.reward for m in traces], dtype=float),
+            "surprise": np.array([m.surprise for m in traces], dtype=float),
+            "cortisol": np.array([m.cortisol for m in traces], dtype=float),
+            "states": _encode_states([m.state for m in traces])
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        self._scale = float(state["scale"])
+        self._seq = int(state["next_seq"])
+        self._epoch = int(state["epoch"])
+        self._sorted_before = int(state["sorted_before"])
+        self._alive = {}
+        self._base = {}
+        self._stamp = {}
+        self._born = {}
+        self._sorted_at = {}
+
+        states = _decode_states(state["states"])
+        columns = zip(state["seq"].tolist(), state["base"].tolist(), state["importance"].tolist(),
+                      state["weight"].tolist(), state["born"].tolist(), state["sorted_at"].tolist(),
+                      state["step_id"].tolist(), state["action"].tolist(), state["reward"].tolist(),
+                      state["surprise"].tolist(), state["cortisol"].tolist(), states)
+        for (seq, base, importance, weight, born, sorted_at,
+             step_id, action, reward, surprise, cortisol, mem_state) in columns:
+            self._alive[seq] = MemoryTrace(
+                step_id=step_id, state=mem_state, action=action, reward=reward,
+                surprise=surprise, cortisol=cortisol, importance=importance
+            )
+            self._base[seq] = base
+            self._stamp[seq] = self._epoch
+            self._born[seq] = (weight, born)
+            if sorted_at >= 0:
+                self._sorted_at[seq] = sorted_at
+        self._recall_cache = None
+        self._build_heaps()
 
     def get_replay_batch(self, batch_size=5):
-        """Rüya modu için en güçlü anıları getirir."""
-        sorted_mem = sorted(self.memories, key=lambda m: m.importance, reverse=True)
-        return sorted_mem[:batch_size]
+        """
+        Rüya modu için en güçlü anıları getirir.
+        Max-heap ağacında en iyi-önce (best-first) gezinme: O(k log k), tam sıralama yok.
+        k. anıya tolerans içinde yakın adaylar da toplanır ve kesin önemle sıralanır.
+        """
+        heap = self._max_heap
+        candidates: List[int] = []
+        if not heap or batch_size <= 0:
+            return []
+
+        alive = self._alive
+        size = len(heap)
+        frontier = [(heap[0], 0)]
+        threshold = float("inf")
+        while frontier:
+            (neg_base, seq), i = heapq.heappop(frontier)
+            if neg_base > threshold:
+                break
+            if seq in alive:
+                candidates.append(seq)
+                if len(candidates) == batch_size:
+                    threshold = neg_base * (1.0 - 3.0 * self._tolerance())
+            child = 2 * i + 1
+            if child < size:
+                heapq.heappush(frontier, (heap[child], child))
+                if child + 1 < size:
+                    heapq.heappush(frontier, (heap[child + 1], child + 1))
+
+        importances = {seq: self._importance(seq) for seq in candidates}
+        if len(set(importances.values())) == len(importances):
+            candidates.sort(key=importances.__getitem__, reverse=True)
+        else:
+            candidates.sort(key=cmp_to_key(self._replay_order))
+        return [self._alive[seq] for seq in candidates[:batch_size]]
+
+    def recall(self, query, k: int = 5, importance_weight: float = 1.0) -> List[MemoryTrace]:
+        """
+        İpucu tabanlı hatırlama: sorgu durumuna en benzer k anı, önem ağırlıklı
+        (skor tanımı için bkz. ColumnarHippocampus.recall). Sayısal durumlar ilk sorguda
+        bitişik bir matrise toplanır ve anı kümesi değişene kadar yeniden kullanılır.
+        Durumu olmayan (None) anılar atlanır.
+        """
+        if self._recall_cache is None:
+            seqs = [seq for seq, memory in self._alive.items() if memory.state is not None]
+            try:
+                points = np.asarray([self._alive[seq].state for seq in seqs], dtype=float)
+            except (TypeError, ValueError):
+                raise ValueError("Hatırlama için durumlar aynı boyutlu sayısal vektörler olmalı.")
+            points = points.reshape(len(seqs), -1)
+            bases = np.array([self._base[seq] for seq in seqs], dtype=float)
+            self._recall_cache = (seqs, points, bases)
+
+        seqs, points, bases = self._recall_cache
+        if not seqs or k <= 0:
+            return []
+        query = _recall_query(query, points.shape[1], importance_weight)
+        _, scores = _recall_scores(points, query, bases, importance_weight)
+
+        batch: List[MemoryTrace] = []
+        for i in _top_k(scores, k).tolist():
+            self._importance(seqs[i])
+            batch.append(self._alive[seqs[i]])
+        return batch
+
+
+
+class SumTree:
+    def __init__(self, capacity: int):
+        """
+        Öncelik (priority) değerleri üzerinde toplam ağacı + silme için minimum ağacı.
+        Yapraklar hafıza slotlarıdır; ağaç NumPy dizisinde (kök = 1) tutulur.
+
+        Args:
+            capacity: Slot sayısı (2'nin kuvvetine yuvarlanır).
+        """
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.size = size
+        self.depth = size.bit_length() - 1
+        self._sum = np.zeros(2 * size)
+        self._min = np.full(2 * size, np.inf)
+
+    @property
+    def total(self) -> float:
+        return float(self._sum[1])
+
+    @property
+    def min_key(self) -> float:
+        return float(self._min[1])
+
+    def set(self, slot: int, priority: float, key: float):
+        """Tek slotu günceller (O(log n)). Boş slot için priority=0, key=inf."""
+        s = self._sum
+        m = self._min
+        i = slot + self.size
+        s[i] = priority
+        m[i] = key
+        i >>= 1
+        while i:
+            left = 2 * i
+            s[i] = s[left] + s[left + 1]
+            m[i] = min(m[left], m[left + 1])
+            i >>= 1
+
+    def update(self, slots, priorities, keys):
+        """Birden fazla slotu seviye seviye vektörel günceller (tekrarlı slotlar güvenli)."""
+        nodes = np.asarray(slots, dtype=np.intp) + self.size
+        self._sum[nodes] = priorities
+        self._min[nodes] = keys
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            left = 2 * nodes
+            self._sum[nodes] = self._sum[left] + self._sum[left + 1]
+            self._min[nodes] = np.minimum(self._min[left], self._min[left + 1])
+
+    def rebuild(self, priorities: np.ndarray, keys: np.ndarray):
+        """Tüm ağacı yapraklardan yeniden kurar (O(n))."""
+        n = len(priorities)
+        self._sum[self.size:self.size + n] = priorities
+        self._min[self.size:self.size + n] = keys
+        for level in range(self.depth - 1, -1, -1):
+            lo, hi = 1 << level, 1 << (level + 1)
+            self._sum[lo:hi] = self._sum[2 * lo:2 * hi:2] + self._sum[2 * lo + 1:2 * hi:2]
+            self._min[lo:hi] = np.minimum(self._min[2 * lo:2 * hi:2], self._min[2 * lo + 1:2 * hi:2])
+
+    def find_prefix(self, values: np.ndarray) -> np.ndarray:
+        """Kümülatif toplamı 'values' olan yaprakları bulur (vektörel, O(B log n))."""
+        values = np.array(values, dtype=float)
+        idx = np.ones(len(values), dtype=np.intp)
+        for _ in range(self.depth):
+            left = 2 * idx
+            left_sum = self._sum[left]
+            go_right = (values >= left_sum) & (self._sum[left + 1] > 0)
+            values -= np.where(go_right, left_sum, 0.0)
+            idx = left + go_right
+        return idx - self.size
+
+    def argmin(self) -> int:
+        """En küçük anahtara sahip slotu bulur (O(log n))."""
+        m = self._min
+        i = 1
+        while i < self.size:
+            i = 2 * i if m[2 * i] <= m[2 * i + 1] else 2 * i + 1
+        return i - self.size
+
+
+class StateKDTree:
+    def __init__(self, points: np.ndarray, slots: np.ndarray, keys: np.ndarray,
+                 capacity: int, leaf_size: int = RECALL_LEAF_SIZE):
+        """
+        Anı durumları üzerinde statik, kova yapraklı (bucket) KD-ağacı.
+        Noktalar ağaç sırasıyla bitişik bir matrise kopyalanır; her yaprak bu matriste
+        bir [başlangıç, bitiş) aralığıdır ve sınırlayıcı kutusu (bounding box) ile
+        yapraktaki en büyük taban önem (skor alt sınırı için) tutulur.
+
+        Args:
+            points: (n, d) durum matrisi (n > 0).
+            slots: Her noktanın hafıza slotu.
+            keys: Her noktanın taban önemi.
+            capacity: Hafıza slot sayısı (slot -> yaprak eşlemesi için).
+            leaf_size: Yapraktaki en fazla nokta.
+        """
+        n = len(points)
+        columns = np.array(points.T, dtype=float, order="C")
+        order = np.arange(n)
+        starts = []
+        stack = [(0, n)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= leaf_size:
+                starts.append(lo)
+                continue
+            block = columns[:, lo:hi]
+            dim = int(np.argmax(block.max(axis=1) - block.min(axis=1)))
+            mid = (hi - lo) // 2
+            part = np.argpartition(block[dim], mid)
+            columns[:, lo:hi] = block[:, part]
+            order[lo:hi] = order[lo:hi][part]
+            stack.append((lo + mid, hi))
+            stack.append((lo, lo + mid))
+
+        self.starts = np.array(sorted(starts), dtype=np.intp)
+        self.sizes = np.diff(np.append(self.starts, n))
+        self.points = np.ascontiguousarray(columns.T)
+        self.slots = np.asarray(slots, dtype=np.intp)[order]
+        self.lower = np.minimum.reduceat(self.points, self.starts, axis=0)
+        self.upper = np.maximum.reduceat(self.points, self.starts, axis=0)
+        self.leaf_key = np.maximum.reduceat(np.asarray(keys, dtype=float)[order], self.starts)
+        self.slot_leaf = np.zeros(capacity, dtype=np.intp)
+        self.slot_leaf[self.slots] = np.repeat(np.arange(len(self.starts)), self.sizes)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def raise_keys(self, slots, keys):
+        """Slotların taban önemi arttıysa yaprak üst sınırlarını yükseltir (fazlası zararsızdır)."""
+        np.maximum.at(self.leaf_key, self.slot_leaf[np.asarray(slots, dtype=np.intp)], keys)
+
+    def _positions(self, leaves: np.ndarray) -> np.ndarray:
+        """[DAHİLİ] Yaprak aralıklarını tek bir konum dizisinde birleştirir (vektörel)."""
+        sizes = self.sizes[leaves]
+        ends = np.cumsum(sizes)
+        return np.repeat(self.starts[leaves] - ends + sizes, sizes) + np.arange(ends[-1] if len(ends) else 0)
+
+    def _score(self, leaves, query, keys, valid, importance_weight):
+        """[DAHİLİ] Yaprakların geçerli noktaları için (slot, uzaklık, skor)."""
+        positions = self._positions(leaves)
+        slots = self.slots[positions]
+        ok = valid[slots]
+        positions, slots = positions[ok], slots[ok]
+        distance, scores = _recall_scores(self.points[positions], query, keys[slots], importance_weight)
+        return slots, distance, scores
+
+    def query(self, query: np.ndarray, k: int, keys: np.ndarray, valid: np.ndarray,
+              importance_weight: float = 1.0):
+        """
+        Kesin k en iyi skor (uzaklık / key ** importance_weight). Önce tüm yaprak kutularına
+        uzaklık tek seferde hesaplanır; en umut verici yapraklardan k aday toplanır, sonra
+        yalnızca alt sınırı k'ıncı skordan küçük yapraklar taranır.
+
+        Args:
+            keys: Slot başına taban önem.
+            valid: Slot başına geçerlilik (silinen ya da üzerine yazılan slotlar False).
+
+        Returns:
+            (slotlar, uzaklıklar, skorlar), skor sırasıyla.
+        """
+        gap = np.maximum(self.lower - query, 0.0) + np.maximum(query - self.upper, 0.0)
+        bound = np.sqrt(np.einsum("ij,ij->i", gap, gap))
+        if importance_weight:
+            bound = bound / np.maximum(self.leaf_key, RECALL_MIN_IMPORTANCE) ** importance_weight
+        order = np.argsort(bound, kind="stable")
+
+        # İlk geçiş: en az k nokta içeren en yakın yapraklar (geçersizler varsa genişletilir).
+        visited = int(np.searchsorted(np.cumsum(self.sizes[order]), k)) + 1
+        slots, distance, scores = self._score(order[:visited], query, keys, valid, importance_weight)
+        while len(scores) < k and visited < len(order):
+            more = min(len(order), 2 * visited)
+            extra = self._score(order[visited:more], query, keys, valid, importance_weight)
+            slots, distance, scores = (np.concatenate(pair) for pair in zip((slots, distance, scores), extra))
+            visited = more
+
+        # İkinci geçiş: k'ıncı skoru geçebilecek kalan yapraklar.
+        if len(scores) >= k and visited < len(order):
+            threshold = np.partition(scores, k - 1)[k - 1]
+            rest = order[visited:][bound[order[visited:]] <= threshold]
+            if len(rest):
+                extra = self._score(rest, query, keys, valid, importance_weight)
+                slots, distance, scores = (np.concatenate(pair) for pair in zip((slots, distance, scores), extra))
+
+        top = _top_k(scores, k)
+        return slots[top], distance[top], scores[top]
+
+
+class ColumnarHippocampus:
+    def __init__(self, capacity: int = 50, decay_rate: float = 0.05,
+                 priority_exponent: float = 1.0, state_dim: Optional[int] = None):
+        """
+        Hippocampus'un kolon tabanlı (columnar) versiyonu. Anılar önceden ayrılmış
+        NumPy dizilerinde tutulur, önem değerleri üzerinde SumTree ile
+        öneme orantılı (prioritized) replay örneklemesi yapılır.
+
+        Args:
+            capacity: Hafızada tutulabilecek maksimum olay sayısı.
+            decay_rate: Anıların her adımda ne kadar silikleşeceği.
+            priority_exponent: Örnekleme önceliği = önem ** priority_exponent (0 = uniform).
+            state_dim: Verilirse durumlar (capacity, state_dim) matrisinde saklanır.
+        """
+        self.capacity = capacity
+        self.decay_rate = decay_rate
+        self.priority_exponent = priority_exponent
+        self.state_dim = state_dim
+
+        self.step_id = np.zeros(capacity, dtype=np.int64)
+        self.action = np.zeros(capacity, dtype=np.int64)
+        self.reward = np.zeros(capacity)
+        self.surprise = np.zeros(capacity)
+        self.cortisol = np.zeros(capacity)
+        self._base = np.zeros(capacity)
+        self.state = np.zeros((capacity, state_dim)) if state_dim else None
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self._scale = 1.0
+        self._count = 0
+        self._free = list(range(capacity - 1, -1, -1))
+        self._tree = SumTree(capacity)
+
+        # Hatırlama indeksi (ilk recall() çağrısında tembel kurulur)
+        self._recall_tree: Optional[StateKDTree] = None
+        self._recall_indexed = np.zeros(capacity, dtype=bool)
+        self._recall_queued = np.zeros(capacity, dtype=bool)
+        self._recall_pending: List[int] = []
+        self._recall_stale = 0
+
+        print("🧠 [HIPPOCAMPUS] Columnar memory buffer initialized.")
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def importance(self) -> np.ndarray:
+        """Tüm slotların güncel (silikleşmiş) önem değerleri; boş slotlar 0."""
+        return np.where(self.alive, self._base * self._scale, 0.0)
+
+    def encode_experience(self, step, state, action, reward, surprise, cortisol) -> int:
+        """
+        Duygusal Etiketleme (Hippocampus.encode_experience ile aynı kurallar).
+        Kaydedilen slotu, anı saklanmadıysa -1 döndürür.
+        """
+        emotional_weight = abs(surprise) + (cortisol * 1.5)
+
+        if emotional_weight < 0.1:
+            return -1
+
+        base = emotional_weight / self._scale
+
+        if self._free:
+            slot = self._free.pop()
+            self._count += 1
+        else:
+            # Hafıza dolu: yeni anı en önemsizden de zayıfsa hemen unutulur.
+            if base < self._tree.min_key:
+                return -1
+            slot = self._tree.argmin()
+
+        self.step_id[slot] = step
+        self.action[slot] = action
+        self.reward[slot] = reward
+        self.surprise[slot] = surprise
+        self.cortisol[slot] = cortisol
+        self._base[slot] = base
+        if self.state is not None:
+            self.state[slot] = state
+        self.alive[slot] = True
+
+        self._tree.set(slot, base ** self.priority_exponent, base)
+        if self._recall_tree is not None:
+            self._queue_for_recall(slot)
+        return slot
+
+    def decay_memories(self):
+        """Zamanın geçmesiyle anıların silikleşmesi (lazy global ölçek)."""
+        self._scale *= (1.0 - self.decay_rate)
+
+        while self._count and self._tree.min_key * self._scale <= 0.05:
+            self._forget(self._tree.argmin())
+
+        if self._scale < 1e-100:
+            self._rebuild_index()
+
+    def _forget(self, slot: int):
+        """[DAHİLİ] Slotu boşaltır."""
+        self.alive[slot] = False
+        self._tree.set(slot, 0.0, np.inf)
+        self._free.append(slot)
+        self._count -= 1
+        if self._recall_indexed[slot]:
+            self._recall_indexed[slot] = False
+            self._recall_stale += 1
+
+    def _rebuild_index(self):
+        """[DAHİLİ] Ölçeği taban önem değerlerine katlar ve ağacı yeniden kurar (O(n), nadiren)."""
+        self._base *= self._scale
+        if self._recall_tree is not None:
+            self._recall_tree.leaf_key *= self._scale
+        self._scale = 1.0
+        priorities = np.where(self.alive, np.float_power(self._base, self.priority_exponent), 0.0)
+        keys = np.where(self.alive, self._base, np.inf)
+        self._tree.rebuild(priorities, keys)
+
+    def gather(self, indices) -> Dict[str, np.ndarray]:
+        """Verilen slotların kolonlarını dizi sözlüğü olarak döndürür."""
+        indices = np.asarray(indices, dtype=np.intp)
+        batch = {
+            "index": indices,
+            "step_id": self.step_id[indices],
+            "action": self.action[indices],
+            "reward": self.reward[indices],
+            "surprise": self.surprise[indices],
+            "cortisol": self.cortisol[indices],
+            "importance": self._base[indices] * self._scale
+        }
+        if self.state is not None:
+            batch["state"] = self.state[indices]
+        return batch
+
+    def sample(self, batch_size: int, beta: Optional[float] = None, rng=None) -> Dict[str, np.ndarray]:
+        """
+        Öneme orantılı (prioritized) replay örneklemesi, O(B log n).
+        Toplam öncelik B eşit dilime bölünür ve her dilimden bir örnek çekilir.
+
+        Args:
+            batch_size: Örnek sayısı (tekrarlı seçim olabilir).
+            beta: Verilirse importance-sampling ağırlıkları ('weights') eklenir.
+            rng: np.random.Generator (varsayılan: global np.random).
+        """
+        if self._count == 0:
+            raise ValueError("Hafıza boş, örnekleme yapılamaz.")
+
+        total = self._tree.total
+        uniform = rng.random(batch_size) if rng is not None else np.random.rand(batch_size)
+        segment = total / batch_size
+        targets = (np.arange(batch_size) + uniform) * segment
+        indices = self._tree.find_prefix(targets)
+
+        batch = self.gather(indices)
+        if beta is not None:
+            leaf_priority = self._tree._sum[indices + self._tree.size]
+            probs = leaf_priority / total
+            min_prob = (self._tree.min_key ** self.priority_exponent) / total
+            weights = (self._count * probs) ** (-beta)
+            batch["weights"] = weights / ((self._count * min_prob) ** (-beta))
+        return batch
+
+    def update_priorities(self, indices, importances):
+        """Seçili slotların önem değerlerini günceller (O(B log n))."""
+        indices = np.asarray(indices, dtype=np.intp)
+        if not np.all(self.alive[indices]):
+            raise ValueError("Boş slotların önceliği güncellenemez.")
+        base = np.asarray(importances, dtype=float) / self._scale
+        base = np.broadcast_to(base, indices.shape)
+        self._base[indices] = base
+        self._tree.update(indices, np.float_power(base, self.priority_exponent), base)
+        if self._recall_tree is not None:
+            self._recall_tree.raise_keys(indices, base)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için tam durum (kolonlar, boş slot sırası, global ölçek)."""
+        state = {
+            "scale": self._scale,
+            "count": self._count,
+            "free": np.array(self._free, dtype=np.int64),
+            "alive": self.alive.copy(),
+            "base": self._base.copy(),
+            "step_id": self.step_id.copy(),
+            "action": self.action.copy(),
+            "reward": self.reward.copy(),
+            "surprise": self.surprise.copy(),
+            "cortisol": self.cortisol.copy()
+        }
+        if self.state is not None:
+            state["state"] = self.state.copy()
+        return state
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler; ağaç yapraklardan yeniden kurulur."""
+        if len(state["alive"]) != self.capacity:
+            raise ValueError(f"Kapasite uyuşmuyor: {len(state['alive'])} != {self.capacity}")
+
+        self._scale = float(state["scale"])
+        self._count = int(state["count"])
+        self._free = [int(i) for i in state["free"]]
+        for name in ("alive", "step_id", "action", "reward", "surprise", "cortisol"):
+            getattr(self, name)[:] = state[name]
+        self._base[:] = state["base"]
+        if self.state is not None:
+            self.state[:] = state["state"]
+
+        priorities = np.where(self.alive, np.float_power(self._base, self.priority_exponent), 0.0)
+        keys = np.where(self.alive, self._base, np.inf)
+        self._tree.rebuild(priorities, keys)
+        self._recall_tree = None
+
+    def get_replay_batch(self, batch_size=5) -> Dict[str, np.ndarray]:
+        """Rüya modu için en güçlü anıları (azalan önem sırasıyla) kolon sözlüğü olarak getirir."""
+        slots = np.flatnonzero(self.alive)
+        if batch_size < len(slots):
+            top = np.argpartition(-self._base[slots], batch_size - 1)[:batch_size]
+            slots = slots[top]
+        slots = slots[np.argsort(-self._base[slots], kind="stable")]
+        return self.gather(slots)
+
+    def recall(self, query, k: int = 5, importance_weight: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        İpucu tabanlı hatırlama: sorgu durumuna en benzer k anı, önem ağırlıklı.
+        Skor = ||durum - sorgu|| / önem ** importance_weight (küçük = güçlü hatırlama;
+        importance_weight=0 saf en yakın komşu). Silikleşme tüm önemleri aynı oranda
+        ölçeklediği için sıralama taban önemle hesaplanır.
+
+        Kapasite RECALL_BRUTE_FORCE'a kadar tüm durum matrisi tek seferde vektörel taranır.
+        Daha büyük kapasitelerde StateKDTree kullanılır: ağaç ilk sorguda kurulur, sonraki
+        anılar ağaca girmeden bekleme listesinde kaba kuvvetle taranır; liste (ve silinen
+        girdiler) büyüyünce ağaç yeniden kurulur (amortize O(log n) ekleme maliyeti).
+
+        Returns:
+            gather() sözlüğü + 'distance' ve 'score' kolonları (skor sırasıyla, en fazla k).
+        """
+        if self.state is None:
+            raise ValueError("Hatırlama için state_dim verilmeli (durumlar saklanmıyor).")
+        query = _recall_query(query, self.state_dim, importance_weight)
+        if self._count == 0 or k <= 0:
+            batch = self.gather(np.zeros(0, dtype=np.intp))
+            batch["distance"] = batch["score"] = np.zeros(0)
+            return batch
+
+        if self.capacity <= RECALL_BRUTE_FORCE:
+            distance, scores = _recall_scores(self.state, query, self._base, importance_weight)
+            scores = np.where(self.alive, scores, np.inf)
+            slots = _top_k(scores, min(k, self._count))
+            distance, scores = distance[slots], scores[slots]
+        else:
+            slots, distance, scores = self._recall_indexed_query(query, k, importance_weight)
+
+        batch = self.gather(slots)
+        batch["distance"] = distance
+        batch["score"] = scores / self._scale ** importance_weight
+        return batch
+
+    def _queue_for_recall(self, slot: int):
+        """[DAHİLİ] Yeni yazılan slotu ağaçtan düşürür ve bekleme listesine ekler."""
+        if self._recall_indexed[slot]:
+            self._recall_indexed[slot] = False
+            self._recall_stale += 1
+        if not self._recall_queued[slot]:
+            self._recall_queued[slot] = True
+            self._recall_pending.append(slot)
+
+    def _rebuild_recall_index(self):
+        """[DAHİLİ] Canlı slotların durumlarından KD-ağacını yeniden kurar (O(n log n))."""
+        slots = np.flatnonzero(self.alive)
+        self._recall_tree = StateKDTree(self.state[slots], slots, self._base[slots], self.capacity)
+        self._recall_indexed[:] = False
+        self._recall_indexed[slots] = True
+        self._recall_queued[:] = False
+        self._recall_pending = []
+        self._recall_stale = 0
+
+    def _recall_indexed_query(self, query: np.ndarray, k: int, importance_weight: float):
+        """[DAHİLİ] KD-ağacı + bekleme listesi üzerinde kesin k en iyi sorgu."""
+        churn = len(self._recall_pending) + self._recall_stale
+        if self._recall_tree is None or churn > max(8 * RECALL_LEAF_SIZE, self._count // 16):
+            self._rebuild_recall_index()
 
+        slots, distance, scores = self._recall_tree.query(query, k, self._base, self._recall_indexed, importance_weight)
+        if self._recall_pending:
+            pending = np.array(self._recall_pending, dtype=np.intp)
+            pending = pending[self.alive[pending]]
+            d, sc = _recall_scores(self.state[pending], query, self._base[pending], importance_weight)
+            slots, distance, scores = (np.concatenate(pair) for pair in
+                                       zip((slots, distance, scores), (pending, d, sc)))
+            top = _top_k(scores, k)
+            slots, distance, scores = slots[top], distance[top], scores[top]
+        return slots, distance, scores
 
 if __name__ == "__main__":
     print("🔬 Hippocampus Test Başlatılıyor...")
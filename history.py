@@ -0,0 +1,191 @@
+"""
+WNEURA HISTORY BUFFER v1.0
+Developer: Efeatagul
+
+Description:
+    Sabit kapasiteli, NumPy tabanlı dairesel (ring) geçmiş kaydı.
+    list.pop(0) yerine O(1) ekleme yapar. Veriler "aynalı" (mirrored) tutulur:
+    her değer hem i hem de i + capacity konumuna yazılır, böylece sıralı görünüm
+    (en eskiden en yeniye) her zaman tek parça bir dilimdir ve kopya gerektirmez.
+    İsteğe bağlı bir kayıt politikası (recording.py) yalnızca seçilen adımları saklar.
+"""
+
+import time
+import numpy as np
+from typing import Dict, Any, List
+
+
+def monotonic_timestamp() -> int:
+    """int64 monotonik zaman damgası (nanosaniye)."""
+    return time.monotonic_ns()
+
+
+class RingHistory:
+    def __init__(self, columns: Dict[str, Any], capacity: int = 1000, policy: Any = None):
+        """
+        Args:
+            columns: Kolon adı -> dtype eşlemesi (ekleme sırası = append argüman sırası).
+            capacity: Tutulacak maksimum kayıt sayısı.
+            policy: Verilirse kayıt politikası (bkz. recording.py). Yalnızca politikanın seçtiği
+                    ekleme satırları saklanır; her satıra ekleme sıra numarası 'index' kolonu
+                    olarak otomatik eklenir (append/extend argümanlarına dahil değildir).
+        """
+        if capacity <= 0:
+            raise ValueError(f"Kapasite pozitif olmalı: {capacity}")
+
+        columns = dict(columns)
+        self.policy = policy
+        if policy is not None:
+            if "index" in columns:
+                raise ValueError("Politikalı geçmişte 'index' kolon adı ayrılmıştır.")
+            policy.bind(list(columns))
+            columns["index"] = np.int64
+
+        self.capacity = int(capacity)
+        self.columns: List[str] = list(columns)
+        self._data = {name: np.zeros(2 * self.capacity, dtype=dtype) for name, dtype in columns.items()}
+        self._buffers = [self._data[name] for name in self.columns]
+
+        self._head = 0
+        self._size = 0
+        self.total_appended = 0
+
+    def append(self, *values):
+        """Bir kayıt ekler (O(1)). Değerler kolon sırasıyla verilir."""
+        index = self.total_appended
+        self.total_appended = index + 1
+        if self.policy is not None:
+            if not self.policy.accept(index, values):
+                return
+            values += (index,)
+
+        if self._size < self.capacity:
+            # Dolma aşamasında head == 0: görünümler ayna bölgesine uzanmaz, ayna yazımı gerekmez
+            # (ayna konumları, halka dönmeye başladığında üzerine yazılırken doldurulur).
+            pos = self._size
+            self._size += 1
+            for buf, value in zip(self._buffers, values):
+                buf[pos] = value
+            return
+
+        pos = self._head
+        self._head = (self._head + 1) % self.capacity
+        mirror = pos + self.capacity
+        for buf, value in zip(self._buffers, values):
+            buf[pos] = value
+            buf[mirror] = value
+
+    def extend(self, *values, count: int = None):
+        """
+        Birden çok kaydı tek seferde ekler (append'in k kez çağrılmasıyla aynı sonuç).
+
+        Args:
+            values: Kolon sırasıyla diziler ya da (tüm kayıtlar için aynı) skalerler.
+            count: Kayıt sayısı (verilmezse ilk dizinin uzunluğu).
+        """
+        if count is None:
+            count = next(len(v) for v in values if np.ndim(v))
+        count = int(count)
+        if count <= 0:
+            return
+
+        start = self.total_appended
+        self.total_appended += count
+        if self.policy is not None:
+            rows = self.policy.select(start, dict(zip(self.columns, values)), count, limit=self.capacity)
+            if not len(rows):
+                return
+            values = [value[rows] if np.ndim(value) else value for value in values] + [start + rows]
+            count = len(rows)
+
+        keep = min(count, self.capacity)
+        size = min(self._size + keep, self.capacity)
+        old = size - keep
+        for name, buf, value in zip(self.columns, self._buffers, values):
+            merged = np.empty(size, dtype=buf.dtype)
+            merged[:old] = self._data[name][self._head + self._size - old:self._head + self._size]
+            merged[old:] = value[-keep:] if np.ndim(value) else value
+            buf[:size] = merged
+            buf[self.capacity:self.capacity + size] = merged
+
+        self._head = 0
+        self._size = size
+
+    def view(self, name: str) -> np.ndarray:
+        """Kolonun sıralı (eskiden yeniye), salt-okunur ve kopyasız görünümünü döndürür."""
+        out = self._data[name][self._head:self._head + self._size]
+        out.flags.writeable = False
+        return out
+
+    def last(self, name: str):
+        """Kolondaki en son değeri döndürür."""
+        if self._size == 0:
+            raise IndexError("Geçmiş boş.")
+        return self._data[name][self._head + self._size - 1]
+
+    def expand(self, name: str) -> np.ndarray:
+        """
+        Politikalı geçmişte kolonu ekleme bazına açar: her kayıt bir sonraki kayda (ya da son
+        eklemeye) kadar tekrarlanır; sonuç ilk saklanan kaydın 'index'inden total_appended'a uzanır.
+        ChangePolicy(epsilon=0) ile izlenen kolonlar için kayıpsızdır. Politikasız geçmişte view kopyası.
+        """
+        if self.policy is None:
+            return self.view(name).copy()
+        index = self.view("index")
+        return np.repeat(self.view(name), np.diff(np.append(index, self.total_appended)))
+
+    def export(self) -> Dict[str, np.ndarray]:
+        """Tüm kolonların sıralı kopyalarını döndürür."""
+        return {name: self.view(name).copy() for name in self.columns}
+
+    def to_dict(self) -> Dict[str, list]:
+        """JSON'a yazılabilir liste sözlüğü döndürür."""
+        return {name: self.view(name).tolist() for name in self.columns}
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        if self.policy is not None:
+            self.policy.reset()
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için sıralı kolon kopyaları ve sayaçlar (varsa politika durumu)."""
+        state = {"columns": self.export(), "total_appended": self.total_appended}
+        if self.policy is not None:
+            state["policy"] = self.policy.state_dict()
+        return state
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler (kayıtlar eskiden yeniye yazılır)."""
+        columns = state["columns"]
+        size = len(columns[self.columns[0]]) if self.columns else 0
+        if size > self.capacity:
+            raise ValueError(f"Kayıt sayısı ({size}) kapasiteyi ({self.capacity}) aşıyor.")
+
+        self.clear()
+        for name in self.columns:
+            values = np.asarray(columns[name])
+            self._data[name][:size] = values
+            self._data[name][self.capacity:self.capacity + size] = values
+        self._size = size
+        self.total_appended = int(state["total_appended"])
+        if self.policy is not None and "policy" in state:
+            self.policy.load_state_dict(state["policy"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.view(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._data
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def keys(self) -> List[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"RingHistory(columns={self.columns}, size={self._size}, capacity={self.capacity})"
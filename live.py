@@ -0,0 +1,313 @@
+"""
+WNEURA LIVE TIMELINE v1.0
+Developer: Efeatagul
+
+Description:
+    Koşu devam ederken canlı panolar (Python ya da C#) için paylaşımlı bellek
+    üzerinden timeline yayını. Yazar (runner) her timeline parçasını adlandırılmış
+    bir multiprocessing.shared_memory segmentine ya da bellek eşlemeli (mmap) bir
+    dosyaya yazar; okuyucu aynı belleği kilitsiz, kopyasız ve serileştirmesiz okur.
+
+Bellek düzeni (little-endian, tüm alanlar 8 bayt hizalı):
+    [0:4]    magic  b"WNLV"
+    [4:8]    uint32 sürüm
+    [8:16]   uint64 kapasite (C, halkadaki satır sayısı)
+    [16:24]  uint64 head     (şimdiye kadar yayınlanan toplam satır; sıra numarası)
+    [24:28]  uint32 durum    (0 = başlatılıyor, 1 = koşuyor, 2 = bitti)
+    [28:32]  uint32 kolon sayısı
+    [32:40]  uint64 toplam adım (bilinmiyorsa 0)
+    [40:48]  uint64 reserve  (yazımı süren parçanın bitiş sıra numarası)
+    [48:64]  ayrılmış
+    [64:...] kolonlar: step (int64), cortisol, agency, rpe (float64); her biri 2*C eleman
+
+Halka (ring) protokolü:
+    Sıra numarası s olan satır, her kolonda hem (s % C) hem de (s % C) + C konumuna
+    yazılır (aynalı halka). Böylece son n <= C satır her zaman bitişik bir dilimdir ve
+    okuyucu kopyalamadan tek bir NumPy görünümü (view) alır.
+    Yazar önce reserve'ü (yazacağı son sıra + 1) ilan eder, veriyi yazar, sonra head'i
+    günceller (her biri tek 8 baytlık hizalı yazım). Okuyucu head'i okur, dilimi kullanır
+    ve ardından reserve'ü okur: dilimin ilk satırı reserve - C'den küçük değilse veri
+    tutarlıdır (seqlock benzeri doğrulama, bkz. LiveTimelineReader.valid).
+
+C# tarafı: Windows'ta MemoryMappedFile.OpenExisting(name), diğer sistemlerde
+/dev/shm/<name> ya da --live_file yolu eşlenir; aynı ofsetler okunur.
+"""
+
+import mmap
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+LIVE_MAGIC = b"WNLV"
+LIVE_VERSION = 1
+LIVE_HEADER_SIZE = 64
+LIVE_COLUMNS = {
+    "step": np.int64,
+    "cortisol": np.float64,
+    "agency": np.float64,
+    "rpe": np.float64
+}
+STATE_INIT, STATE_RUNNING, STATE_DONE = 0, 1, 2
+
+_PREAMBLE = struct.Struct("<4sIQ")
+_HEAD = 16
+_STATE = 24
+_NCOLS = 28
+_TOTAL = 32
+_RESERVE = 40
+
+
+def segment_size(capacity: int) -> int:
+    """Başlık + aynalı kolonlar için gereken bayt sayısı."""
+    return LIVE_HEADER_SIZE + len(LIVE_COLUMNS) * 2 * int(capacity) * 8
+
+
+def _open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """[DAHİLİ] Var olan segmente bağlanır; okuyucu çıkarken segmenti silmesin diye takip dışı bırakılır."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+class _LiveSegment:
+    def __init__(self, buffer, capacity: int):
+        """[DAHİLİ] Ham bellek üzerinde başlık alanları ve aynalı kolon görünümleri."""
+        self.buffer = buffer
+        self.capacity = int(capacity)
+        self._words = np.ndarray((LIVE_HEADER_SIZE // 8,), dtype="<u8", buffer=buffer)
+        self.columns: Dict[str, np.ndarray] = {}
+        offset = LIVE_HEADER_SIZE
+        for name, dtype in LIVE_COLUMNS.items():
+            self.columns[name] = np.ndarray((2 * self.capacity,), dtype=np.dtype(dtype).newbyteorder("<"),
+                                            buffer=buffer, offset=offset)
+            offset += 2 * self.capacity * 8
+
+    @property
+    def head(self) -> int:
+        return int(self._words[_HEAD // 8])
+
+    @head.setter
+    def head(self, value: int):
+        self._words[_HEAD // 8] = value
+
+    @property
+    def reserve(self) -> int:
+        return int(self._words[_RESERVE // 8])
+
+    @reserve.setter
+    def reserve(self, value: int):
+        self._words[_RESERVE // 8] = value
+
+    @property
+    def state(self) -> int:
+        return struct.unpack_from("<I", self.buffer, _STATE)[0]
+
+    @state.setter
+    def state(self, value: int):
+        struct.pack_into("<I", self.buffer, _STATE, value)
+
+    def release(self):
+        self._words = None
+        self.columns = {}
+
+
+class LiveTimelinePublisher:
+    def __init__(self, name: Optional[str] = None, path: Optional[str] = None,
+                 capacity: int = 65536, total_steps: int = 0):
+        """
+        Timeline parçalarını paylaşımlı belleğe yayınlayan yazar.
+
+        Args:
+            name: multiprocessing.shared_memory segment adı.
+            path: Bunun yerine bellek eşlemeli dosya yolu (koşu bittikten sonra da okunabilir).
+            capacity: Halkada tutulan son satır sayısı.
+            total_steps: Okuyucular için bilgi amaçlı toplam adım.
+        """
+        if (name is None) == (path is None):
+            raise ValueError("Canlı yayın için 'name' ya da 'path' değerlerinden yalnızca biri verilmeli.")
+        if capacity < 1:
+            raise ValueError(f"Kapasite pozitif olmalı: {capacity}")
+
+        size = segment_size(capacity)
+        self.name, self.path = name, path
+        self._shm = None
+        self._file = None
+        self._map = None
+        if name is not None:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            buffer = self._shm.buf
+        else:
+            self._file = open(path, "w+b")
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+            buffer = self._map
+
+        self._segment = _LiveSegment(buffer, capacity)
+        self.capacity = int(capacity)
+        _PREAMBLE.pack_into(buffer, 0, LIVE_MAGIC, LIVE_VERSION, self.capacity)
+        struct.pack_into("<I", buffer, _NCOLS, len(LIVE_COLUMNS))
+        struct.pack_into("<Q", buffer, _TOTAL, int(total_steps))
+        self._segment.head = 0
+        self._segment.reserve = 0
+        self._segment.state = STATE_RUNNING
+
+    @property
+    def head(self) -> int:
+        return self._segment.head
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        """
+        Parçanın satırlarını halkaya yazar ve head'i ilerletir (satır başına maliyet yok;
+        parça başına kolon sayısı x en fazla 4 dilim kopyası). Kapasiteden uzun parçalarda
+        yalnızca son C satır yazılır.
+        """
+        n = len(chunk["step"]) if chunk else 0
+        if not n:
+            return
+        head = self._segment.head
+        capacity = self.capacity
+        skip = max(0, n - capacity)
+        start = head + skip
+        pos = start % capacity
+        first = min(n - skip, capacity - pos)
+
+        self._segment.reserve = head + n
+        for name, ring in self._segment.columns.items():
+            data = chunk[name][skip:]
+            ring[pos:pos + first] = data[:first]
+            ring[pos + capacity:pos + capacity + first] = data[:first]
+            if first < len(data):
+                rest = len(data) - first
+                ring[:rest] = data[first:]
+                ring[capacity:capacity + rest] = data[first:]
+        self._segment.head = head + n
+
+    def close(self, unlink: bool = True):
+        """
+        Yayını 'bitti' olarak işaretler ve belleği bırakır. Paylaşımlı bellekte unlink=True
+        segment adını siler; zaten bağlı okuyucular eşlemelerini kullanmaya devam edebilir.
+        """
+        if self._segment is None:
+            return
+        self._segment.state = STATE_DONE
+        self._segment.release()
+        self._segment = None
+        if self._shm is not None:
+            self._shm.close()
+            if unlink:
+                self._shm.unlink()
+        else:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+
+class LiveTimelineReader:
+    def __init__(self, name: Optional[str] = None, path: Optional[str] = None):
+        """Yayına (segment adı ya da dosya yolu) salt-okunur olarak bağlanır."""
+        if (name is None) == (path is None):
+            raise ValueError("Okuyucu için 'name' ya da 'path' değerlerinden yalnızca biri verilmeli.")
+        self._shm = None
+        self._file = None
+        if name is not None:
+            self._shm = _open_shared_memory(name)
+            buffer = self._shm.buf
+        else:
+            self._file = open(path, "rb")
+            buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._map = buffer if self._shm is None else None
+
+        magic, version, capacity = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != LIVE_MAGIC:
+            raise ValueError(f"Geçersiz canlı timeline: {name or path}")
+        if version > LIVE_VERSION:
+            raise ValueError(f"Desteklenmeyen canlı timeline sürümü: {version}")
+        self.capacity = int(capacity)
+        self.total_steps = struct.unpack_from("<Q", buffer, _TOTAL)[0]
+        self._segment = _LiveSegment(buffer, capacity)
+
+    @property
+    def head(self) -> int:
+        return self._segment.head
+
+    @property
+    def finished(self) -> bool:
+        return self._segment.state == STATE_DONE
+
+    def latest(self, n: Optional[int] = None, since: Optional[int] = None) -> Tuple[int, Dict[str, np.ndarray]]:
+        """
+        Son satırları kopyasız NumPy görünümleri olarak döndürür.
+
+        Args:
+            n: En fazla kaç satır (varsayılan: kapasite).
+            since: Verilirse yalnızca bu sıra numarasından sonraki satırlar (artımlı okuma).
+
+        Returns:
+            (ilk satırın sıra numarası, kolon -> görünüm). Görünümler yazar tarafından
+            üzerine yazılabilir; kullandıktan sonra valid(ilk_sıra) ile doğrulayın ya da kopyalayın.
+        """
+        head = self._segment.head
+        count = min(self.capacity if n is None else int(n), self.capacity, head)
+        if since is not None:
+            count = min(count, max(0, head - int(since)))
+        start = head - count
+        pos = start % self.capacity
+        return start, {name: ring[pos:pos + count] for name, ring in self._segment.columns.items()}
+
+    def valid(self, start: int) -> bool:
+        """start sıra numaralı satırdan itibaren okunan veri hâlâ üzerine yazılmamış mı?"""
+        return start >= self._segment.reserve - self.capacity
+
+    def snapshot(self, n: Optional[int] = None, retries: int = 16) -> Tuple[int, Dict[str, np.ndarray]]:
+        """latest() + kopya + doğrulama; yazar çok hızlıysa tekrar dener."""
+        for _ in range(retries):
+            start, views = self.latest(n)
+            copies = {name: view.copy() for name, view in views.items()}
+            if self.valid(start):
+                return start, copies
+        raise RuntimeError("Canlı timeline tutarlı okunamadı (yazar halkayı çok hızlı dolduruyor).")
+
+    def close(self):
+        self._segment.release()
+        if self._shm is not None:
+            self._shm.close()
+        else:
+            self._map.close()
+            self._file.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Kullanım: py live.py <segment_adı | dosya_yolu>")
+        sys.exit(1)
+
+    target = sys.argv[1]
+    is_path = os.path.sep in target or os.path.exists(target)
+    reader = LiveTimelineReader(path=target) if is_path else LiveTimelineReader(name=target)
+    print(f"📡 Attached to live timeline '{target}' (capacity {reader.capacity})")
+    try:
+        while True:
+            start, cols = reader.snapshot(1)
+            if len(cols["step"]):
+                print(f"   step {int(cols['step'][0]):>10}  cortisol {cols['cortisol'][0]:.3f}  "
+                      f"agency {cols['agency'][0]:.3f}  rpe {cols['rpe'][0]:+.3f}", flush=True)
+            if reader.finished:
+                break
+            time.sleep(0.5)
+    finally:
+        reader.close()
+    print("✅ Run finished.")
@@ -7,10 +7,20 @@ Description:
     Bu modül, sinaptik iletimi ve nörotransmitter dengesini simüle eder.
     Dopamin (DA), Serotonin (5-HT) ve Noradrenalin (NE) seviyelerini ve
     reseptör duyarlılığını (Downregulation/Upregulation) yönetir.
+    NeuroChemistryPopulation, N sinapsı BiologicalBrainPopulation ile hizalı
+    (3, N) dizilerde tek vektörel geçişte günceller.
 """
 
 import numpy as np
 import time
+from typing import Any, Dict
+
+
+CHANNELS = ("dopamine", "serotonin", "norepinephrine")
+RECEPTORS = ("da_receptors", "ht_receptors", "ne_receptors")
+
+HOMEOSTASIS_DECAY = 0.05
+ADAPTATION_RATE = 0.01
 
 class NeuroChemistry:
     def __init__(self):
@@ -56,7 +66,7 @@ class NeuroChemistry:
 
     def _apply_homeostasis(self):
         """Kimyasallar zamanla 1.0 (Baseline) seviyesine dönmeye çalışır (Reuptake)."""
-        decay = 0.05
+        decay = HOMEOSTASIS_DECAY
         self.dopamine += (1.0 - self.dopamine) * decay
         self.serotonin += (1.0 - self.serotonin) * decay
        
@@ -67,17 +77,35 @@ class NeuroChemistry:
         Tolerans Yasası:
         Çok fazla kimyasal = Reseptör ölümü (Downregulation)
         Çok az kimyasal = Reseptör artışı (Upregulation)
+        Kural üç verici (DA, 5-HT, NE) için de aynıdır.
         """
-        adaptation_rate = 0.01
+        adaptation_rate = ADAPTATION_RATE
 
-        
-        if self.dopamine > 1.5:
-            self.da_receptors -= adaptation_rate 
-        elif self.dopamine < 0.8:
-            self.da_receptors += adaptation_rate 
-        
-        
-        self.da_receptors = np.clip(self.da_receptors, 0.5, 1.5)
+        for channel, receptor in zip(CHANNELS, RECEPTORS):
+            level = getattr(self, channel)
+            sensitivity = getattr(self, receptor)
+            if level > 1.5:
+                sensitivity -= adaptation_rate
+            elif level < 0.8:
+                sensitivity += adaptation_rate
+
+            setattr(self, receptor, min(max(sensitivity, 0.5), 1.5))
+
+    def state_dict(self):
+        """Checkpoint için seviyeler ve reseptör duyarlılıkları."""
+        return {
+            "dopamine": self.dopamine,
+            "serotonin": self.serotonin,
+            "norepinephrine": self.norepinephrine,
+            "da_receptors": self.da_receptors,
+            "ht_receptors": self.ht_receptors,
+            "ne_receptors": self.ne_receptors
+        }
+
+    def load_state_dict(self, state):
+        """state_dict() çıktısını geri yükler."""
+        for key in self.state_dict():
+            setattr(self, key, float(state[key]))
 
     def get_state(self):
         """Efektif (Hissedilen) seviyeleri döndürür."""
@@ -90,6 +118,87 @@ class NeuroChemistry:
         }
 
 
+class NeuroChemistryPopulation:
+    def __init__(self, size: int):
+        """
+        N adet sinapsı tek seferde güncelleyen dizi tabanlı NeuroChemistry.
+        Seviyeler ve reseptörler (3, N) matrislerinde tutulur (satırlar: DA, 5-HT, NE);
+        i. sütun BiologicalBrainPopulation'daki i. beyne karşılık gelir.
+
+        Args:
+            size (int): Sinaps/ajan sayısı (N).
+        """
+        if size <= 0:
+            raise ValueError(f"Popülasyon boyutu pozitif olmalı: {size}")
+
+        self.size = int(size)
+        self.levels = np.ones((len(CHANNELS), self.size))
+        self.receptors = np.ones((len(CHANNELS), self.size))
+        self.effective = np.ones((len(CHANNELS), self.size))
+
+        self._decay = np.array([HOMEOSTASIS_DECAY, HOMEOSTASIS_DECAY, HOMEOSTASIS_DECAY * 0.5])[:, None]
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def dopamine(self) -> np.ndarray:
+        return self.levels[0]
+
+    @property
+    def serotonin(self) -> np.ndarray:
+        return self.levels[1]
+
+    @property
+    def norepinephrine(self) -> np.ndarray:
+        return self.levels[2]
+
+    @property
+    def receptor_health(self) -> np.ndarray:
+        return self.receptors[0]
+
+    def update(self, reward_signal, stress_signal, action_taken=True) -> np.ndarray:
+        """
+        Tüm sinapsları tek bir vektörel geçişte günceller (NeuroChemistry.update ile eleman bazında aynı).
+
+        Args:
+            reward_signal / stress_signal / action_taken: Skaler ya da (N,) diziler.
+
+        Returns:
+            (3, N) efektif seviyeler (satırlar: DA, 5-HT, NE). Dizi her çağrıda yerinde güncellenir.
+        """
+        reward_signal = np.asarray(reward_signal, dtype=float)
+        stress_signal = np.asarray(stress_signal, dtype=float)
+        dopamine, serotonin, norepinephrine = self.levels
+
+        dopamine += np.where(reward_signal > 0, 0.2 * reward_signal, -0.1)
+        serotonin += np.where(stress_signal > 0.5, -(0.05 * stress_signal),
+                              np.where(action_taken, 0.02, 0.0))
+        norepinephrine += ((1.0 + (stress_signal * 1.5)) - norepinephrine) * 0.1
+
+        self.levels += (1.0 - self.levels) * self._decay
+
+        self.receptors += np.where(self.levels > 1.5, -ADAPTATION_RATE,
+                                   np.where(self.levels < 0.8, ADAPTATION_RATE, 0.0))
+        np.clip(self.receptors, 0.5, 1.5, out=self.receptors)
+
+        np.multiply(self.levels, self.receptors, out=self.effective)
+        return self.effective
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için seviye ve reseptör matrisleri."""
+        return {"levels": self.levels.copy(), "receptors": self.receptors.copy()}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        levels = np.asarray(state["levels"], dtype=float)
+        if levels.shape != self.levels.shape:
+            raise ValueError(f"Kimya boyutu uyuşmuyor: {levels.shape} != {self.levels.shape}")
+        self.levels[:] = levels
+        self.receptors[:] = np.asarray(state["receptors"], dtype=float)
+        np.multiply(self.levels, self.receptors, out=self.effective)
+
+
 if __name__ == "__main__":
     chem = NeuroChemistry()
     print("\n--- 🧠 CHEMICAL IMBALANCE SIMULATION (High Dopamine Injection) ---")
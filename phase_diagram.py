@@ -0,0 +1,202 @@
+"""
+WNEURA PHASE DIAGRAM MAPPER v1.0
+Developer: Efeatagul
+
+Description:
+    (erosion_rate, repair_rate, stress_threshold, ...) uzayında "tam iyileşme" ile
+    "kronik depresyon" arasındaki histerezis sınırını uyarlamalı (adaptive) olarak
+    haritalar. Sınıflandırma therapy.run_therapy_session ile aynıdır:
+        agency > 0.8 -> FULL (2), agency > 0.4 -> PARTIAL (1), aksi halde FAILED (0).
+
+    Yöntem (2B'de quadtree, 3B'de octree):
+        1. Kaba bir ızgaranın köşe noktaları değerlendirilir.
+        2. Köşe sınıfları farklı olan hücreler 2^D alt hücreye bölünür; diğerleri bırakılır.
+        3. En ince seviyeye kadar tekrarlanır. Her seviyenin yeni noktaları tek bir
+           NeuroAgentPopulation ile vektörel olarak değerlendirilir.
+    Tüm noktalar aynı ödül dizisini görür (common random numbers), böylece sınıf
+    yalnızca parametrelerin fonksiyonudur ve komşu hücreler tutarlıdır.
+
+    Çözünürlük garantisi: Sınır, en ince hücre genişliği (aralık / 2^max_level) içinde
+    verilir. Kaba hücreden (aralık / 2^base_level) küçük, köşelerden görünmeyen
+    sınır parçaları kaçırılabilir; base_level bu ölçeği belirler.
+
+Spec örneği (JSON):
+    {
+        "params": {
+            "erosion_rate": {"min": 0.0, "max": 0.2},
+            "repair_rate": {"min": 0.0, "max": 0.05},
+            "stress_threshold": {"min": 0.2, "max": 0.9}
+        },
+        "base_level": 2,
+        "max_level": 6,
+        "scenario": "trauma_therapy",
+        "steps": 80,
+        "seed": 42
+    }
+"""
+
+import contextlib
+import os
+import sys
+import time
+from dataclasses import replace
+from typing import Dict, Any, List, Tuple, Optional
+
+import numpy as np
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from config import BrainConfig
+    from agent import NeuroAgentPopulation
+    from scenario import ScenarioStream, load_scenario
+except ImportError:
+    from wneura.config import BrainConfig
+    from wneura.agent import NeuroAgentPopulation
+    from wneura.scenario import ScenarioStream, load_scenario
+
+
+CLASS_NAMES = ["FAILED", "PARTIAL", "FULL"]
+RECOVERY_THRESHOLDS = (0.4, 0.8)
+MAX_LATTICE_POINTS = 1 << 27
+
+
+def classify(final_agency: np.ndarray, thresholds=RECOVERY_THRESHOLDS) -> np.ndarray:
+    """Final agency -> sınıf (0 = FAILED, 1 = PARTIAL, 2 = FULL); eşikler therapy.py ile aynı."""
+    return np.digitize(final_agency, thresholds, right=True).astype(np.int8)
+
+
+def simulate_final_agency(configs: List[Any], scenario: Any = "trauma_therapy", steps: int = 80,
+                          seed: Optional[int] = 0) -> np.ndarray:
+    """
+    Config listesini tek bir popülasyonla koşturur ve final agency dizisini döndürür.
+    Ödül/stres dizisi tüm ajanlar için ortaktır (aynı seed -> aynı program).
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        population = NeuroAgentPopulation(len(configs), action_dim=1, config=configs, rng=seed)
+    environment = ScenarioStream(scenario, seed=seed, chunk_size=max(1, steps))
+    apply_stress = environment.scenario.has_stress
+
+    for _ in range(steps):
+        actions = population.act()
+        reward, stress = environment.step()
+        population.learn(actions, reward)
+        if apply_stress:
+            population.brain.update_amygdala(stress)
+
+    return population.brain.agency.copy()
+
+
+def _parse_bounds(spec: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
+    """[DAHİLİ] Spec'ten parametre adlarını ve (D, 2) [min, max] matrisini çıkarır."""
+    params = spec.get("params", {})
+    if not params:
+        raise ValueError("Phase diagram spec içinde 'params' boş olamaz.")
+
+    names = list(params)
+    unknown = [n for n in names if n not in BrainConfig.__annotations__]
+    if unknown:
+        raise ValueError(f"Bilinmeyen BrainConfig alanları: {unknown}")
+
+    bounds = np.array([[float(params[n]["min"]), float(params[n]["max"])] for n in names])
+    if np.any(bounds[:, 1] <= bounds[:, 0]):
+        raise ValueError("Her parametre için min < max olmalı.")
+    return names, bounds
+
+
+def map_phase_boundary(spec: Dict[str, Any], base_config: Optional[BrainConfig] = None,
+                       batch_size: int = 8192) -> Dict[str, Any]:
+    """
+    Sınırı uyarlamalı olarak haritalar ve kolon tabanlı özet sözlüğü döndürür.
+
+    Args:
+        spec: Tanım (bkz. modül açıklaması).
+        base_config: Taranmayan alanlar için temel ayarlar (varsayılan: therapy gibi initial_agency = 1.0).
+        batch_size: Tek popülasyonda değerlendirilecek en fazla nokta.
+    """
+    names, bounds = _parse_bounds(spec)
+    dims = len(names)
+    base_level = int(spec.get("base_level", 2))
+    max_level = int(spec.get("max_level", 6))
+    if not 0 <= base_level <= max_level:
+        raise ValueError(f"0 <= base_level <= max_level olmalı: {base_level}, {max_level}")
+
+    side = (1 << max_level) + 1
+    if side ** dims > MAX_LATTICE_POINTS:
+        raise ValueError(f"Çözünürlük çok yüksek: {side}^{dims} kafes noktası.")
+
+    base_config = base_config or BrainConfig(initial_agency=1.0)
+    scenario = load_scenario(spec.get("scenario", "trauma_therapy"))
+    steps = int(spec.get("steps", 80))
+    seed = spec.get("seed", 0)
+    thresholds = tuple(spec.get("thresholds", RECOVERY_THRESHOLDS))
+
+    scale = (bounds[:, 1] - bounds[:, 0]) / (side - 1)
+    strides = side ** np.arange(dims)
+    classes = np.full(side ** dims, -1, dtype=np.int8)
+    offsets = np.array(np.meshgrid(*[[0, 1]] * dims, indexing="ij")).reshape(dims, -1).T
+
+    def evaluate(vertices: np.ndarray):
+        """Önbellekte olmayan kafes noktalarını parti parti değerlendirir."""
+        keys = np.unique(vertices @ strides)
+        keys = keys[classes[keys] < 0]
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            coords = (batch[:, None] // strides) % side
+            values = bounds[:, 0] + coords * scale
+            configs = [replace(base_config, **{n: float(v) for n, v in zip(names, row)}) for row in values]
+            classes[batch] = classify(simulate_final_agency(configs, scenario, steps, seed), thresholds)
+        return len(keys)
+
+    print(f"🗺️ PHASE MAP: {names}, levels {base_level}->{max_level}, scenario '{scenario.name}'")
+    started = time.perf_counter()
+
+    size = 1 << (max_level - base_level)
+    axes = [np.arange(0, side - 1, size)] * dims
+    cells = np.array(np.meshgrid(*axes, indexing="ij")).reshape(dims, -1).T
+    evaluations = 0
+    while True:
+        corners = cells[:, None, :] + offsets[None, :, :] * size
+        evaluations += evaluate(corners.reshape(-1, dims))
+        corner_classes = classes[corners @ strides]
+        mixed = corner_classes.min(axis=1) != corner_classes.max(axis=1)
+        print(f"   ... cell {size}: {len(cells)} cells, {int(mixed.sum())} on boundary, {evaluations} evaluations", flush=True)
+
+        if size == 1 or not mixed.any():
+            break
+        size //= 2
+        cells = (cells[mixed][:, None, :] + offsets[None, :, :] * size).reshape(-1, dims)
+
+    boundary = cells[mixed] if size == 1 else cells[:0]
+    boundary_classes = corner_classes[mixed] if size == 1 else corner_classes[:0]
+    centers = bounds[:, 0] + (boundary + 0.5) * scale
+
+    evaluated = np.flatnonzero(classes >= 0)
+    coords = (evaluated[:, None] // strides) % side
+    points = bounds[:, 0] + coords * scale
+    grid_cost = side ** dims
+
+    return {
+        "params": names,
+        "bounds": {n: bounds[d].tolist() for d, n in enumerate(names)},
+        "scenario": scenario.name,
+        "steps": steps,
+        "thresholds": list(thresholds),
+        "class_names": CLASS_NAMES,
+        "resolution": {n: float(scale[d]) for d, n in enumerate(names)},
+        "evaluations": int(evaluations),
+        "grid_evaluations": int(grid_cost),
+        "cost_ratio": round(evaluations / grid_cost, 4),
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+        "boundary": {
+            "cells": len(boundary),
+            "centers": {n: centers[:, d].tolist() for d, n in enumerate(names)},
+            "min_class": boundary_classes.min(axis=1).tolist() if len(boundary) else [],
+            "max_class": boundary_classes.max(axis=1).tolist() if len(boundary) else []
+        },
+        "points": {
+            **{n: points[:, d].tolist() for d, n in enumerate(names)},
+            "class": classes[evaluated].tolist()
+        }
+    }
@@ -0,0 +1,185 @@
+"""
+WNEURA HOT-PATH PROFILER v1.0
+Developer: Efeatagul
+
+Description:
+    Sıcak yollar için düşük maliyetli zaman/çağrı sayaçları (cProfile'a gerek kalmadan).
+    Enstrümantasyon, metodları yalnızca profil açıkken *nesne örneği* üzerinde
+    sarmalayarak yapılır; sınıf koduna dokunulmaz. Profil kapalıyken hiçbir şey
+    sarmalanmaz, yani maliyet tam olarak sıfırdır.
+
+    Her bölüm için hem kapsayıcı (total) hem de alt bölümler çıkarılmış (self) süre
+    tutulur; örn. 'amygdala' süresine içindeki 'homeostasis' dahil edilmez. Böylece
+    self sürelerin toplamı + 'unaccounted' = duvar saati süresi olur ve matematik,
+    loglama ya da I/O'dan hangisinin baskın olduğu doğrudan okunur.
+
+Kullanım:
+    profiler = Profiler()
+    profiler.instrument(brain, "update_amygdala", "amygdala")
+    with profiler.section("serialization"):
+        ...
+    report = profiler.report()
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+
+class Profiler:
+    def __init__(self):
+        """Bölüm adı -> [çağrı sayısı, toplam süre, self süre] sayaçları."""
+        self.stats: Dict[str, List[float]] = {}
+        self.background: set = set()
+        self._stack: List[float] = []
+        self._started = time.perf_counter()
+        self._stopped: Optional[float] = None
+
+    def _entry(self, label: str) -> List[float]:
+        return self.stats.setdefault(label, [0, 0.0, 0.0])
+
+    def wrap(self, fn, label: str):
+        """
+        Çağrılabilir nesneyi sayaçlı bir sarmalayıcıyla döndürür (ana thread).
+        İç içe sarmalanmış çağrıların süresi dıştaki bölümün self süresinden düşülür.
+        """
+        entry = self._entry(label)
+        stack = self._stack
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            stack.append(0.0)
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                children = stack.pop()
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += elapsed - children
+                if stack:
+                    stack[-1] += elapsed
+
+        timed.__wrapped__ = fn
+        return timed
+
+    def wrap_background(self, fn, label: str):
+        """
+        Arka plan thread'inde çağrılacak fonksiyonlar için sarmalayıcı. Ana thread'in
+        yığınına dokunmaz; süre duvar saatiyle örtüşür ve 'unaccounted' hesabına girmez.
+        """
+        entry = self._entry(label)
+        self.background.add(label)
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                entry[0] += 1
+                entry[1] += clock() - start
+                entry[2] = entry[1]
+
+        timed.__wrapped__ = fn
+        return timed
+
+    def instrument(self, obj: Any, method: str, label: str, background: bool = False):
+        """obj.method'u yalnızca bu örnek için sayaçlı sürümüyle değiştirir."""
+        bound = getattr(obj, method)
+        wrapper = self.wrap_background(bound, label) if background else self.wrap(bound, label)
+        setattr(obj, method, wrapper)
+        return wrapper
+
+    @contextmanager
+    def section(self, label: str):
+        """Bir kod bloğunu bölüm olarak ölçer (ör. final JSON yazımı)."""
+        entry = self._entry(label)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += elapsed - children
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def stop(self):
+        """Duvar saatini dondurur (report() çağrılmadan önce isteğe bağlı)."""
+        self._stopped = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        JSON uyumlu döküm.
+
+        Returns:
+            wall_sec, unaccounted_sec ve bölüm başına calls / total_sec / self_sec /
+            mean_us / share (self süresinin duvar saatine oranı); self süreye göre azalan sırada.
+        """
+        wall = (self._stopped or time.perf_counter()) - self._started
+        sections = {}
+        for label, (calls, total, own) in sorted(self.stats.items(), key=lambda item: -item[1][2]):
+            sections[label] = {
+                "calls": int(calls),
+                "total_sec": round(total, 6),
+                "self_sec": round(own, 6),
+                "mean_us": round(total / calls * 1e6, 3) if calls else 0.0,
+                "share": round(own / wall, 4) if wall > 0 else 0.0,
+                "thread": "background" if label in self.background else "main"
+            }
+        accounted = sum(own for label, (_, _, own) in self.stats.items() if label not in self.background)
+        return {
+            "wall_sec": round(wall, 6),
+            "unaccounted_sec": round(max(wall - accounted, 0.0), 6),
+            "sections": sections
+        }
+
+    def format_table(self) -> str:
+        """Terminal için kısa tablo."""
+        report = self.report()
+        lines = [f"{'SECTION':<16} {'CALLS':>10} {'SELF(s)':>10} {'MEAN(us)':>10} {'SHARE':>7}"]
+        for label, s in report["sections"].items():
+            lines.append(f"{label:<16} {s['calls']:>10} {s['self_sec']:>10.4f} {s['mean_us']:>10.3f} {s['share']:>6.1%}")
+        lines.append(f"{'(unaccounted)':<16} {'':>10} {report['unaccounted_sec']:>10.4f}")
+        return "\n".join(lines)
+
+
+def instrument_simulation(profiler: Profiler, agent=None, environment=None, buffer=None, sink=None):
+    """
+    Runner'ın sıcak yollarını standart bölüm adlarıyla enstrümante eder:
+        homeostasis, amygdala, agency, history, rng, environment, timeline, serialization
+        (+ arka plan yazıcısı varsa 'io_writer').
+    """
+    if agent is not None:
+        brain = agent.brain
+        profiler.instrument(brain, "_calculate_homeostasis", "homeostasis")
+        profiler.instrument(brain, "update_amygdala", "amygdala")
+        profiler.instrument(brain, "update_agency", "agency")
+        profiler.instrument(brain, "_log_state", "history")
+        profiler.instrument(agent, "_update_history", "history")
+        profiler.instrument(agent.rng, "random", "rng")
+    if environment is not None:
+        profiler.instrument(environment, "step", "environment")
+    if buffer is not None:
+        profiler.instrument(buffer, "append", "timeline")
+    if sink is not None:
+        profiler.instrument(sink, "write_chunk", "serialization")
+        inner = _background_target(sink)
+        if inner is not None:
+            profiler.instrument(inner, "write_chunk", "io_writer", background=True)
+    return profiler
+
+
+def _background_target(sink):
+    """
+    [DAHİLİ] Sarmalayıcı zincirini (.target: DownsamplingSink, RecordingSink) izleyerek
+    BackgroundWriter'a iner ve arka planda yazan iç sink'i (.sink) döndürür; yoksa None.
+    """
+    while getattr(sink, "target", None) is not None:
+        sink = sink.target
+    return getattr(sink, "sink", None)
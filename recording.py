@@ -0,0 +1,479 @@
+"""
+WNEURA RECORDING POLICIES v1.0
+Developer: Efeatagul
+
+Description:
+    Geçmiş (RingHistory) ve runner timeline'ı için takılabilir kayıt politikaları.
+    Uzun düz fazlarda her adımı yazmak yerine yalnızca bilgi taşıyan adımlar saklanır:
+        - StridePolicy(k)              : her k'ıncı adım.
+        - ChangePolicy(epsilon)        : izlenen bir değer son KAYDEDİLEN değerden epsilon'dan
+                                         fazla uzaklaşınca (yeniden kurma hatası <= epsilon).
+                                         epsilon = 0 bir run-length kodlamasıdır ve kayıpsızdır.
+        - CrossingPolicy(thresholds)   : bir eşiğin geçildiği adım ve onu izleyen 'window' adım.
+        - AnyPolicy(...)               : politikaların birleşimi (herhangi biri isterse kaydedilir).
+    Her politikada ilk adım her zaman kaydedilir. Kaydedilen satırlar adım indeksini taşır;
+    RingHistory.expand() / expand_timeline() son kaydı ileri taşıyarak (forward-fill) adım
+    bazındaki seriyi geri kurar.
+
+    Politikalar hem adım adım (accept) hem de parça halinde vektörel (select) çalışır ve iki yol
+    aynı satırları seçer. Durumları (son kayıt, önceki değer, açık pencere) parçalar arasında
+    taşınır ve state_dict() ile checkpoint'e yazılabilir. Bir politika nesnesi tek bir geçmişe
+    (ya da timeline'a) bağlanır.
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence
+
+
+RECORD_POLICIES = ("all", "stride", "change", "crossing")
+
+# ChangePolicy (epsilon > 0) sıralı taramasının ilk pencere genişliği (bulunamazsa ikiye katlanır).
+_SCAN_WIDTH = 16
+
+
+def _last(rows: np.ndarray, limit: Optional[int]) -> np.ndarray:
+    """[DAHİLİ] Yalnızca son 'limit' satırı tutar (sınırlı geçmişler için)."""
+    return rows[-limit:] if limit is not None and len(rows) > limit else rows
+
+
+class RecordingPolicy:
+    # Diğer politikaların kaydettiği satırları (forced) bilmesi gerekiyor mu?
+    needs_forced = False
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        """
+        Temel politika: her adımı kaydeder.
+
+        Args:
+            columns: İzlenen kolonlar (varsayılan: bağlanan tüm kolonlar).
+        """
+        self.columns = tuple(columns) if columns is not None else None
+        self._positions: List[int] = []
+        self._started = False
+
+    def bind(self, names: Sequence[str]):
+        """Append argüman sırasındaki kolon adlarını bağlar ve izlenen kolonları doğrular."""
+        names = list(names)
+        if self.columns is None:
+            self.columns = tuple(names)
+        missing = [name for name in self.columns if name not in names]
+        if missing:
+            raise ValueError(f"Kayıt politikası bilinmeyen kolonları izliyor: {missing}")
+        self._positions = [names.index(name) for name in self.columns]
+
+    def reset(self):
+        self._started = False
+
+    def accept(self, index: int, values: Sequence[Any], forced: bool = False) -> bool:
+        """
+        Tek adım kararı (append yolu).
+
+        Args:
+            index: Adımın sıra numarası.
+            values: Bağlanan kolon sırasıyla değerler.
+            forced: Satır başka bir politika tarafından zaten kaydediliyor.
+        """
+        self._started = True
+        return True
+
+    def select(self, start: int, columns: Dict[str, Any], count: int,
+               forced: Optional[np.ndarray] = None, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Parça kararı (extend / timeline yolu): kaydedilecek satırların göreli indeksleri (artan).
+        accept()'in count kez çağrılmasıyla aynı seçimi ve aynı son durumu üretir.
+
+        Args:
+            start: İlk satırın sıra numarası.
+            columns: Kolon adı -> dizi ya da (tüm satırlar için aynı) skaler.
+            count: Satır sayısı.
+            forced: Başka politikaların kaydettiği göreli satırlar (artan).
+            limit: Verilirse yalnızca son 'limit' seçim döndürülür (durum yine tam güncellenir).
+        """
+        self._started = self._started or count > 0
+        return np.arange(max(0, count - limit) if limit is not None else 0, count)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"policy": "all"}
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"started": self._started}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self._started = bool(state["started"])
+
+
+class StridePolicy(RecordingPolicy):
+    def __init__(self, every: int, offset: int = 0):
+        """
+        Her 'every' adımda bir kaydeder (sıra numarası % every == offset % every).
+
+        Args:
+            every: Kayıt aralığı (>= 1).
+            offset: İlk kaydın kayması.
+        """
+        if every < 1:
+            raise ValueError(f"Kayıt aralığı en az 1 olmalı: {every}")
+        super().__init__(columns=())
+        self.every = int(every)
+        self.offset = int(offset)
+
+    def accept(self, index, values, forced=False) -> bool:
+        first = not self._started
+        self._started = True
+        return first or (index - self.offset) % self.every == 0
+
+    def select(self, start, columns, count, forced=None, limit=None) -> np.ndarray:
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        first = (self.offset - start) % self.every
+        total = max(0, -(-(count - first) // self.every))
+        skip = max(0, total - limit) if limit is not None else 0
+        rows = np.arange(first + skip * self.every, count, self.every, dtype=np.int64)
+        if not self._started and first != 0 and (limit is None or len(rows) < limit):
+            rows = np.r_[0, rows]
+        self._started = True
+        return rows
+
+    def describe(self) -> Dict[str, Any]:
+        return {"policy": "stride", "every": self.every}
+
+
+class ChangePolicy(RecordingPolicy):
+    needs_forced = True
+
+    def __init__(self, epsilon: float = 0.0, columns: Optional[Sequence[str]] = None):
+        """
+        İzlenen kolonlardan biri son kaydedilen değerinden epsilon'dan fazla uzaklaşınca kaydeder.
+        Forward-fill ile yeniden kurulan seri, izlenen kolonlarda gerçek değerden en fazla
+        epsilon sapar; epsilon = 0 kayıpsızdır (yalnızca değişen adımlar, run-length).
+
+        Args:
+            epsilon: Mutlak değişim eşiği (>= 0).
+            columns: İzlenen kolonlar (varsayılan: tümü).
+        """
+        if epsilon < 0:
+            raise ValueError(f"epsilon negatif olamaz: {epsilon}")
+        super().__init__(columns=columns)
+        self.epsilon = float(epsilon)
+        self._ref: List[float] = []
+
+    def reset(self):
+        super().reset()
+        self._ref = []
+
+    def accept(self, index, values, forced=False) -> bool:
+        return self._decide([values[p] for p in self._positions], forced)
+
+    def _decide(self, current: List[float], forced: bool) -> bool:
+        """[DAHİLİ] İzlenen değerler için tek adım kararı ve referans güncellemesi."""
+        if self.epsilon:
+            changed = any(abs(c - r) > self.epsilon for c, r in zip(current, self._ref))
+        else:
+            changed = any(c != r for c, r in zip(current, self._ref))
+        record = changed or not self._started
+        if record or forced:
+            self._ref = current
+            self._started = True
+        return record
+
+    def select(self, start, columns, count, forced=None, limit=None) -> np.ndarray:
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        raw = [columns[name] for name in self.columns]
+        if not any(np.ndim(v) for v in raw):
+            # Sabit girdi: yalnızca ilk satır kaydedilebilir.
+            record = self._decide([float(v) for v in raw], forced is not None and len(forced) > 0)
+            return np.array([0] if record else [], dtype=np.int64)
+
+        values = np.empty((len(raw), count))
+        for i, v in enumerate(raw):
+            values[i] = v
+        ref = np.array(self._ref, dtype=float) if self._started else None
+
+        if not self.epsilon:
+            # epsilon = 0: referans her zaman bir önceki satırdır, seçim tamamen vektöreldir.
+            previous = np.empty_like(values)
+            previous[:, 1:] = values[:, :-1]
+            if ref is not None:
+                previous[:, 0] = ref
+            changed = (values != previous).any(axis=0)
+            if ref is None:
+                changed[0] = True
+            rows = np.flatnonzero(changed)
+        else:
+            rows = self._scan(values, ref, forced)
+
+        if not self.epsilon:
+            self._ref = values[:, -1].tolist()
+        self._started = True
+        return _last(rows.astype(np.int64), limit)
+
+    def _scan(self, values: np.ndarray, ref: Optional[np.ndarray], forced: Optional[np.ndarray]) -> np.ndarray:
+        """[DAHİLİ] epsilon > 0: referanstan kopan ilk satırı büyüyen pencerelerle arar (O(n + kayıt))."""
+        count = values.shape[1]
+        hard = np.zeros(count, dtype=bool)
+        if forced is not None and len(forced):
+            hard[forced] = True
+        rows = []
+        i = 0
+        if ref is None:
+            rows.append(0)
+            ref = values[:, 0].copy()
+            i = 1
+        while i < count:
+            width = _SCAN_WIDTH
+            while True:
+                stop = min(count, i + width)
+                moved = (np.abs(values[:, i:stop] - ref[:, None]) > self.epsilon).any(axis=0)
+                hit = np.flatnonzero(moved | hard[i:stop])
+                if hit.size:
+                    r = i + int(hit[0])
+                    if moved[hit[0]]:
+                        rows.append(r)
+                    ref = values[:, r].copy()
+                    i = r + 1
+                    break
+                if stop == count:
+                    i = count
+                    break
+                i = stop
+                width *= 2
+        self._ref = ref.tolist()
+        return np.array(rows, dtype=np.int64)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"policy": "change", "epsilon": self.epsilon, "columns": list(self.columns or ())}
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"started": self._started, "ref": np.array(self._ref, dtype=float)}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        super().load_state_dict(state)
+        self._ref = np.asarray(state["ref"], dtype=float).tolist()
+
+
+class CrossingPolicy(RecordingPolicy):
+    def __init__(self, thresholds: Dict[str, Sequence[float]], window: int = 0):
+        """
+        Bir kolon eşiğini (önceki adıma göre, iki yönde) geçtiği adımı ve sonraki 'window'
+        adımı kaydeder.
+
+        Args:
+            thresholds: Kolon -> eşik listesi (ör. {"agency": [0.4, 0.8]}).
+            window: Geçişten sonra ayrıca kaydedilecek adım sayısı.
+        """
+        if window < 0:
+            raise ValueError(f"window negatif olamaz: {window}")
+        super().__init__(columns=list(thresholds))
+        self.thresholds = {name: [float(v) for v in values] for name, values in thresholds.items()}
+        self.window = int(window)
+        self._previous: List[float] = []
+        self._remaining = 0
+
+    def reset(self):
+        super().reset()
+        self._previous = []
+        self._remaining = 0
+
+    def accept(self, index, values, forced=False) -> bool:
+        return self._decide([values[p] for p in self._positions])
+
+    def _decide(self, current: List[float]) -> bool:
+        """[DAHİLİ] Tek adım kararı: geçiş varsa pencereyi açar, yoksa açık pencereyi tüketir."""
+        crossed = not self._started or any(
+            (c >= t) != (p >= t)
+            for c, p, name in zip(current, self._previous, self.columns)
+            for t in self.thresholds[name]
+        )
+        self._previous = current
+        self._started = True
+        if crossed:
+            self._remaining = self.window
+            return True
+        if self._remaining > 0:
+            self._remaining -= 1
+            return True
+        return False
+
+    def select(self, start, columns, count, forced=None, limit=None) -> np.ndarray:
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        raw = [columns[name] for name in self.columns]
+        if not any(np.ndim(v) for v in raw):
+            # Sabit girdi: geçiş yalnızca ilk satırda olabilir, sonrası açık pencerenin devamıdır.
+            first = self._decide([float(v) for v in raw])
+            extra = min(count - 1, self._remaining)
+            self._remaining -= extra
+            return _last(np.arange(0 if first else 1, 1 + extra, dtype=np.int64), limit)
+
+        crossed = np.zeros(count, dtype=bool)
+        for name, v in zip(self.columns, raw):
+            column = np.broadcast_to(np.asarray(v, dtype=float), (count,))
+            for t in self.thresholds[name]:
+                above = column >= t
+                crossed[1:] |= above[1:] != above[:-1]
+                if self._started:
+                    crossed[0] |= above[0] != (self._previous[self.columns.index(name)] >= t)
+        if not self._started:
+            crossed[0] = True
+
+        # Pencere: her satır için son geçişin konumu (önceki parçadan kalan pencere sanal bir geçiştir).
+        positions = np.arange(count)
+        carry = self._remaining - self.window - 1 if self._remaining else -(self.window + 2)
+        last = np.maximum.accumulate(np.where(crossed, positions, carry))
+        rows = np.flatnonzero(positions - last <= self.window)
+
+        self._remaining = max(0, self.window - (count - 1 - int(last[-1])))
+        self._previous = [float(np.broadcast_to(v, (count,))[-1]) for v in raw]
+        self._started = True
+        return _last(rows.astype(np.int64), limit)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"policy": "crossing", "thresholds": self.thresholds, "window": self.window}
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"started": self._started, "previous": np.array(self._previous, dtype=float),
+                "remaining": self._remaining}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        super().load_state_dict(state)
+        self._previous = np.asarray(state["previous"], dtype=float).tolist()
+        self._remaining = int(state["remaining"])
+
+
+class AnyPolicy(RecordingPolicy):
+    def __init__(self, *policies: RecordingPolicy):
+        """Politikaların birleşimi. ChangePolicy'ler, diğerlerinin kaydettiği satırları referans alır."""
+        if not policies:
+            raise ValueError("AnyPolicy en az bir politika almalı.")
+        super().__init__(columns=())
+        # Zorunlu satır bilgisi isteyenler en sona alınır.
+        self.policies = sorted(policies, key=lambda p: p.needs_forced)
+
+    def bind(self, names):
+        super().bind(names)
+        for policy in self.policies:
+            policy.bind(names)
+
+    def reset(self):
+        super().reset()
+        for policy in self.policies:
+            policy.reset()
+
+    def accept(self, index, values, forced=False) -> bool:
+        record = forced
+        for policy in self.policies:
+            record = policy.accept(index, values, forced=record) or record
+        self._started = True
+        return record
+
+    def select(self, start, columns, count, forced=None, limit=None) -> np.ndarray:
+        rows = np.zeros(0, dtype=np.int64) if forced is None else np.asarray(forced, dtype=np.int64)
+        # Dizi girdilerde ChangePolicy tüm zorunlu satırları görmeli; sınır yalnızca sabit girdide uygulanır.
+        inner = limit if not any(np.ndim(v) for v in columns.values()) else None
+        for policy in self.policies:
+            rows = np.union1d(rows, policy.select(start, columns, count, forced=rows, limit=inner))
+        self._started = self._started or count > 0
+        return _last(rows.astype(np.int64), limit)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"policy": "any", "policies": [policy.describe() for policy in self.policies]}
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {str(i): policy.state_dict() for i, policy in enumerate(self.policies)}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        for i, policy in enumerate(self.policies):
+            policy.load_state_dict(state[str(i)])
+        self._started = any(policy._started for policy in self.policies)
+
+
+def expand_timeline(timeline: Dict[str, Any], steps: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Politikayla seyreltilmiş timeline'ı adım bazına açar: her satır bir sonraki kayıtlı adıma
+    kadar tekrarlanır ('step' kolonu 0..steps-1 olur). ChangePolicy(epsilon=0) ile kaydedilen
+    kolonlar için sonuç, her adımın yazıldığı timeline ile birebir aynıdır.
+
+    Args:
+        timeline: Kolon -> liste/dizi ('step' kolonu zorunlu, artan).
+        steps: Toplam adım (varsayılan: son kayıtlı adım + 1).
+    """
+    step = np.asarray(timeline["step"], dtype=np.int64)
+    if not len(step):
+        return {name: np.asarray(values) for name, values in timeline.items()}
+    end = int(step[-1]) + 1 if steps is None else int(steps)
+    counts = np.diff(np.append(step, end))
+    out = {name: np.repeat(np.asarray(values), counts) for name, values in timeline.items() if name != "step"}
+    out["step"] = np.arange(int(step[0]), end, dtype=np.int64)
+    return out
+
+
+class RecordingSink:
+    def __init__(self, sink: Any, policy: RecordingPolicy, steps: Optional[int] = None):
+        """
+        Timeline parçalarını kayıt politikasından geçirip alttaki sink'e iletir.
+        Parçaların 'step' kolonu ardışık adımlardır; son adım (steps - 1) her zaman korunur.
+
+        Args:
+            sink: Alttaki timeline sink'i (writer ya da DownsamplingSink).
+            policy: Kayıt politikası (kolon adları parçanın kolonlarıdır).
+            steps: Toplam adım sayısı.
+        """
+        self.target = sink
+        self.policy = policy
+        self.steps = steps
+        self.source_rows = 0
+        self.rows = 0
+        self._bound = False
+
+    def write_header(self, header: Dict[str, Any]):
+        self.target.write_header(header)
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        n = len(chunk["step"]) if chunk else 0
+        if not n:
+            return
+        if not self._bound:
+            self.policy.bind(list(chunk))
+            self._bound = True
+        start = int(chunk["step"][0])
+        rows = self.policy.select(start, chunk, n)
+        if self.steps is not None and start + n == self.steps and (not len(rows) or rows[-1] != n - 1):
+            rows = np.append(rows, n - 1)
+        self.source_rows += n
+        if len(rows):
+            self.target.write_chunk({name: col[rows] for name, col in chunk.items()})
+            self.rows += len(rows)
+
+    def write_footer(self, footer: Dict[str, Any]):
+        self.target.write_footer(footer)
+
+    def finish(self) -> Dict[str, Any]:
+        """Alttaki sink'in özeti (ör. DownsamplingSink.finish())."""
+        return self.target.finish()
+
+    def summary(self) -> Dict[str, Any]:
+        return {**self.policy.describe(), "source_rows": int(self.source_rows), "rows": int(self.rows)}
+
+    def drain(self):
+        drain = getattr(self.target, "drain", None)
+        if drain is not None:
+            drain()
+
+    def close(self):
+        self.target.close()
+
+    def to_dict(self) -> Dict[str, list]:
+        return self.target.to_dict()
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için politika durumu ve sayaçlar (+ alttaki sink'in durumu)."""
+        return {"target": self.target.state_dict(), "policy": self.policy.state_dict(),
+                "source_rows": self.source_rows, "rows": self.rows}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler (politika ilk parçada yeniden bağlanır)."""
+        self.target.load_state_dict(state["target"])
+        self.policy.load_state_dict(state["policy"])
+        self.source_rows = int(state["source_rows"])
+        self.rows = int(state["rows"])
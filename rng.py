@@ -0,0 +1,273 @@
+"""
+WNEURA RANDOM STREAMS v1.0
+Developer: Efeatagul
+
+Description:
+    Ajan ve ortam başına bağımsız, tohumlanabilir rastgele sayı akışları.
+    Her akış bir np.random.Generator'dır (PCG64) ve SeedSequence spawn ağacından
+    türetilir; böylece işlem havuzlarında ve topluluk (ensemble) koşularında
+    sonuçlar tekrarlanabilir. BufferedRNG, uniform sayıları binlerlik bloklar
+    halinde önceden çeker ve skaler istekleri bu tampondan karşılar (adım başına
+    tek C çağrısı yerine blok başına bir çağrı).
+"""
+
+import json
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+
+# explore(): Olasılığı en az bu kadar deneme boyunca sabit kalan aralıklar vektörel işlenir.
+EXPLORE_MIN_RUN = 32
+
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def spawn_seeds(seed: Union[None, int, np.random.SeedSequence], n: int) -> List[np.random.SeedSequence]:
+    """Kök tohumdan n adet bağımsız alt SeedSequence üretir."""
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return root.spawn(n)
+
+
+class BufferedRNG:
+    def __init__(self, seed: Any = None, block_size: int = 4096):
+        """
+        Blok halinde önceden çekilmiş uniform sayılar sunan akış.
+
+        Args:
+            seed: None (entropi), int, SeedSequence, np.random.Generator ya da başka bir BufferedRNG.
+            block_size: Tek seferde çekilecek sayı adedi.
+        """
+        if block_size <= 0:
+            raise ValueError(f"Blok boyutu pozitif olmalı: {block_size}")
+        if isinstance(seed, BufferedRNG):
+            seed = seed.generator
+        self.generator = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        self.block_size = int(block_size)
+        self._buffer: List[float] = []
+        self._pos = 0
+
+    def _refill(self):
+        self._buffer = self.generator.random(self.block_size).tolist()
+        self._pos = 0
+
+    def random(self) -> float:
+        """[0, 1) aralığında tek bir uniform sayı."""
+        if self._pos >= len(self._buffer):
+            self._refill()
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def randint(self, low: int, high: Optional[int] = None) -> int:
+        """[low, high) aralığında tamsayı (high verilmezse [0, low))."""
+        if high is None:
+            low, high = 0, low
+        span = high - low
+        return low + min(int(self.random() * span), span - 1)
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        return low + (high - low) * self.random()
+
+    def choice(self, options):
+        """Listeden eşit olasılıkla bir eleman seçer."""
+        return options[self.randint(len(options))]
+
+    def skip(self, count: int, probability: Any = 0.0) -> int:
+        """
+        'count' adet keşif denemesinin RNG tüketimini taklit eder: her deneme bir sayı çeker;
+        sayı < probability ise (randint için) bir sayı daha çeker. NeuroAgent.act() döngüsüyle
+        bit-bit aynı akış konumunu verir. Olasılık sıfırsa sayı üretilmeden O(1) atlanır,
+        aksi halde maliyet explore() ile aynıdır.
+
+        Args:
+            probability: Skaler ya da deneme başına (count,) olasılık dizisi.
+
+        Returns:
+            Başarılı (keşif yapılan) deneme sayısı.
+        """
+        count = int(count)
+        if not np.any(np.asarray(probability) > 0.0):
+            self._advance(count)
+            return 0
+        return len(self.explore(count, probability)[0])
+
+    def explore(self, count: int, probability: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        skip() ile aynı tüketim; ayrıca keşif yapılan denemeleri ve randint sayılarını döndürür.
+
+        Sayılar yine üretilmek zorundadır (O(count)), ancak olasılığın en az EXPLORE_MIN_RUN
+        deneme boyunca sabit kaldığı aralıklar tampon bloğu başına tek vektörel geçişle işlenir.
+        Olasılığın her denemede değiştiği kısa aralıklar deneme başına Python döngüsüyle işlenir.
+
+        Returns:
+            (keşif yapılan deneme indeksleri, bu denemelerin ikinci [0, 1) sayıları)
+        """
+        count = int(count)
+        probability = np.asarray(probability, dtype=np.float64)
+        if probability.ndim == 0:
+            bounds = np.array([0, count])
+        else:
+            probability = np.broadcast_to(probability, (count,))
+            bounds = np.r_[0, np.flatnonzero(probability[1:] != probability[:-1]) + 1, count]
+
+        trials: List[np.ndarray] = []
+        draws: List[np.ndarray] = []
+        slow = None
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            if stop - start < EXPLORE_MIN_RUN:
+                slow = start if slow is None else slow
+                continue
+            if slow is not None:
+                self._explore_stepwise(slow, start, probability, trials, draws)
+                slow = None
+            p = float(probability if probability.ndim == 0 else probability[start])
+            if p > 0.0:
+                hit, values = self._explore_constant(stop - start, p)
+                trials.append(hit + start)
+                draws.append(values)
+            else:
+                self._advance(stop - start)
+        if slow is not None:
+            self._explore_stepwise(slow, count, probability, trials, draws)
+
+        if not trials:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(trials).astype(np.int64), np.concatenate(draws)
+
+    def _explore_stepwise(self, start: int, stop: int, probability: np.ndarray,
+                          trials: List[np.ndarray], draws: List[np.ndarray]):
+        """[DAHİLİ] explore() için deneme başına döngü (olasılığı sık değişen kısa aralıklar)."""
+        probs = np.broadcast_to(probability, (stop,))[start:stop].tolist()
+        hit = []
+        values = []
+        for i, p in enumerate(probs, start):
+            if self.random() < p:
+                hit.append(i)
+                values.append(self.random())
+        trials.append(np.asarray(hit, dtype=np.int64))
+        draws.append(np.asarray(values, dtype=np.float64))
+
+    def _explore_constant(self, count: int, p: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        [DAHİLİ] Sabit olasılıklı 'count' deneme, tampon bloğu başına vektörel.
+
+        Sabit olasılıkta bir sayının isabeti yalnızca kendi değerine bağlıdır. Deneme sayıları,
+        son ıskalanan sayıdan sonra gelen isabet dizisinde çift konumlardadır (tek konumlar
+        bir önceki denemenin randint sayısıdır).
+        """
+        trials: List[np.ndarray] = []
+        draws: List[np.ndarray] = []
+        done = 0
+        while done < count:
+            if self._pos >= len(self._buffer):
+                self._refill()
+            block = np.asarray(self._buffer[self._pos:], dtype=np.float64)
+            size = len(block)
+            hit = block < p
+            index = np.arange(size)
+            last_miss = np.maximum.accumulate(np.where(hit, -1, index))
+            run_start = np.r_[0, last_miss[:-1] + 1]
+            positions = np.flatnonzero((index - run_start) % 2 == 0)[:count - done]
+
+            hits = hit[positions]
+            trials.append(done + np.flatnonzero(hits))
+            follow = positions[hits] + 1
+            last = int(positions[-1])
+            pending = bool(hit[last]) and last + 1 == size
+            draws.append(block[follow[:-1] if pending else follow])
+            self._pos += size if pending else last + 1 + int(hit[last])
+            done += len(positions)
+            if pending:
+                draws.append(np.array([self.random()]))
+        return np.concatenate(trials), np.concatenate(draws)
+
+    def _advance(self, count: int):
+        """[DAHİLİ] Akışı 'count' sayı ileri sarar; tam bloklar üretilmeden atlanır."""
+        available = len(self._buffer) - self._pos
+        if count <= available:
+            self._pos += count
+            return
+        count -= available
+        blocks, rest = divmod(count, self.block_size)
+        bit_generator = self.generator.bit_generator
+        if blocks and hasattr(bit_generator, "advance"):
+            bit_generator.advance(blocks * self.block_size)
+        else:
+            for _ in range(blocks):
+                self.generator.random(self.block_size)
+        self._refill()
+        self._pos = rest
+
+    def random_block(self, size: int) -> np.ndarray:
+        """Tampondan sırayla 'size' adet uniform sayıyı dizi olarak tüketir."""
+        out = np.empty(size)
+        filled = 0
+        while filled < size:
+            if self._pos >= len(self._buffer):
+                self._refill()
+            take = min(size - filled, len(self._buffer) - self._pos)
+            out[filled:filled + take] = self._buffer[self._pos:self._pos + take]
+            self._pos += take
+            filled += take
+        return out
+
+    def integers(self, low: int, high: Optional[int] = None, size: int = 1) -> np.ndarray:
+        """randint'in vektörel karşılığı; skaler çağrılarla aynı sayı dizisini tüketir."""
+        if high is None:
+            low, high = 0, low
+        span = high - low
+        values = np.floor(self.random_block(size) * span).astype(np.int64)
+        return low + np.minimum(values, span - 1)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için generator durumu ve tüketilmemiş tampon."""
+        return {
+            "bit_generator": json.dumps(self.generator.bit_generator.state),
+            "buffer": np.asarray(self._buffer[self._pos:], dtype=np.float64),
+            "block_size": self.block_size
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler; akış kaldığı sayıdan devam eder."""
+        bit_state = json.loads(str(state["bit_generator"]))
+        if bit_state["bit_generator"] != type(self.generator.bit_generator).__name__:
+            raise ValueError(f"Bit generator tipi uyuşmuyor: {bit_state['bit_generator']}")
+        self.generator.bit_generator.state = bit_state
+        self._buffer = np.asarray(state["buffer"], dtype=np.float64).tolist()
+        self._pos = 0
+        self.block_size = int(state["block_size"])
+
+    def __repr__(self) -> str:
+        return f"BufferedRNG(block_size={self.block_size}, buffered={len(self._buffer) - self._pos})"
+
+
+def spawn_streams(seed: Union[None, int, np.random.SeedSequence], n: int,
+                  block_size: int = 4096) -> List[BufferedRNG]:
+    """Kök tohumdan n adet bağımsız BufferedRNG akışı üretir."""
+    return [BufferedRNG(child, block_size) for child in spawn_seeds(seed, n)]
+
+
+if __name__ == "__main__":
+    import time
+
+    print("🎲 BufferedRNG Benchmark (np.random.rand vs blok tampon)")
+    draws = 500000
+
+    t0 = time.perf_counter()
+    for _ in range(draws):
+        np.random.rand()
+    t_global = time.perf_counter() - t0
+
+    stream = BufferedRNG(0)
+    t0 = time.perf_counter()
+    for _ in range(draws):
+        stream.random()
+    t_buffered = time.perf_counter() - t0
+
+    a, b = spawn_streams(42, 2)
+    c, d = spawn_streams(42, 2)
+    reproducible = [a.random() for _ in range(10)] == [c.random() for _ in range(10)]
+
+    print(f"   np.random.rand : {t_global / draws * 1e9:.0f} ns/draw")
+    print(f"   BufferedRNG    : {t_buffered / draws * 1e9:.0f} ns/draw  (x{t_global / t_buffered:.1f})")
+    print(f"   Reproducible   : {'✅' if reproducible else '❌'}")
@@ -11,6 +11,7 @@ Description:
 import argparse
 import json
 import os
+import shutil
 import sys
 import numpy as np
 
@@ -20,18 +21,39 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from wneura.config import BrainConfig
     from wneura.agent import NeuroAgent
+    from wneura.rng import BufferedRNG, spawn_seeds
+    from wneura.scenario import SCENARIOS, ScenarioStream, load_scenario
+    from wneura.profiling import Profiler, instrument_simulation
+    from wneura.timeline import (TIMELINE_COLUMNS, TimelineBuffer, MemoryTimelineSink,
+                                 NDJSONTimelineWriter, BinaryTimelineWriter, BackgroundWriter,
+                                 copy_binary_timeline)
 except ImportError:
     
     from config import BrainConfig
     from agent import NeuroAgent
+    from rng import BufferedRNG, spawn_seeds
+    from scenario import SCENARIOS, ScenarioStream, load_scenario
+    from profiling import Profiler, instrument_simulation
+    from timeline import (TIMELINE_COLUMNS, TimelineBuffer, MemoryTimelineSink,
+                          NDJSONTimelineWriter, BinaryTimelineWriter, BackgroundWriter,
+                          copy_binary_timeline)
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="WNEURA Neuro-Simulation CLI")
     
     
     parser.add_argument('--steps', type=int, default=100, help='Simülasyon adım sayısı')
-    parser.add_argument('--scenario', type=str, default='mixed', choices=['mixed', 'chaos', 'therapy', 'stable'], help='Ortam senaryosu')
+    parser.add_argument('--scenario', type=str, default='mixed', choices=list(SCENARIOS), help='Ortam senaryosu')
+    parser.add_argument('--scenario_file', type=str, default=None, help='JSON senaryo tanımı (--scenario yerine, bkz. scenario.py)')
     parser.add_argument('--output', type=str, default='simulation_result.json', help='Çıktı JSON dosyası')
+    parser.add_argument('--format', type=str, default='json', choices=['json', 'ndjson', 'binary'], help='Çıktı formatı (ndjson = akış, binary = kolon tabanlı + memmap)')
+    parser.add_argument('--binary_dtype', type=str, default='float64', choices=['float64', 'float32'], help='Binary formatta ondalıklı kolon tipi')
+    parser.add_argument('--max_points', type=int, default=None, help='Timeline\'ı en fazla bu kadar satıra seyrelt (eşik geçişleri ayrıca korunur, bkz. downsample.py)')
+    parser.add_argument('--downsample', type=str, default='lttb', choices=['lttb', 'minmax'], help='--max_points seyreltme yöntemi')
+    parser.add_argument('--chunk_size', type=int, default=4096, help='Timeline parça boyutu (adım)')
+    parser.add_argument('--record', type=str, default='all', help='Timeline kayıt politikası: all ya da stride,change,crossing birleşimi (bkz. recording.py)')
+    parser.add_argument('--record_epsilon', type=float, default=0.0, help='--record change için değişim eşiği (0 = kayıpsız run-length)')
+    parser.add_argument('--record_window', type=int, default=0, help='--record crossing için geçişten sonra kaydedilen adım sayısı')
     
    
     parser.add_argument('--erosion', type=float, default=0.05, help='Agency aşınma hızı')
@@ -39,76 +61,473 @@ def parse_arguments():
     parser.add_argument('--stress_threshold', type=float, default=0.6, help='Kortizol tetik eşiği')
     parser.add_argument('--initial_agency', type=float, default=1.0, help='Başlangıç iradesi')
     
+    
+    parser.add_argument('--sweep', type=str, default=None, help='Parametre taraması spec dosyası (JSON, grid/lhs)')
+    parser.add_argument('--phase_map', type=str, default=None, help='Uyarlamalı histerezis sınırı haritası spec dosyası (JSON, bkz. phase_diagram.py)')
+    parser.add_argument('--ensemble', type=int, default=None, help='Monte Carlo topluluk modu: M replika, adım başına akan istatistikler (bkz. ensemble.py)')
+    parser.add_argument('--ensemble_block', type=int, default=256, help='Topluluk modunda aynı anda koşan replika sayısı')
+    parser.add_argument('--record_every', type=int, default=1, help='Kayıt aralığı (topluluk istatistikleri ve --record stride)')
+    parser.add_argument('--quantiles', type=str, default='0.05,0.25,0.5,0.75,0.95', help='Topluluk yüzdelik bantları (virgülle ayrılmış)')
+    parser.add_argument('--workers', type=int, default=None, help='Sweep/daemon işçi sayısı (varsayılan: tüm çekirdekler)')
+    parser.add_argument('--seed', type=int, default=None, help='Tekrarlanabilir koşu için RNG tohumu')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Checkpoint dosyası (.npz)')
+    parser.add_argument('--checkpoint_every', type=int, default=0, help='Her K adımda bir checkpoint al (0 = yalnızca sonda)')
+    parser.add_argument('--resume', action='store_true', help='--checkpoint dosyasından kaldığı yerden devam et')
+    parser.add_argument('--profile', action='store_true', help='Sıcak yol zaman/çağrı dökümünü sonuç JSON\'una ekle (bkz. profiling.py)')
+    parser.add_argument('--live', type=str, default=None, help='Timeline\'ı bu adlı shared memory halkasına canlı yayınla (bkz. live.py)')
+    parser.add_argument('--live_file', type=str, default=None, help='Canlı yayın için bellek eşlemeli dosya (--live yerine)')
+    parser.add_argument('--live_capacity', type=int, default=65536, help='Canlı halkada tutulan son adım sayısı')
+    parser.add_argument('--cache_dir', type=str, default=None, help='İçerik adresli sonuç önbelleği dizini (yalnızca --seed verilen koşular, bkz. cache.py)')
+    parser.add_argument('--cache_max_mb', type=float, default=1024, help='Önbellek boyut sınırı (MB, LRU tahliye)')
+    parser.add_argument('--serve', action='store_true', help='Kalıcı (warm) daemon modu: satır başına bir JSON istek okur')
+    parser.add_argument('--socket', type=str, default=None, help='--serve için Unix socket yolu (varsayılan: stdin/stdout)')
+    
     return parser.parse_args()
 
-def get_environment_reward(scenario):
-    """Senaryoya göre ödül/ceza üretir."""
-    if scenario == 'chaos':
-        return np.random.randint(-5, 0) 
-    elif scenario == 'therapy':
-        return 5 
-    elif scenario == 'stable':
-        return 0 
+def resolve_scenario(args):
+    """--scenario_file verildiyse onu, yoksa hazır --scenario tanımını döndürür."""
+    return load_scenario(getattr(args, 'scenario_file', None) or args.scenario)
+
+def create_streams(seed):
+    """Tek bir kök tohumdan ajan RNG akışını ve ortam (senaryo) tohumunu üretir."""
+    agent_seed, env_seed = spawn_seeds(seed, 2)
+    return BufferedRNG(agent_seed), env_seed
+
+def create_environment(args, seed):
+    return ScenarioStream(resolve_scenario(args), seed=seed, chunk_size=args.chunk_size)
+
+def build_config(args):
+    """CLI argümanlarından BrainConfig oluşturur."""
+    cfg = BrainConfig()
+    cfg.erosion_rate = args.erosion
+    cfg.repair_rate = args.repair
+    cfg.stress_threshold = args.stress_threshold
+    cfg.initial_agency = args.initial_agency
+    return cfg
+
+def run_sweep_mode(args):
+    """--sweep: Tüm taramayı tek süreçte koşturur ve tek bir kompakt özet dosyası yazar."""
+    try:
+        from sweep import run_sweep
+    except ImportError:
+        from wneura.sweep import run_sweep
+
+    try:
+        with open(args.sweep, 'r') as f:
+            spec = json.load(f)
+
+        summary = run_sweep(spec, base_config=build_config(args), steps=args.steps,
+                            scenario=resolve_scenario(args).to_dict(), workers=args.workers)
+        output_data = {
+            "status": "success",
+            "parameters": vars(args),
+            "sweep": summary
+        }
+        print(f"✅ Sweep completed in {summary['elapsed_sec']}s.")
+
+    except Exception as e:
+        print(f"❌ CRITICAL ERROR: {str(e)}")
+        output_data = {
+            "status": "error",
+            "error_message": str(e),
+            "parameters": vars(args)
+        }
+
+    try:
+        with open(args.output, 'w') as f:
+            json.dump(output_data, f, separators=(',', ':'))
+        print(f"💾 Results saved to: {args.output}")
+    except Exception as e:
+        print(f"❌ COULD NOT WRITE FILE: {e}")
+        sys.exit(1)
+
+def run_phase_map_mode(args):
+    """--phase_map: İyileşme/depresyon sınırını uyarlamalı olarak haritalar ve özet dosyası yazar."""
+    try:
+        from phase_diagram import map_phase_boundary
+    except ImportError:
+        from wneura.phase_diagram import map_phase_boundary
+
+    try:
+        with open(args.phase_map, 'r') as f:
+            spec = json.load(f)
+
+        summary = map_phase_boundary(spec, base_config=build_config(args))
+        output_data = {
+            "status": "success",
+            "parameters": vars(args),
+            "phase_map": summary
+        }
+        print(f"✅ Phase map completed in {summary['elapsed_sec']}s "
+              f"({summary['evaluations']} / {summary['grid_evaluations']} grid evaluations).")
+
+    except Exception as e:
+        print(f"❌ CRITICAL ERROR: {str(e)}")
+        output_data = {
+            "status": "error",
+            "error_message": str(e),
+            "parameters": vars(args)
+        }
+
+    try:
+        with open(args.output, 'w') as f:
+            json.dump(output_data, f, separators=(',', ':'))
+        print(f"💾 Results saved to: {args.output}")
+    except Exception as e:
+        print(f"❌ COULD NOT WRITE FILE: {e}")
+        sys.exit(1)
+
+def run_ensemble_mode(args):
+    """--ensemble: M replikayı koşturur, timeline saklamadan yüzdelik bantlarını yazar."""
+    try:
+        from ensemble import run_ensemble
+    except ImportError:
+        from wneura.ensemble import run_ensemble
+
+    try:
+        quantiles = [float(q) for q in args.quantiles.split(',') if q.strip()]
+        summary = run_ensemble(args.ensemble, args.steps, config=build_config(args),
+                               scenario=resolve_scenario(args), seed=args.seed,
+                               block_size=args.ensemble_block, record_every=args.record_every,
+                               quantiles=quantiles)
+        output_data = {
+            "status": "success",
+            "parameters": vars(args),
+            "ensemble": summary
+        }
+        print(f"✅ Ensemble completed in {summary['elapsed_sec']}s.")
+
+    except Exception as e:
+        print(f"❌ CRITICAL ERROR: {str(e)}")
+        output_data = {
+            "status": "error",
+            "error_message": str(e),
+            "parameters": vars(args)
+        }
+
+    try:
+        with open(args.output, 'w') as f:
+            json.dump(output_data, f, separators=(',', ':'))
+        print(f"💾 Results saved to: {args.output}")
+    except Exception as e:
+        print(f"❌ COULD NOT WRITE FILE: {e}")
+        sys.exit(1)
+
+def timeline_columns(args):
+    """Çıktı kolonları; --max_points ile eşik geçişi bit maskesi ('crossing') eklenir."""
+    columns = dict(TIMELINE_COLUMNS)
+    if args.max_points:
+        columns["crossing"] = np.int64
+    return columns
+
+def create_recording_policy(args):
+    """--record: Timeline kayıt politikasını kurar ('all' -> None, her adım yazılır)."""
+    names = [name.strip() for name in args.record.split(',') if name.strip()]
+    try:
+        from recording import (RECORD_POLICIES, AnyPolicy, StridePolicy, ChangePolicy, CrossingPolicy)
+        from phase_diagram import RECOVERY_THRESHOLDS
+    except ImportError:
+        from wneura.recording import (RECORD_POLICIES, AnyPolicy, StridePolicy, ChangePolicy, CrossingPolicy)
+        from wneura.phase_diagram import RECOVERY_THRESHOLDS
+
+    unknown = [name for name in names if name not in RECORD_POLICIES]
+    if unknown or not names:
+        raise ValueError(f"Bilinmeyen kayıt politikası: {args.record} (seçenekler: {RECORD_POLICIES})")
+    if 'all' in names:
+        return None
+
+    policies = []
+    if 'stride' in names:
+        policies.append(StridePolicy(args.record_every))
+    if 'change' in names:
+        policies.append(ChangePolicy(args.record_epsilon, columns=("cortisol", "agency", "rpe", "action")))
+    if 'crossing' in names:
+        thresholds = {"agency": list(RECOVERY_THRESHOLDS), "cortisol": [args.stress_threshold]}
+        policies.append(CrossingPolicy(thresholds, window=args.record_window))
+    return policies[0] if len(policies) == 1 else AnyPolicy(*policies)
+
+def create_timeline_sink(args, resume=False):
+    """
+    Çıktı formatına göre timeline sink'ini oluşturur. --max_points ile seyrelticiyle,
+    --record ile (en dışta) kayıt politikasıyla sarılır. resume=True ile NDJSON / binary
+    dosyaları silinmeden açılır; konum checkpoint'ten yüklenir.
+    """
+    if args.format == 'ndjson':
+        sink = BackgroundWriter(NDJSONTimelineWriter(args.output, resume=resume))
+    elif args.format == 'binary':
+        sink = BackgroundWriter(BinaryTimelineWriter(args.output, capacity=args.steps, float_dtype=args.binary_dtype,
+                                                     columns=timeline_columns(args), resume=resume))
     else:
-        return np.random.randint(-5, 5)
+        # --checkpoint: checkpoint'ler yalnızca yeni satırları <checkpoint>.timeline dosyasına ekler.
+        spill_path = f"{args.checkpoint}.timeline" if args.checkpoint else None
+        sink = MemoryTimelineSink(spill_path=spill_path, resume=resume)
+
+    if args.max_points:
+        try:
+            from downsample import DownsamplingSink
+            from phase_diagram import RECOVERY_THRESHOLDS
+        except ImportError:
+            from wneura.downsample import DownsamplingSink
+            from wneura.phase_diagram import RECOVERY_THRESHOLDS
+        thresholds = {"agency": list(RECOVERY_THRESHOLDS), "cortisol": [args.stress_threshold]}
+        sink = DownsamplingSink(sink, args.steps, args.max_points, method=args.downsample, thresholds=thresholds)
+
+    policy = create_recording_policy(args)
+    if policy is not None:
+        try:
+            from recording import RecordingSink
+        except ImportError:
+            from wneura.recording import RecordingSink
+        sink = RecordingSink(sink, policy, steps=args.steps)
+    return sink
+
+def print_progress(percent):
+    print(f"   ... Progress: {percent}%", flush=True)
+
+def run_simulation(args, cfg, sink, agent=None, environment=None, on_progress=print_progress,
+                   checkpointer=None, start_step=0, profiler=None, live=None, buffer=None):
+    """
+    Simülasyonu koşturur, timeline'ı parçalar halinde sink'e yazar ve final_stats döndürür.
+
+    Args:
+        agent: Önceden oluşturulmuş (sıfırlanmış) ajan; verilmezse cfg ile yeni ajan kurulur.
+        environment: Önceden oluşturulmuş ScenarioStream; verilmezse args.scenario ile kurulur.
+        on_progress: %10'luk ilerleme bildirimi için callback (None = sessiz).
+        checkpointer: Verilirse her adım sonunda maybe_save(t + 1) çağrılır.
+        start_step: Checkpoint'ten devam ederken ilk adım indeksi.
+        profiler: Verilirse sıcak yollar bu Profiler ile enstrümante edilir (None = sıfır maliyet).
+        live: Verilirse her timeline parçası (seyreltilmeden) bu LiveTimelinePublisher'a da yazılır.
+        buffer: Önceden oluşturulmuş (checkpoint'ten yüklenmiş olabilir) TimelineBuffer.
+    """
+    if args.steps < 1:
+        raise ValueError(f"Adım sayısı en az 1 olmalı: {args.steps}")
+
+    if agent is None or environment is None:
+        agent_rng, env_seed = create_streams(getattr(args, 'seed', None))
+        if agent is None:
+            agent = NeuroAgent(action_dim=1, config=cfg, rng=agent_rng)
+        if environment is None:
+            environment = create_environment(args, env_seed)
+    apply_stress = environment.scenario.has_stress
+    if buffer is None:
+        buffer = TimelineBuffer(args.chunk_size)
+    report_every = args.steps // 10 if args.steps >= 10 else 0
+    if profiler is not None:
+        instrument_simulation(profiler, agent=agent, environment=environment, buffer=buffer, sink=sink)
+        if checkpointer is not None:
+            profiler.instrument(checkpointer, "save", "checkpoint")
+        if live is not None:
+            profiler.instrument(live, "write_chunk", "live")
+
+    for t in range(start_step, args.steps):
+        
+        action = agent.act()
+        
+    
+        reward, stress = environment.step()
+        
+       
+        info = agent.learn(action, reward)
+        if apply_stress:
+            agent.brain.update_amygdala(stress)
+    
+
+        if buffer.append(t, info["cortisol"], info["agency"], info["rpe"], action):
+            chunk = buffer.take()
+            sink.write_chunk(chunk)
+            if live is not None:
+                live.write_chunk(chunk)
+
+       
+        if report_every and on_progress and t % report_every == 0:
+            progress = (t / args.steps) * 100
+            on_progress(int(progress))
+
+        if checkpointer is not None:
+            checkpointer.maybe_save(t + 1)
+
+    chunk = buffer.take()
+    sink.write_chunk(chunk)
+    if live is not None:
+        live.write_chunk(chunk)
+
+    return {
+        "final_agency": float(agent.brain.agency),
+        "final_cortisol": float(agent.brain.cortisol)
+    }
+
+def run_checkpointed_simulation(args, cfg, sink, profiler=None, live=None):
+    """
+    --checkpoint: Gerekirse checkpoint'ten devam eder, periyodik ve final checkpoint alır.
+    Timeline tamponu ve sink (yazılan satır / dosya konumu) da checkpoint'e girer; böylece
+    --resume çıktıyı checkpoint adımından sürdürür ve kesintisiz koşuyla aynı dosyayı üretir.
+    """
+    try:
+        from checkpoint import Checkpointer, load_checkpoint
+    except ImportError:
+        from wneura.checkpoint import Checkpointer, load_checkpoint
+
+    agent_rng, env_seed = create_streams(args.seed)
+    agent = NeuroAgent(action_dim=1, config=cfg, rng=agent_rng)
+    environment = create_environment(args, env_seed)
+    buffer = TimelineBuffer(args.chunk_size)
+    streams = {"environment": environment, "timeline": sink, "timeline_buffer": buffer}
+
+    start_step = 0
+    if args.resume and os.path.exists(args.checkpoint):
+        start_step = load_checkpoint(args.checkpoint, agent=agent, streams=streams)["step"]
+        print(f"♻️ Resumed from checkpoint at step {start_step}: {args.checkpoint}")
+
+    checkpointer = Checkpointer(args.checkpoint, every=args.checkpoint_every, agent=agent, streams=streams)
+    final_stats = run_simulation(args, cfg, sink, agent=agent, environment=environment,
+                                 checkpointer=checkpointer, start_step=start_step, profiler=profiler,
+                                 live=live, buffer=buffer)
+    if not args.checkpoint_every or args.steps % args.checkpoint_every:
+        checkpointer.save(max(args.steps, start_step))
+    return final_stats
+
+def open_result_cache(args):
+    """
+    --cache_dir: (ResultCache, anahtar) döndürür. Tohumsuz (tekrarlanamaz), checkpoint'li,
+    profilli ya da canlı yayınlanan koşular önbelleğe alınmaz -> (None, None).
+    """
+    if not args.cache_dir or args.seed is None or args.checkpoint or args.profile or args.live or args.live_file:
+        return None, None
+    try:
+        from cache import ResultCache, result_key
+    except ImportError:
+        from wneura.cache import ResultCache, result_key
+
+    output = {"format": args.format}
+    if args.format != 'json':
+        output.update(binary_dtype=args.binary_dtype, chunk_size=args.chunk_size)
+    if args.max_points:
+        output.update(max_points=args.max_points, downsample=args.downsample)
+    if args.record != 'all':
+        output.update(record=args.record, record_every=args.record_every,
+                      record_epsilon=args.record_epsilon, record_window=args.record_window)
+    try:
+        key = result_key(build_config(args), resolve_scenario(args).to_dict(), args.steps, args.seed, output)
+        return ResultCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024)), key
+    except Exception as e:
+        print(f"⚠️ Cache disabled: {e}")
+        return None, None
+
+def parameter_rewriter(args):
+    """
+    Önbellek isabeti için kopyalama dönüşümü: sonucun 'parameters' bloğu (output, cache_dir gibi
+    koşuya özgü alanlar dahil) bu koşunun argümanlarıyla yeniden yazılır. Timeline ayrıştırılmaz;
+    json'da blok metin olarak değiştirilir, ndjson'da başlık satırı, binary'de JSON başlık yenilenir.
+    """
+    parameters = vars(args)
+    if args.format == 'binary':
+        return lambda src, out: copy_binary_timeline(src, out, {"parameters": parameters})
+
+    def rewrite(src, out):
+        if args.format == 'json':
+            # json.dump(indent=4) düzeni: blok '    "parameters": {' ile başlar, '    }' ile biter.
+            block = json.dumps({"parameters": parameters}, indent=4)[2:-2].encode("utf-8")
+            for line in src:
+                if line.startswith(b'    "parameters": '):
+                    break
+                out.write(line)
+            for line in src:
+                if line.startswith(b'    }'):
+                    out.write(block + line[5:])
+                    break
+        else:
+            header = json.loads(src.readline())
+            header["parameters"] = parameters
+            out.write(json.dumps(header, separators=(',', ':')).encode("utf-8") + b'\n')
+        shutil.copyfileobj(src, out, 1 << 20)
+    return rewrite
+
+def open_live_publisher(args):
+    """--live / --live_file: Canlı timeline yayıncısını açar (yoksa None)."""
+    if not args.live and not args.live_file:
+        return None
+    try:
+        from live import LiveTimelinePublisher
+    except ImportError:
+        from wneura.live import LiveTimelinePublisher
+
+    publisher = LiveTimelinePublisher(name=args.live, path=None if args.live else args.live_file,
+                                      capacity=args.live_capacity, total_steps=args.steps)
+    print(f"📡 Live timeline: {args.live or args.live_file} (last {args.live_capacity} steps)")
+    return publisher
+
+def attach_profile(profiler, args, sink, output_data):
+    """--profile: Bekleyen timeline yazımlarını ölçerek tamamlar ve dökümü sonuca ekler."""
+    if sink is not None and output_data["status"] == "success":
+        with profiler.section("serialization"):
+            if args.format == 'json':
+                output_data["timeline"] = sink.to_dict()
+            else:
+                sink.drain()
+    profiler.stop()
+    output_data["profile"] = profiler.report()
+    print("⏱️ PROFILE:")
+    print(profiler.format_table())
 
 def main():
     args = parse_arguments()
+    if args.serve:
+        try:
+            from server import serve
+        except ImportError:
+            from wneura.server import serve
+        serve(socket_path=args.socket, workers=args.workers)
+        return
+    if args.sweep:
+        run_sweep_mode(args)
+        return
+    if args.phase_map:
+        run_phase_map_mode(args)
+        return
+    if args.ensemble:
+        run_ensemble_mode(args)
+        return
+
     print(f"🚀 WNEURA ENGINE STARTED. Steps: {args.steps}, Scenario: {args.scenario}")
+
+    cache, cache_key = open_result_cache(args)
+    if cache is not None and cache.fetch(cache_key, args.output, args.format, transform=parameter_rewriter(args)):
+        print(f"📦 Cache hit ({cache_key[:12]}). Results copied to: {args.output}")
+        return
     
+    sink = None
+    live = None
+    profiler = Profiler() if args.profile else None
     try:
         
-        cfg = BrainConfig()
-        cfg.erosion_rate = args.erosion
-        cfg.repair_rate = args.repair
-        cfg.stress_threshold = args.stress_threshold
-        cfg.initial_agency = args.initial_agency
+        cfg = build_config(args)
         
        
-        agent = NeuroAgent(action_dim=1, config=cfg)
+        resume = bool(args.checkpoint and args.resume and os.path.exists(args.checkpoint))
+        sink = create_timeline_sink(args, resume=resume)
+        live = open_live_publisher(args)
+        sink.write_header({
+            "status": "running",
+            "parameters": vars(args),
+            "columns": list(timeline_columns(args))
+        })
         
      
-        history = {
-            "step": [],
-            "cortisol": [],
-            "agency": [],
-            "rpe": [],
-            "action": []
-        }
-        
-    
-        for t in range(args.steps):
-            
-            action = agent.act()
-            
-        
-            reward = get_environment_reward(args.scenario)
-            
-           
-            info = agent.learn(action, reward)
-        
-
-            history["step"].append(t)
-            history["cortisol"].append(float(info["cortisol"]))
-            history["agency"].append(float(info["agency"]))
-            history["rpe"].append(float(info["rpe"]))
-            history["action"].append(int(action))
-
-           
-            if args.steps >= 10 and t % (args.steps // 10) == 0:
-                progress = (t / args.steps) * 100
-                print(f"   ... Progress: {int(progress)}%", flush=True)
+        if args.checkpoint:
+            final_stats = run_checkpointed_simulation(args, cfg, sink, profiler=profiler, live=live)
+        else:
+            final_stats = run_simulation(args, cfg, sink, profiler=profiler, live=live)
 
        
         output_data = {
             "status": "success",
             "parameters": vars(args),
-            "final_stats": {
-                "final_agency": history["agency"][-1],
-                "final_cortisol": history["cortisol"][-1]
-            },
-            "timeline": history
+            "final_stats": final_stats
         }
+        if args.max_points:
+            output_data["downsample"] = sink.finish()
+        if args.record != 'all':
+            output_data["recording"] = sink.summary()
         print("✅ Simulation completed successfully.")
 
     except Exception as e:
@@ -121,13 +540,34 @@ def main():
         }
 
  
+    if live is not None:
+        live.close()
+
+    if profiler is not None:
+        attach_profile(profiler, args, sink, output_data)
+
     try:
-        with open(args.output, 'w') as f:
-            json.dump(output_data, f, indent=4)
+        if args.format == 'json' or sink is None:
+            if output_data["status"] == "success" and "timeline" not in output_data:
+                output_data["timeline"] = sink.to_dict()
+            with open(args.output, 'w') as f:
+                json.dump(output_data, f, indent=4)
+        else:
+            output_data.pop("parameters")
+            sink.write_footer(output_data)
+            sink.close()
         print(f"💾 Results saved to: {args.output}")
     except Exception as e:
         print(f"❌ COULD NOT WRITE FILE: {e}")
         sys.exit(1)
 
+    if cache is not None and output_data["status"] == "success":
+        try:
+            cache.store(cache_key, args.output, args.format)
+            stats = cache.stats()
+            print(f"📦 Cached as {cache_key[:12]} (hits: {stats['hits']}, misses: {stats['misses']}, entries: {stats['entries']})")
+        except Exception as e:
+            print(f"⚠️ Could not store result in cache: {e}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,317 @@
+"""
+WNEURA SCENARIO ENGINE v1.0
+Developer: Efeatagul
+
+Description:
+    Ortam senaryolarının bildirimsel (declarative) tanımı. Bir senaryo, süreleri
+    ve ödül/stres dağılımları olan fazlardan oluşur ve parça parça (chunk)
+    NumPy ödül/stres dizilerine derlenir. Simülasyonlar her adımda Python dalları
+    çalıştırmak yerine bu dizileri tüketir; runner senaryoları ve deneyler aynı
+    tanımları paylaşır, yeni protokoller kod değişikliği gerektirmez.
+
+Spec örneği (JSON):
+    {
+        "name": "burnout_cycle",
+        "repeat": true,
+        "phases": [
+            {"name": "hustle",  "duration": 30, "reward": {"randint": [2, 8]}, "stress": {"uniform": [0.1, 0.4]}},
+            {"name": "burnout", "duration": 30, "reward": {"randint": [-5, 0]}, "stress": {"uniform": [0.5, 0.9]}},
+            {"name": "rest",    "duration": 20, "reward": 3}
+        ]
+    }
+
+    Dağılımlar: sabit sayı | {"randint": [low, high]} (high hariç) |
+                {"uniform": [low, high]} | {"choice": [v1, v2, ...]}
+    "duration" verilmeyen (yalnızca son) faz sonsuza kadar sürer.
+    "repeat": true ise faz listesi döngüsel olarak tekrar eder.
+    Ödül ve stres ayrı RNG akışlarından çekilir; sonuçlar parça boyutundan bağımsızdır.
+"""
+
+import json
+import os
+import sys
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from rng import BufferedRNG, spawn_seeds
+except ImportError:
+    from wneura.rng import BufferedRNG, spawn_seeds
+
+
+DISTRIBUTIONS = ("randint", "uniform", "choice")
+
+
+def _validate_distribution(spec: Any, where: str):
+    """[DAHİLİ] Dağılım tanımını doğrular."""
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return
+    if not isinstance(spec, dict) or len(spec) != 1 or next(iter(spec)) not in DISTRIBUTIONS:
+        raise ValueError(f"{where}: Geçersiz dağılım {spec!r} (sayı ya da {DISTRIBUTIONS} anahtarlarından biri).")
+    kind, args = next(iter(spec.items()))
+    if kind in ("randint", "uniform"):
+        if len(args) != 2 or not args[0] < args[1]:
+            raise ValueError(f"{where}: '{kind}' için [low, high] (low < high) bekleniyor: {args}")
+    elif not args:
+        raise ValueError(f"{where}: 'choice' en az bir değer içermeli.")
+
+
+def _sample(spec: Any, rng: BufferedRNG, size: int) -> np.ndarray:
+    """[DAHİLİ] Dağılımdan 'size' adet float64 örnek çeker (adım başına tek uniform)."""
+    if not isinstance(spec, dict):
+        return np.full(size, float(spec))
+    kind, args = next(iter(spec.items()))
+    if kind == "randint":
+        return rng.integers(args[0], args[1], size=size).astype(np.float64)
+    if kind == "uniform":
+        return args[0] + (args[1] - args[0]) * rng.random_block(size)
+    values = np.asarray(args, dtype=np.float64)
+    return values[rng.integers(len(values), size=size)]
+
+
+@dataclass
+class Phase:
+    """Senaryonun tek bir fazı."""
+    name: str
+    duration: Optional[int] = None
+    reward: Any = 0.0
+    stress: Any = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {"name": self.name, "reward": self.reward, "stress": self.stress}
+        if self.duration is not None:
+            out["duration"] = self.duration
+        return out
+
+
+@dataclass
+class Scenario:
+    """Fazlardan oluşan ödül/stres programı."""
+    name: str
+    phases: List[Phase]
+    repeat: bool = False
+    _ends: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if not self.phases:
+            raise ValueError(f"Senaryo '{self.name}' en az bir faz içermeli.")
+        for i, phase in enumerate(self.phases):
+            where = f"{self.name}/{phase.name}"
+            last = i == len(self.phases) - 1
+            if phase.duration is None:
+                if not last or self.repeat:
+                    raise ValueError(f"{where}: Süresiz faz yalnızca tekrar etmeyen senaryonun son fazı olabilir.")
+            elif int(phase.duration) < 1:
+                raise ValueError(f"{where}: Faz süresi pozitif olmalı: {phase.duration}")
+            _validate_distribution(phase.reward, f"{where}.reward")
+            _validate_distribution(phase.stress, f"{where}.stress")
+
+        durations = [p.duration for p in self.phases if p.duration is not None]
+        self._ends = np.cumsum(np.asarray(durations, dtype=np.int64))
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Scenario":
+        phases = [
+            Phase(name=p.get("name", f"phase_{i}"), duration=p.get("duration"),
+                  reward=p.get("reward", 0.0), stress=p.get("stress", 0.0))
+            for i, p in enumerate(spec.get("phases", []))
+        ]
+        return cls(name=spec.get("name", "custom"), phases=phases, repeat=bool(spec.get("repeat", False)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "repeat": self.repeat, "phases": [p.to_dict() for p in self.phases]}
+
+    @property
+    def has_stress(self) -> bool:
+        """Herhangi bir fazda sıfırdan farklı stres girdisi var mı?"""
+        return any(isinstance(p.stress, dict) or p.stress != 0 for p in self.phases)
+
+    def phase_indices(self, start: int, stop: int) -> np.ndarray:
+        """[start, stop) adımlarının faz indeksleri."""
+        t = np.arange(start, stop, dtype=np.int64)
+        if self.repeat:
+            t %= self._ends[-1]
+        return np.minimum(np.searchsorted(self._ends, t, side="right"), len(self.phases) - 1)
+
+    def compile(self, start: int, stop: int, reward_rng: BufferedRNG, stress_rng: BufferedRNG,
+                width: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        [start, stop) adımlarını dizilere derler.
+
+        Args:
+            reward_rng / stress_rng: Ödül ve stres akışları (sırayla tüketilir).
+            width: Verilirse her adım için 'width' bağımsız örnek çekilir (popülasyonlar için).
+
+        Returns:
+            {"reward": (n,) ya da (n, width), "stress": aynı şekil, "phase": (n,) int}
+        """
+        phases = self.phase_indices(start, stop)
+        n = len(phases)
+        per_step = width or 1
+        reward = np.empty(n * per_step)
+        stress = np.empty(n * per_step)
+
+        bounds = np.flatnonzero(np.diff(phases)) + 1
+        for a, b in zip(np.r_[0, bounds], np.r_[bounds, n]):
+            phase = self.phases[phases[a]]
+            size = (b - a) * per_step
+            reward[a * per_step:b * per_step] = _sample(phase.reward, reward_rng, size)
+            stress[a * per_step:b * per_step] = _sample(phase.stress, stress_rng, size)
+
+        shape = (n, width) if width else (n,)
+        return {"reward": reward.reshape(shape), "stress": stress.reshape(shape), "phase": phases}
+
+
+def _builtin(name: str, *phases: Phase, repeat: bool = False) -> Scenario:
+    return Scenario(name=name, phases=list(phases), repeat=repeat)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "mixed": _builtin("mixed", Phase("mixed", reward={"randint": [-5, 5]})),
+    "chaos": _builtin("chaos", Phase("chaos", reward={"randint": [-5, 0]})),
+    "therapy": _builtin("therapy", Phase("therapy", reward=5)),
+    "stable": _builtin("stable", Phase("stable", reward=0)),
+    "grand_experiment": _builtin(
+        "grand_experiment",
+        Phase("hustle", 30, reward={"randint": [2, 8]}, stress={"uniform": [0.1, 0.4]}),
+        Phase("burnout", 30, reward={"randint": [-5, 0]}, stress={"uniform": [0.5, 0.9]}),
+        Phase("recovery", reward=3)
+    ),
+    "trauma_therapy": _builtin(
+        "trauma_therapy",
+        Phase("trauma", 40, reward={"randint": [-5, 0]}),
+        Phase("therapy", reward=5)
+    )
+}
+
+
+def load_scenario(source: Any) -> Scenario:
+    """
+    Senaryoyu çözer: Scenario nesnesi, hazır senaryo adı, spec sözlüğü ya da JSON dosya yolu.
+    """
+    if isinstance(source, Scenario):
+        return source
+    if isinstance(source, dict):
+        return Scenario.from_dict(source)
+    if source in SCENARIOS:
+        return SCENARIOS[source]
+    if isinstance(source, str) and os.path.exists(source):
+        with open(source, 'r') as f:
+            return Scenario.from_dict(json.load(f))
+    raise ValueError(f"Bilinmeyen senaryo: {source!r} (hazır senaryolar: {', '.join(SCENARIOS)})")
+
+
+class ScenarioStream:
+    def __init__(self, scenario: Any, seed: Any = None, chunk_size: int = 4096,
+                 width: Optional[int] = None):
+        """
+        Senaryoyu parça parça derleyip adım adım tüketen ortam akışı.
+
+        Args:
+            scenario: load_scenario() ile çözülebilen herhangi bir senaryo tanımı.
+            seed: Kök tohum (int, SeedSequence ya da None); ödül ve stres akışları buradan türetilir.
+            chunk_size: Tek seferde derlenecek adım sayısı.
+            width: Popülasyonlar için adım başına örnek sayısı (None = skaler).
+        """
+        self.scenario = load_scenario(scenario)
+        self.chunk_size = int(chunk_size)
+        self.width = width
+        reward_seed, stress_seed = spawn_seeds(seed, 2)
+        self.reward_rng = BufferedRNG(reward_seed)
+        self.stress_rng = BufferedRNG(stress_seed)
+
+        self.position = 0
+        self.phase = 0
+        self._compiled = 0
+        self._set_pending(np.empty(0), np.empty(0), np.empty(0, dtype=np.int64))
+
+    def _set_pending(self, reward: np.ndarray, stress: np.ndarray, phase: np.ndarray):
+        if self.width is None:
+            self._reward, self._stress = reward.tolist(), stress.tolist()
+        else:
+            self._reward, self._stress = reward, stress
+        self._phase = phase.tolist()
+        self._offset = 0
+
+    def next_chunk(self, size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Sonraki 'size' adımı derler (bekleyen adımlar atlanmaz, önce tüketilmelidir)."""
+        size = size or self.chunk_size
+        chunk = self.scenario.compile(self._compiled, self._compiled + size,
+                                      self.reward_rng, self.stress_rng, self.width)
+        self._compiled += size
+        return chunk
+
+    def step(self) -> Tuple[Any, Any]:
+        """Bir adımlık (ödül, stres) çiftini derlenmiş parçadan döndürür."""
+        if self._offset >= len(self._phase):
+            chunk = self.next_chunk()
+            self._set_pending(chunk["reward"], chunk["stress"], chunk["phase"])
+        i = self._offset
+        self._offset = i + 1
+        self.position += 1
+        self.phase = self._phase[i]
+        return self._reward[i], self._stress[i]
+
+    def reward(self):
+        return self.step()[0]
+
+    @property
+    def phase_name(self) -> str:
+        return self.scenario.phases[self.phase].name
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için akış durumları ve henüz tüketilmemiş derlenmiş adımlar."""
+        i = self._offset
+        return {
+            "scenario": json.dumps(self.scenario.to_dict()),
+            "position": self.position,
+            "phase": self.phase,
+            "compiled": self._compiled,
+            "reward_rng": self.reward_rng.state_dict(),
+            "stress_rng": self.stress_rng.state_dict(),
+            "pending_reward": np.asarray(self._reward[i:], dtype=np.float64),
+            "pending_stress": np.asarray(self._stress[i:], dtype=np.float64),
+            "pending_phase": np.asarray(self._phase[i:], dtype=np.int64)
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        saved = json.loads(str(state["scenario"]))
+        if saved != json.loads(json.dumps(self.scenario.to_dict())):
+            raise ValueError(f"Senaryo uyuşmuyor: {saved.get('name')} != {self.scenario.name}")
+        self.position = int(state["position"])
+        self.phase = int(state["phase"])
+        self._compiled = int(state["compiled"])
+        self.reward_rng.load_state_dict(state["reward_rng"])
+        self.stress_rng.load_state_dict(state["stress_rng"])
+        self._set_pending(np.asarray(state["pending_reward"]), np.asarray(state["pending_stress"]),
+                          np.asarray(state["pending_phase"]))
+
+
+if __name__ == "__main__":
+    import time
+
+    print("🎬 Scenario Engine: per-step Python branch vs compiled chunks")
+    steps = 500000
+
+    legacy = np.random.default_rng(0)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        legacy.integers(-5, 5)
+    t_legacy = time.perf_counter() - t0
+
+    stream = ScenarioStream("mixed", seed=0)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        stream.step()
+    t_stream = time.perf_counter() - t0
+
+    print(f"   Per-step draw    : {t_legacy / steps * 1e9:.0f} ns/step")
+    print(f"   ScenarioStream   : {t_stream / steps * 1e9:.0f} ns/step  (x{t_legacy / t_stream:.1f})")
+    for name, scenario in SCENARIOS.items():
+        phases = " -> ".join(f"{p.name}({p.duration or '∞'})" for p in scenario.phases)
+        print(f"   • {name:<17} {phases}")
@@ -0,0 +1,307 @@
+"""
+WNEURA RUNNER DAEMON v1.0
+Developer: Efeatagul
+
+Description:
+    WSharp köprüsü için kalıcı (warm) runner modu. Her istek için yeni bir
+    'python runner.py' süreci başlatmak yerine, NumPy ve motor modülleri bir kez
+    yüklenmiş işçi süreçlerinden oluşan bir havuz sürekli açık tutulur.
+
+Protokol (satır başına bir JSON kaydı, UTF-8):
+    İstek:
+        {"id": "req-1", "steps": 1000, "scenario": "mixed",
+         "config": {"erosion_rate": 0.05, "repair_rate": 0.01},
+         "seed": 42, "progress": true, "timeline": true}
+        "scenario" hazır bir ad ya da scenario.py formatında bir spec sözlüğü olabilir.
+        {"type": "ping"}  |  {"type": "shutdown"}
+    Yanıt:
+        {"id": "req-1", "type": "progress", "percent": 40}
+        {"id": "req-1", "type": "result", "status": "success", "final_stats": {...}, "timeline": {...}}
+        {"id": "req-1", "type": "result", "status": "error", "error_message": "..."}
+
+    Taşıma: stdin/stdout (varsayılan) ya da yerel Unix socket (--socket PATH).
+    stdout protokol kanalıdır; tüm loglar stderr'e yazılır.
+
+    Bir isteğin ilerleme ve sonuç kayıtları işçide JSON satırına çevrilir ve aynı kuyruktan
+    tek bir thread ile istemciye yazılır; sonuç her zaman o isteğin son ilerlemesinden sonra gelir.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, Any, Callable, Optional
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from config import BrainConfig
+    from agent import NeuroAgent
+    from timeline import MemoryTimelineSink
+    from recording import StridePolicy
+except ImportError:
+    from wneura.config import BrainConfig
+    from wneura.agent import NeuroAgent
+    from wneura.timeline import MemoryTimelineSink
+    from wneura.recording import StridePolicy
+
+
+AGENT_CACHE_SIZE = 32
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    """Protokol kaydını tek satırlık JSON metnine çevirir."""
+    return json.dumps(record, separators=(',', ':')) + "\n"
+
+
+def _init_worker(progress_queue):
+    """[İŞÇİ] stdout'u korur, ilerleme kuyruğunu ve ajan önbelleğini hazırlar."""
+    sys.stdout = sys.stderr
+    try:
+        from runner import run_simulation, create_environment, create_streams
+    except ImportError:
+        from wneura.runner import run_simulation, create_environment, create_streams
+    _WORKER.update(progress=progress_queue, agents={}, run_simulation=run_simulation,
+                   create_environment=create_environment, create_streams=create_streams)
+
+
+def _warmup() -> int:
+    """[İŞÇİ] Havuzun önceden ısınması için boş görev."""
+    return os.getpid()
+
+
+def _get_agent(config: Dict[str, Any]) -> NeuroAgent:
+    """[İŞÇİ] Aynı config için ajanı yeniden kullanır (sıfırlayarak), yoksa oluşturur."""
+    agents = _WORKER["agents"]
+    key = json.dumps(config, sort_keys=True)
+
+    agent = agents.pop(key, None)
+    if agent is None:
+        fields = {k: v for k, v in config.items() if k in BrainConfig.__annotations__}
+        # Yanıt yalnızca final_stats ve timeline taşır; ajan/beyin geçmişi okunmaz. Politikalar
+        # yalnızca ilk adımı saklar ve adım başına geçmiş yazımını (~%30) atlar.
+        agent = NeuroAgent(action_dim=1, config=BrainConfig(**fields), use_kernel=True,
+                           history_policy=StridePolicy(sys.maxsize),
+                           brain_history_policy=StridePolicy(sys.maxsize))
+        if len(agents) >= AGENT_CACHE_SIZE:
+            agents.pop(next(iter(agents)))
+    else:
+        agent.reset()
+
+    agents[key] = agent
+    return agent
+
+
+def handle_request(token: int, request: Dict[str, Any]) -> Dict[str, Any]:
+    """[İŞÇİ] Tek bir simülasyon isteğini koşturur ve sonuç kaydını döndürür."""
+    rid = request.get("id")
+    try:
+        steps = int(request.get("steps", 100))
+        options = SimpleNamespace(
+            steps=steps,
+            scenario=request.get("scenario", "mixed"),
+            # Senaryo ve timeline parçası istekten büyük derlenmez (kısa isteklerde kurulum maliyeti).
+            chunk_size=int(request.get("chunk_size", min(4096, max(1, steps))))
+        )
+        agent_rng, env_seed = _WORKER["create_streams"](request.get("seed"))
+        agent = _get_agent(request.get("config", {}))
+        agent.rng = agent_rng
+        environment = _WORKER["create_environment"](options, env_seed)
+        sink = MemoryTimelineSink()
+
+        on_progress = None
+        if request.get("progress"):
+            progress_queue = _WORKER["progress"]
+            on_progress = lambda percent: progress_queue.put(
+                (token, _encode({"id": rid, "type": "progress", "percent": percent}), False)
+            )
+
+        final_stats = _WORKER["run_simulation"](options, agent.brain.cfg, sink,
+                                                agent=agent, environment=environment,
+                                                on_progress=on_progress)
+        response = {"id": rid, "type": "result", "status": "success", "final_stats": final_stats}
+        if request.get("timeline", True):
+            response["timeline"] = sink.to_dict()
+
+    except Exception as e:
+        response = {"id": rid, "type": "result", "status": "error", "error_message": str(e)}
+
+    return response
+
+
+def _run_request(token: int, request: Dict[str, Any]):
+    """
+    [İŞÇİ] handle_request sonucunu ilerleme kayıtlarıyla aynı kuyruğa son kayıt olarak yazar.
+    Tek bir kuyruk, isteğin kayıtlarının sırasını korur; havuz yalnızca hataları taşır.
+    """
+    _WORKER["progress"].put((token, _encode(handle_request(token, request)), True))
+
+
+class RunnerDaemon:
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Isınmış işçi havuzunu başlatır.
+
+        Args:
+            workers: İşçi süreç sayısı (varsayılan: tüm çekirdekler).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._progress = multiprocessing.Queue()
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._progress,)
+        )
+        self._tokens = itertools.count()
+        self._routes: Dict[int, Callable[[Any], None]] = {}
+        self._routes_lock = threading.Lock()
+
+        self._progress_thread = threading.Thread(target=self._pump_progress, daemon=True)
+        self._progress_thread.start()
+
+        pids = {f.result() for f in [self.pool.submit(_warmup) for _ in range(self.workers * 2)]}
+        _log(f"🔥 WNEURA DAEMON READY. Warm workers: {len(pids)}")
+
+    def _pump_progress(self):
+        """İşçilerden gelen ilerleme ve sonuç satırlarını ilgili istemciye sırayla iletir."""
+        while True:
+            item = self._progress.get()
+            if item is None:
+                break
+            token, line, final = item
+            with self._routes_lock:
+                send = self._routes.pop(token, None) if final else self._routes.get(token)
+            if send is not None:
+                send(line)
+
+    def submit(self, request: Dict[str, Any], send: Callable[[Any], None]):
+        """İsteği havuza verir; ilerleme ve sonuç 'send' ile (ilerleme thread'inden) gönderilir."""
+        token = next(self._tokens)
+        with self._routes_lock:
+            self._routes[token] = send
+
+        def _done(future):
+            # İşçi sonucu kuyruğa yazamadan çöktüyse (ör. BrokenProcessPool) hata aynı yoldan gider.
+            error = future.exception()
+            if error is not None:
+                record = {"id": request.get("id"), "type": "result", "status": "error", "error_message": str(error)}
+                self._progress.put((token, _encode(record), True))
+
+        self.pool.submit(_run_request, token, request).add_done_callback(_done)
+
+    def handle_line(self, line: str, send: Callable[[Any], None]) -> bool:
+        """Bir protokol satırını işler. 'shutdown' gelirse False döndürür."""
+        line = line.strip()
+        if not line:
+            return True
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            send({"type": "result", "status": "error", "error_message": f"Invalid JSON: {e}"})
+            return True
+
+        kind = request.get("type", "run")
+        if kind == "shutdown":
+            return False
+        if kind == "ping":
+            send({"id": request.get("id"), "type": "pong", "workers": self.workers})
+        else:
+            self.submit(request, send)
+        return True
+
+    def serve_stdio(self, stdin=None, stdout=None):
+        """stdin'den istek okur, yanıtları stdout'a yazar (EOF ya da 'shutdown' ile biter)."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        send = _line_sender(stdout.write, stdout.flush)
+
+        for line in stdin:
+            if not self.handle_line(line, send):
+                break
+
+    def serve_unix(self, path: str):
+        """Yerel Unix socket üzerinden bağlantı kabul eder; her bağlantı ayrı thread'de okunur."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Bu platform Unix socket desteklemiyor; stdin modunu kullanın.")
+        if os.path.exists(path):
+            os.remove(path)
+
+        stop = threading.Event()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen()
+        server.settimeout(0.5)
+        _log(f"🔌 Listening on {path}")
+
+        def _client(conn):
+            with conn, conn.makefile("r", encoding="utf-8") as reader:
+                send = _line_sender(lambda text: conn.sendall(text.encode("utf-8")), None)
+                for line in reader:
+                    if not self.handle_line(line, send):
+                        stop.set()
+                        break
+
+        try:
+            while not stop.is_set():
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(target=_client, args=(conn,), daemon=True).start()
+        finally:
+            server.close()
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        """Bekleyen istekleri tamamlar ve havuzu kapatır."""
+        self.pool.shutdown(wait=True)
+        self._progress.put(None)
+        self._progress_thread.join()
+
+
+def _line_sender(write: Callable[[str], Any], flush: Optional[Callable[[], Any]]):
+    """
+    Thread-safe satır yazıcı üretir (yanıtlar farklı thread'lerden gelir).
+    Kayıt sözlüğü ya da işçide önceden kodlanmış JSON satırı (str) alır.
+    """
+    lock = threading.Lock()
+
+    def send(record: Any):
+        text = record if isinstance(record, str) else _encode(record)
+        with lock:
+            try:
+                write(text)
+                if flush:
+                    flush()
+            except (OSError, ValueError):
+                pass
+
+    return send
+
+
+def serve(socket_path: Optional[str] = None, workers: Optional[int] = None):
+    """runner.py --serve giriş noktası."""
+    daemon = RunnerDaemon(workers=workers)
+    try:
+        if socket_path:
+            daemon.serve_unix(socket_path)
+        else:
+            daemon.serve_stdio()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        _log("🛑 WNEURA DAEMON STOPPED.")
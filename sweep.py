@@ -0,0 +1,203 @@
+"""
+WNEURA PARAMETER SWEEP ENGINE v1.0
+Developer: Efeatagul
+
+Description:
+    BrainConfig alanları (erosion_rate, repair_rate, stress_threshold,
+    initial_agency, ...) üzerinde grid ya da Latin-Hypercube taraması yapar.
+    Noktalar parçalara (chunk) bölünür ve bir işlem havuzuna dağıtılır; her parça
+    tek bir NeuroAgentPopulation ile vektörel olarak koşturulur. İşçiler sonuçları
+    paylaşımlı bellekteki (shared memory) sonuç tablosuna yazar.
+
+Spec örneği (JSON):
+    {
+        "method": "grid",
+        "params": {
+            "erosion_rate": {"min": 0.01, "max": 0.2, "num": 20},
+            "repair_rate": [0.005, 0.01, 0.02]
+        },
+        "steps": 500,
+        "scenario": "mixed",
+        "seed": 42
+    }
+    "method": "lhs" için her parametre {"min", "max"} alır ve "samples" nokta sayısını verir.
+    "scenario" hazır bir senaryo adı ya da scenario.py formatında bir spec sözlüğüdür.
+"""
+
+import contextlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Tuple, Optional
+
+import numpy as np
+
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from config import BrainConfig
+    from agent import NeuroAgentPopulation
+    from scenario import Scenario, ScenarioStream, load_scenario
+except ImportError:
+    from wneura.config import BrainConfig
+    from wneura.agent import NeuroAgentPopulation
+    from wneura.scenario import Scenario, ScenarioStream, load_scenario
+
+
+RESULT_COLUMNS = ["final_agency", "final_cortisol", "min_agency"]
+
+_WORKER: Dict[str, Any] = {}
+
+
+def build_points(spec: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
+    """Spec'ten parametre adlarını ve (P, D) nokta matrisini üretir."""
+    params = spec.get("params", {})
+    if not params:
+        raise ValueError("Sweep spec içinde 'params' boş olamaz.")
+
+    names = list(params)
+    unknown = [n for n in names if n not in BrainConfig.__annotations__]
+    if unknown:
+        raise ValueError(f"Bilinmeyen BrainConfig alanları: {unknown}")
+
+    method = spec.get("method", "grid")
+
+    if method == "grid":
+        axes = []
+        for name in names:
+            value = params[name]
+            if isinstance(value, dict):
+                axes.append(np.linspace(value["min"], value["max"], int(value.get("num", 10))))
+            else:
+                axes.append(np.asarray(value, dtype=float))
+        mesh = np.meshgrid(*axes, indexing="ij")
+        points = np.stack([m.ravel() for m in mesh], axis=1)
+
+    elif method == "lhs":
+        samples = int(spec.get("samples", 100))
+        rng = np.random.default_rng(spec.get("seed"))
+        points = np.empty((samples, len(names)))
+        for d, name in enumerate(names):
+            bounds = params[name]
+            strata = (rng.permutation(samples) + rng.random(samples)) / samples
+            points[:, d] = bounds["min"] + strata * (bounds["max"] - bounds["min"])
+
+    else:
+        raise ValueError(f"Bilinmeyen sweep yöntemi: {method}")
+
+    return names, points
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, int], names: List[str],
+                 points: np.ndarray, base_config: BrainConfig, steps: int, scenario: Scenario):
+    """[İŞÇİ] Havuz başlatıcısı: paylaşımlı tabloya bağlanır, sabit girdileri bir kez alır."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER.update(
+        shm=shm,
+        table=np.ndarray(shape, dtype=np.float64, buffer=shm.buf),
+        names=names,
+        points=points,
+        base_config=base_config,
+        steps=steps,
+        scenario=scenario
+    )
+
+
+def _run_chunk(start: int, stop: int, seed: np.random.SeedSequence) -> int:
+    """[İŞÇİ] [start, stop) noktalarını tek bir popülasyonla koşturur, sonucu tabloya yazar."""
+    names = _WORKER["names"]
+    base = _WORKER["base_config"]
+    configs = [
+        replace(base, **{name: float(value) for name, value in zip(names, row)})
+        for row in _WORKER["points"][start:stop]
+    ]
+
+    agent_seed, env_seed = seed.spawn(2)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        population = NeuroAgentPopulation(len(configs), action_dim=1, config=configs, rng=agent_seed)
+    environment = ScenarioStream(_WORKER["scenario"], seed=env_seed, chunk_size=256, width=population.size)
+    apply_stress = environment.scenario.has_stress
+
+    min_agency = population.brain.agency.copy()
+    for _ in range(_WORKER["steps"]):
+        actions = population.act()
+        rewards, stress = environment.step()
+        info = population.learn(actions, rewards)
+        if apply_stress:
+            population.brain.update_amygdala(stress)
+        np.minimum(min_agency, info["agency"], out=min_agency)
+
+    table = _WORKER["table"]
+    table[start:stop, 0] = population.brain.agency
+    table[start:stop, 1] = population.brain.cortisol
+    table[start:stop, 2] = min_agency
+    return stop - start
+
+
+def run_sweep(spec: Dict[str, Any], base_config: Optional[BrainConfig] = None,
+              steps: int = 100, scenario: Any = "mixed",
+              workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Taramayı işlem havuzunda koşturur ve kolon tabanlı özet sözlüğü döndürür.
+
+    Args:
+        spec: Sweep tanımı (bkz. modül açıklaması). 'steps'/'scenario' varsa argümanları ezer.
+        base_config: Taranmayan alanlar için temel ayarlar.
+        workers: İşçi sayısı (varsayılan: tüm çekirdekler).
+    """
+    base_config = base_config or BrainConfig()
+    steps = int(spec.get("steps", steps))
+    scenario = load_scenario(spec.get("scenario", scenario))
+    chunk_size = int(spec.get("chunk_size", 256))
+    workers = workers or os.cpu_count() or 1
+
+    names, points = build_points(spec)
+    n_points = len(points)
+    chunks = [(s, min(s + chunk_size, n_points)) for s in range(0, n_points, chunk_size)]
+    seeds = np.random.SeedSequence(spec.get("seed")).spawn(len(chunks))
+
+    print(f"🧮 SWEEP: {n_points} points x {steps} steps, {len(chunks)} chunks on {workers} workers")
+    started = time.perf_counter()
+
+    shape = (n_points, len(RESULT_COLUMNS))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n_points * len(RESULT_COLUMNS) * 8))
+    table = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    try:
+        table[:] = np.nan
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, shape, names, points, base_config, steps, scenario)
+        ) as pool:
+            futures = [
+                pool.submit(_run_chunk, start, stop, seed)
+                for (start, stop), seed in zip(chunks, seeds)
+            ]
+            done = 0
+            for future in as_completed(futures):
+                done += future.result()
+                print(f"   ... Sweep progress: {int(done / n_points * 100)}%", flush=True)
+
+        results = table.copy()
+    finally:
+        del table
+        shm.close()
+        shm.unlink()
+
+    columns = {name: points[:, d].tolist() for d, name in enumerate(names)}
+    columns.update({name: results[:, c].tolist() for c, name in enumerate(RESULT_COLUMNS)})
+
+    return {
+        "method": spec.get("method", "grid"),
+        "steps": steps,
+        "scenario": scenario.name,
+        "points": n_points,
+        "params": names,
+        "elapsed_sec": round(time.perf_counter() - started, 3),
+        "table": columns
+    }
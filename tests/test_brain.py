@@ -0,0 +1,47 @@
+import numpy as np
+
+from brain import BiologicalBrain, BiologicalBrainPopulation
+from config import BrainConfig
+
+
+def make_configs(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [BrainConfig(cortisol_decay=float(rng.uniform(0.8, 0.99)), amygdala_gain=float(rng.uniform(0.1, 0.9)),
+                        stress_threshold=float(rng.uniform(0.3, 0.9)), erosion_rate=float(rng.uniform(0.0, 0.1)),
+                        repair_rate=float(rng.uniform(0.0, 0.05)), mastery_threshold=float(rng.uniform(0.0, 0.3)),
+                        initial_agency=float(rng.uniform(0.0, 1.0)))
+            for _ in range(size)]
+
+
+def test_population_matches_scalar_brains():
+    configs = make_configs(12)
+    population = BiologicalBrainPopulation(configs)
+    brains = [BiologicalBrain(config) for config in configs]
+
+    rng = np.random.default_rng(1)
+    for t in range(600):
+        rpe = rng.uniform(-5, 5, len(brains)) * (t % 200 < 120)
+        population.step(np.abs(rpe), rpe)
+        for brain, value in zip(brains, rpe.tolist()):
+            brain.step(abs(value), value)
+        if t % 5 == 0:
+            stress = rng.uniform(0, 2, len(brains))
+            population.update_amygdala(stress)
+            for brain, value in zip(brains, stress.tolist()):
+                brain.update_amygdala(value)
+
+        np.testing.assert_array_equal(population.cortisol, [b.cortisol for b in brains])
+        np.testing.assert_array_equal(population.agency, [b.agency for b in brains])
+        np.testing.assert_array_equal(population.resistance, [b.state_dict()["resistance"] for b in brains])
+        np.testing.assert_array_equal(population.delta_agency, [b.history.last("delta_agency") for b in brains])
+
+
+def test_population_broadcasts_shared_config_and_scalar_inputs():
+    config = make_configs(1, seed=3)[0]
+    population = BiologicalBrainPopulation(config, size=4)
+    brain = BiologicalBrain(config)
+    for rpe in np.linspace(-3, 3, 200).tolist():
+        population.step(abs(rpe), rpe)
+        brain.step(abs(rpe), rpe)
+    np.testing.assert_array_equal(population.cortisol, [brain.cortisol] * 4)
+    np.testing.assert_array_equal(population.agency, [brain.agency] * 4)
@@ -0,0 +1,28 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_runner(output, cache_dir, fmt):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "runner.py"), "--steps", "2000", "--seed", "3",
+                             "--format", fmt, "--output", str(output), "--cache_dir", str(cache_dir)],
+                            check=True, cwd=ROOT, capture_output=True, text=True)
+    return "Cache hit" in result.stdout
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "binary"])
+def test_cache_hit_carries_current_parameters(tmp_path, fmt):
+    cache_dir = tmp_path / "cache"
+    assert not run_runner(tmp_path / "first.out", cache_dir, fmt)
+    assert run_runner(tmp_path / "hit.out", cache_dir, fmt)
+
+    # Aynı argümanlarla önbelleksiz üretilen dosya, isabetle kopyalanan dosyayla bayt bayt aynı olmalı.
+    shutil.rmtree(cache_dir)
+    shutil.move(tmp_path / "hit.out", tmp_path / "hit.copy")
+    assert not run_runner(tmp_path / "hit.out", cache_dir, fmt)
+    assert (tmp_path / "hit.copy").read_bytes() == (tmp_path / "hit.out").read_bytes()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from agent import NeuroAgent
+from config import BrainConfig
+from rng import BufferedRNG
+
+
+def make_agent(action_dim, seed=7, cortisol=None, **config):
+    agent = NeuroAgent(action_dim, BrainConfig(**config), history_limit=5000, rng=BufferedRNG(seed, block_size=64))
+    if cortisol is not None:
+        state = agent.brain.state_dict()
+        state["cortisol"] = cortisol
+        agent.brain.load_state_dict(state)
+    return agent
+
+
+def stepped(agent, k, reward, rate):
+    for _ in range(k):
+        agent.learn(agent.act(rate), reward)
+
+
+def assert_same(fast, slow):
+    np.testing.assert_array_equal(fast.q_table, slow.q_table)
+    state_fast, state_slow = fast.brain.state_dict(), slow.brain.state_dict()
+    for name in ("cortisol", "agency", "resistance", "amygdala"):
+        assert state_fast[name] == state_slow[name], name
+    brain_fast, brain_slow = fast.brain.history.export(), slow.brain.history.export()
+    for name in ("cortisol", "agency", "delta_agency", "resistance"):
+        np.testing.assert_array_equal(brain_fast[name], brain_slow[name], err_msg=name)
+    agent_fast, agent_slow = fast.history.export(), slow.history.export()
+    for name in agent_fast:
+        np.testing.assert_array_equal(agent_fast[name], agent_slow[name], err_msg=name)
+    assert fast.history.total_appended == slow.history.total_appended
+    assert [fast.rng.random() for _ in range(5)] == [slow.rng.random() for _ in range(5)]
+
+
+SCENARIOS = {
+    # rpe == 0'dan başlayan durağan aralık.
+    "stable": (0.0, {}),
+    # Q, ödülün bir ulp altında takılır; güncelleme yuvarlamayla sıfırlanır.
+    "therapy": (5.0, {"erosion_rate": 0.0}),
+    # agency == 0: öğrenme etkinliği ve keşif sıfır; kortizol eşiğin altına inince (~490 adım) onarılır.
+    "helpless": (0.0005, {"initial_agency": 0.0, "cortisol_decay": 0.999, "mastery_threshold": 0.0,
+                          "cortisol": 1.0}),
+}
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+@pytest.mark.parametrize("rate", [0.0, 0.3])
+@pytest.mark.parametrize("action_dim", [1, 3])
+def test_fast_forward_matches_stepping(scenario, rate, action_dim):
+    reward, config = SCENARIOS[scenario]
+    fast, slow = make_agent(action_dim, **config), make_agent(action_dim, **config)
+
+    fast.fast_forward(3000, reward, exploration_rate=rate)
+    stepped(slow, 3000, reward, rate)
+    assert_same(fast, slow)
+
+
+@pytest.mark.parametrize("scenario, action_dim", [("stable", 3), ("therapy", 1)])
+def test_fast_forward_skips_settled_stretches(scenario, action_dim):
+    reward, config = SCENARIOS[scenario]
+    fast, slow = make_agent(action_dim, **config), make_agent(action_dim, **config)
+    stepped(fast, 1000, reward, 0.1)
+    stepped(slow, 1000, reward, 0.1)
+
+    learn = fast.learn
+    fast.learn = lambda *args: pytest.fail("donmuş aralık adım adım koşturuldu")
+    fast.fast_forward(20000, reward)
+    fast.learn = learn
+    stepped(slow, 20000, reward, 0.1)
+    assert_same(fast, slow)
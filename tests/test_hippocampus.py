@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from checkpoint import load_checkpoint, save_checkpoint
+from hippocampus import Hippocampus, MemoryTrace
+
+
+class LegacyHippocampus:
+    """Listeli eski Hippocampus (karşılaştırma referansı)."""
+
+    def __init__(self, capacity=50, decay_rate=0.05):
+        self.capacity = capacity
+        self.decay_rate = decay_rate
+        self.memories = []
+
+    def encode_experience(self, step, state, action, reward, surprise, cortisol):
+        emotional_weight = abs(surprise) + (cortisol * 1.5)
+        if emotional_weight < 0.1:
+            return
+        self.memories.append(MemoryTrace(step_id=step, state=state, action=action, reward=reward,
+                                         surprise=surprise, cortisol=cortisol, importance=emotional_weight))
+        self._manage_capacity()
+
+    def decay_memories(self):
+        for mem in self.memories:
+            mem.importance *= (1.0 - self.decay_rate)
+        self.memories = [m for m in self.memories if m.importance > 0.05]
+
+    def _manage_capacity(self):
+        if len(self.memories) > self.capacity:
+            self.memories.sort(key=lambda m: m.importance)
+            excess = len(self.memories) - self.capacity
+            self.memories = self.memories[excess:]
+
+    def get_replay_batch(self, batch_size=5):
+        sorted_mem = sorted(self.memories, key=lambda m: m.importance, reverse=True)
+        return sorted_mem[:batch_size]
+
+
+def snapshot(traces):
+    return [(m.step_id, m.importance) for m in traces]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_legacy_hippocampus_bit_for_bit(seed):
+    rng = random.Random(seed)
+    capacity = rng.choice([1, 3, 8, 25, 60])
+    decay_rate = rng.choice([0.0, 0.01, 0.05, 0.1, 0.5])
+    surprises = [0.0, 0.05, 0.3, 0.5, 1.0, 1.9, 2.0]
+    cortisols = [0.0, 0.1, 0.2, 0.3, 0.4]
+
+    legacy = LegacyHippocampus(capacity=capacity, decay_rate=decay_rate)
+    indexed = Hippocampus(capacity=capacity, decay_rate=decay_rate)
+    for step in range(600):
+        op = rng.random()
+        if op < 0.55:
+            args = (step, None, 0, 1.0, rng.choice(surprises), rng.choice(cortisols))
+            for _ in range(rng.choice([1, 1, 2, 4])):
+                legacy.encode_experience(*args)
+                indexed.encode_experience(*args)
+        elif op < 0.85:
+            legacy.decay_memories()
+            indexed.decay_memories()
+        elif op < 0.95:
+            k = rng.randint(1, capacity + 2)
+            assert snapshot(indexed.get_replay_batch(k)) == snapshot(legacy.get_replay_batch(k))
+        else:
+            restored = Hippocampus(capacity=capacity, decay_rate=decay_rate)
+            restored.load_state_dict(indexed.state_dict())
+            indexed = restored
+        if rng.random() < 0.2:
+            assert snapshot(indexed.memories) == snapshot(legacy.memories)
+    assert snapshot(indexed.memories) == snapshot(legacy.memories)
+
+
+def test_tied_replay_keeps_insertion_order():
+    legacy = LegacyHippocampus(capacity=10, decay_rate=0.05)
+    indexed = Hippocampus(capacity=10, decay_rate=0.05)
+    for hippo in (legacy, indexed):
+        hippo.encode_experience(0, None, 0, 0.0, 2.0, 0.0)
+        hippo.decay_memories()
+        hippo.encode_experience(1, None, 0, 0.0, 1.9, 0.0)
+    assert snapshot(indexed.get_replay_batch(2)) == snapshot(legacy.get_replay_batch(2))
+    assert [m.importance for m in indexed.get_replay_batch(2)] == [1.9, 1.9]
+
+
+def test_checkpoint_round_trip_keeps_exact_importances(tmp_path):
+    legacy = LegacyHippocampus(capacity=4, decay_rate=0.1)
+    indexed = Hippocampus(capacity=4, decay_rate=0.1)
+    inputs = [(2.0, 0.0), (1.9, 0.0), (0.3, 0.4), (1.0, 0.2), (2.0, 0.0), (0.5, 0.1)]
+    for step, (surprise, cortisol) in enumerate(inputs):
+        for hippo in (legacy, indexed):
+            hippo.encode_experience(step, [float(step), 1.0], 0, 0.0, surprise, cortisol)
+            hippo.decay_memories()
+
+    path = str(tmp_path / "hippo.npz")
+    save_checkpoint(path, hippocampus=indexed)
+    restored = Hippocampus(capacity=4, decay_rate=0.1)
+    load_checkpoint(path, hippocampus=restored)
+    for _ in range(5):
+        legacy.decay_memories()
+        restored.decay_memories()
+        assert snapshot(restored.memories) == snapshot(legacy.memories)
+        assert snapshot(restored.get_replay_batch(3)) == snapshot(legacy.get_replay_batch(3))
@@ -0,0 +1,52 @@
+import itertools
+
+import numpy as np
+
+from brain import BiologicalBrain
+from config import BrainConfig
+from kernel import compile_step_kernel
+
+COLUMNS = ("cortisol", "agency", "delta_agency", "resistance")
+
+
+def test_kernel_brain_matches_python_step():
+    config = BrainConfig(stress_threshold=0.5, erosion_rate=0.08, repair_rate=0.03)
+    fused, plain = BiologicalBrain(config, use_kernel=True), BiologicalBrain(config)
+
+    rng = np.random.default_rng(2)
+    for t, rpe in enumerate(rng.uniform(-4, 4, 3000).tolist()):
+        rpe *= t % 300 < 200
+        fused.step(abs(rpe), rpe)
+        plain.step(abs(rpe), rpe)
+
+    history_fused, history_plain = fused.history.export(), plain.history.export()
+    for name in COLUMNS:
+        np.testing.assert_array_equal(history_fused[name], history_plain[name], err_msg=name)
+    assert fused.state_dict()["resistance"] == plain.state_dict()["resistance"]
+
+
+def test_kernel_matches_updates_at_boundaries():
+    config = BrainConfig()
+    kernel = compile_step_kernel(config)
+    brain = BiologicalBrain(config)
+
+    cortisols = [0.0, 0.6, 0.8, np.nextafter(0.8, 1.0), 1.0]
+    resistances = [0.5, np.nextafter(0.5, 1.0), 1.0, 1.495, 1.5]
+    agencies = [0.0, 1e-12, 0.5, 1.0]
+    signals = [0.0, 0.1, np.nextafter(0.1, 1.0), 2.0, -3.0]
+    for cortisol, resistance, agency, rpe in itertools.product(cortisols, resistances, agencies, signals):
+        brain.load_state_dict({"cortisol": cortisol, "resistance": resistance, "agency": agency,
+                               "amygdala": 0.0, "history": brain.history.state_dict()})
+        brain.update_amygdala(abs(rpe))
+        brain.update_agency(rpe)
+        expected = (brain.cortisol, brain.state_dict()["resistance"], brain.agency, brain.history.last("delta_agency"))
+        assert kernel(cortisol, resistance, agency, abs(rpe), rpe) == expected
+
+
+def test_recompiled_kernel_follows_config():
+    config = BrainConfig()
+    fused, plain = BiologicalBrain(config, use_kernel=True), BiologicalBrain(config)
+    config.erosion_rate = 0.2
+    fused.compile_kernel()
+    for rpe in np.linspace(-5, 5, 400).tolist():
+        assert fused.step(abs(rpe), rpe) == plain.step(abs(rpe), rpe)
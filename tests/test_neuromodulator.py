@@ -0,0 +1,41 @@
+import numpy as np
+
+from neuromodulator import CHANNELS, RECEPTORS, NeuroChemistry, NeuroChemistryPopulation
+
+
+def assert_same(population, synapses):
+    for row, (channel, receptor) in enumerate(zip(CHANNELS, RECEPTORS)):
+        np.testing.assert_array_equal(population.levels[row], [getattr(s, channel) for s in synapses], err_msg=channel)
+        np.testing.assert_array_equal(population.receptors[row], [getattr(s, receptor) for s in synapses],
+                                      err_msg=receptor)
+
+
+def test_population_matches_scalar_chemistry():
+    size = 10
+    population = NeuroChemistryPopulation(size)
+    synapses = [NeuroChemistry() for _ in range(size)]
+
+    rng = np.random.default_rng(4)
+    for t in range(800):
+        # Uzun ödül / stres fazları reseptörleri her iki sınıra da götürür.
+        reward = rng.uniform(-1, 3, size) * (t % 400 < 150)
+        stress = rng.uniform(0, 1.5, size) * (t % 400 >= 200)
+        action = rng.random(size) < 0.5
+        effective = population.update(reward, stress, action)
+        states = [s.update(r, st, a) for s, r, st, a in zip(synapses, reward.tolist(), stress.tolist(), action.tolist())]
+
+        assert_same(population, synapses)
+        np.testing.assert_array_equal(effective[0], [s["effective_dopamine"] for s in states])
+        np.testing.assert_array_equal(effective[1], [s["effective_serotonin"] for s in states])
+        np.testing.assert_array_equal(effective[2], [s["effective_norepinephrine"] for s in states])
+
+    assert population.receptors.min() == 0.5 and population.receptors.max() == 1.5
+
+
+def test_population_broadcasts_scalar_inputs():
+    population = NeuroChemistryPopulation(3)
+    synapse = NeuroChemistry()
+    for t in range(300):
+        population.update(2.0 if t < 100 else -0.5, 0.9 if t > 150 else 0.1, t % 2 == 0)
+        synapse.update(2.0 if t < 100 else -0.5, 0.9 if t > 150 else 0.1, t % 2 == 0)
+    assert_same(population, [synapse] * 3)
@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_runner(tmp_path, *extra):
+    output = tmp_path / "timeline.ndjson"
+    subprocess.run([sys.executable, os.path.join(ROOT, "runner.py"), "--steps", "2000", "--seed", "7",
+                    "--format", "ndjson", "--output", str(output), "--profile", *extra],
+                   check=True, cwd=ROOT, capture_output=True)
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    return records[-1]
+
+
+@pytest.mark.parametrize("extra", [
+    (),
+    ("--max_points", "100"),
+    ("--record", "change"),
+    ("--record", "change", "--max_points", "100"),
+])
+def test_profile_keeps_io_writer_through_sink_wrappers(tmp_path, extra):
+    footer = run_runner(tmp_path, *extra)
+    assert footer["status"] == "success"
+    sections = footer["profile"]["sections"]
+    assert "serialization" in sections
+    assert sections["io_writer"]["thread"] == "background"
+    assert sections["io_writer"]["calls"] > 0
@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from timeline import MemoryTimelineSink, read_binary_timeline
+
+ROOT = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+
+# runner.main()'i, CRASH_AT adımındaki checkpoint denetiminde süreci sert biçimde
+# (os._exit: tampon boşaltma / kapanış yok) sonlandırarak çalıştırır.
+CRASHING_RUNNER = """
+import os, sys
+sys.argv = ["runner.py"] + sys.argv[2:]
+import checkpoint, runner
+crash_at = int(os.environ["CRASH_AT"])
+maybe_save = checkpoint.Checkpointer.maybe_save
+def crashing(self, step):
+    if step == crash_at:
+        os._exit(3)
+    return maybe_save(self, step)
+checkpoint.Checkpointer.maybe_save = crashing
+runner.main()
+"""
+
+STEPS = 1000
+
+
+def run_runner(output, checkpoint, *extra, crash_at=None):
+    args = ["--steps", str(STEPS), "--seed", "11", "--scenario", "mixed", "--chunk_size", "96",
+            "--output", str(output), "--checkpoint", str(checkpoint), "--checkpoint_every", "250",
+            "--resume", *extra]
+    if crash_at is None:
+        command = [sys.executable, os.path.join(ROOT, "runner.py"), *args]
+        env = None
+    else:
+        command = [sys.executable, "-c", CRASHING_RUNNER, "--", *args]
+        env = {**os.environ, "CRASH_AT": str(crash_at)}
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == (0 if crash_at is None else 3), result.stdout + result.stderr
+
+
+def read_output(path, fmt):
+    if fmt == "ndjson":
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert [r["type"] for r in records].count("header") == 1
+        return [r for r in records if r["type"] != "header"]
+    if fmt == "binary":
+        header, columns = read_binary_timeline(str(path))
+        return header["rows"], header["final_stats"], {name: col.tolist() for name, col in columns.items()}
+    with open(path) as f:
+        data = json.load(f)
+    return data["final_stats"], data["timeline"], data.get("downsample"), data.get("recording")
+
+
+@pytest.mark.parametrize("fmt, extra", [
+    ("ndjson", ()),
+    ("binary", ()),
+    ("json", ()),
+    ("ndjson", ("--max_points", "64")),
+    ("binary", ("--record", "change,crossing", "--record_window", "3")),
+    ("json", ("--record", "stride", "--record_every", "7", "--max_points", "40")),
+])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, fmt, extra):
+    extra = ("--format", fmt, *extra)
+    reference = tmp_path / f"reference.{fmt}"
+    run_runner(reference, tmp_path / "reference.npz", *extra)
+
+    resumed = tmp_path / f"resumed.{fmt}"
+    run_runner(resumed, tmp_path / "resumed.npz", *extra, crash_at=640)
+    run_runner(resumed, tmp_path / "resumed.npz", *extra)
+
+    assert read_output(resumed, fmt) == read_output(reference, fmt)
+
+
+def test_resume_without_output_file_fails_loudly(tmp_path):
+    output = tmp_path / "run.ndjson"
+    run_runner(output, tmp_path / "run.npz", "--format", "ndjson", crash_at=640)
+    os.remove(output)
+    run_runner(output, tmp_path / "run.npz", "--format", "ndjson")
+    with open(output) as f:
+        result = json.load(f)
+    assert result["status"] == "error"
+    assert "run.ndjson" in result["error_message"]
+
+
+def make_chunk(start, n):
+    steps = np.arange(start, start + n)
+    return {"step": steps, "cortisol": steps * 0.5, "action": steps % 3}
+
+
+def test_memory_sink_checkpoints_only_new_rows(tmp_path):
+    spill = tmp_path / "run.npz.timeline"
+    sink = MemoryTimelineSink(spill_path=str(spill))
+    sink.write_chunk(make_chunk(0, 100))
+    first = sink.state_dict()
+    size = spill.stat().st_size
+    sink.write_chunk(make_chunk(100, 10))
+    second = sink.state_dict()
+
+    assert (first["rows"], second["rows"]) == (100, 110)
+    assert spill.stat().st_size == size * 110 // 100
+    assert sink.state_dict() == second and spill.stat().st_size == size * 110 // 100
+
+    # Checkpoint'ten sonra eklenen satırlar devam ederken atılır.
+    sink.write_chunk(make_chunk(110, 5))
+    sink.state_dict()
+    resumed = MemoryTimelineSink(spill_path=str(spill), resume=True)
+    resumed.load_state_dict(second)
+    assert spill.stat().st_size == size * 110 // 100
+    resumed.write_chunk(make_chunk(110, 7))
+    expected = {name: np.concatenate([make_chunk(0, 110)[name], make_chunk(110, 7)[name]]).tolist()
+                for name in ("step", "cortisol", "action")}
+    assert resumed.to_dict() == expected
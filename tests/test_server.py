@@ -0,0 +1,47 @@
+import json
+import queue
+import threading
+
+import pytest
+
+from server import RunnerDaemon
+
+
+def decode(line):
+    return json.loads(line) if isinstance(line, str) else line
+
+
+@pytest.fixture(scope="module")
+def daemon():
+    daemon = RunnerDaemon(workers=1)
+    yield daemon
+    daemon.close()
+
+
+def test_progress_precedes_result_from_one_thread(daemon):
+    received = queue.Queue()
+    send = lambda line: received.put((threading.get_ident(), decode(line)))
+    for rid in range(3):
+        daemon.submit({"id": rid, "steps": 2000, "seed": rid, "progress": True, "timeline": False}, send)
+
+    records = {rid: [] for rid in range(3)}
+    threads = set()
+    done = 0
+    while done < 3:
+        thread, record = received.get(timeout=60)
+        threads.add(thread)
+        records[record["id"]].append(record)
+        done += record["type"] == "result"
+
+    assert len(threads) == 1
+    for rid, stream in records.items():
+        assert [r["type"] for r in stream] == ["progress"] * 10 + ["result"]
+        assert [r["percent"] for r in stream[:-1]] == list(range(0, 100, 10))
+        assert stream[-1]["status"] == "success"
+
+
+def test_handle_line_errors_are_results(daemon):
+    received = queue.Queue()
+    daemon.handle_line(json.dumps({"id": "bad", "scenario": "nope"}), lambda line: received.put(decode(line)))
+    record = received.get(timeout=60)
+    assert record["type"] == "result" and record["status"] == "error"
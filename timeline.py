@@ -0,0 +1,503 @@
+"""
+WNEURA TIMELINE OUTPUT v1.0
+Developer: Efeatagul
+
+Description:
+    runner.py zaman çizelgesinin (timeline) yazım katmanı.
+    Adımlar sabit boyutlu parçalar (chunk) halinde biriktirilir ve bir
+    "sink"e verilir. Sink'ler:
+        - MemoryTimelineSink : Klasik davranış, tüm timeline tek JSON'a yazılır.
+        - NDJSONTimelineWriter : Satır başına bir kayıt (header / chunk / final_stats),
+                                 her parçadan sonra flush edilir; WSharp koşu bitmeden okuyabilir.
+        - BinaryTimelineWriter : Sabit genişlikli little-endian kolonlar + JSON şema başlığı.
+                                 read_binary_timeline() kolonları np.memmap ile kopyasız açar.
+    BackgroundWriter, herhangi bir sink'i arka plan thread'inde çalıştırır;
+    kuyruk sınırlı olduğu için bellek kullanımı adım sayısından bağımsızdır.
+
+    Tampon ve sink'lerin state_dict() çıktısı checkpoint'e yazılır. resume=True ile açılan
+    writer'lar dosyayı silmez; load_state_dict() dosyayı checkpoint anındaki konuma kırpar
+    ve koşu kesintisiz bir koşuyla aynı çıktıyı üreterek devam eder.
+"""
+
+import json
+import os
+import queue
+import shutil
+import struct
+import threading
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+
+TIMELINE_COLUMNS = {
+    "step": np.int64,
+    "cortisol": np.float64,
+    "agency": np.float64,
+    "rpe": np.float64,
+    "action": np.int64
+}
+
+
+class TimelineBuffer:
+    def __init__(self, chunk_size: int = 4096, columns: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            chunk_size: Bir parçadaki adım sayısı.
+            columns: Kolon adı -> dtype (varsayılan: TIMELINE_COLUMNS).
+        """
+        self.chunk_size = int(chunk_size)
+        self.columns = dict(columns or TIMELINE_COLUMNS)
+        self._size = 0
+        self._allocate()
+
+    def _allocate(self):
+        self._data = {name: np.empty(self.chunk_size, dtype=dtype) for name, dtype in self.columns.items()}
+        self._buffers = list(self._data.values())
+
+    def append(self, *values) -> bool:
+        """Bir adım ekler (kolon sırasıyla). Parça dolduysa True döndürür."""
+        i = self._size
+        for buf, value in zip(self._buffers, values):
+            buf[i] = value
+        self._size = i + 1
+        return self._size == self.chunk_size
+
+    def take(self) -> Dict[str, np.ndarray]:
+        """Dolu kısmı parça olarak devreder ve yeni bir tampon açar."""
+        chunk = {name: buf[:self._size] for name, buf in self._data.items()}
+        self._size = 0
+        self._allocate()
+        return chunk
+
+    def __len__(self) -> int:
+        return self._size
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Checkpoint için henüz sink'e verilmemiş satırlar."""
+        return {name: buf[:self._size].copy() for name, buf in self._data.items()}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        self._allocate()
+        self._size = len(state[next(iter(self.columns))])
+        for name, buf in self._data.items():
+            buf[:self._size] = state[name]
+
+
+def chunk_length(chunk: Dict[str, np.ndarray]) -> int:
+    return len(next(iter(chunk.values()))) if chunk else 0
+
+
+class MemoryTimelineSink:
+    def __init__(self, spill_path: Optional[str] = None, resume: bool = False):
+        """
+        Parçaları bellekte toplar (klasik tek dosyalık JSON çıktısı için).
+
+        Args:
+            spill_path: Verilirse state_dict() yalnızca önceki checkpoint'ten beri eklenen satırları
+                        bu dosyaya (satır kayıtları olarak) ekler ve satır sayısını döndürür;
+                        checkpoint başına maliyet toplam satır sayısından bağımsızdır.
+            resume: Var olan spill dosyasını silme (satırlar load_state_dict ile geri okunur).
+        """
+        self.chunks: List[Dict[str, np.ndarray]] = []
+        self.header: Dict[str, Any] = {}
+        self.footer: Dict[str, Any] = {}
+        self.spill_path = spill_path
+        self._spilled = 0
+        self._spilled_rows = 0
+        self._dtype: Optional[np.dtype] = None
+        if spill_path is not None and not resume:
+            open(spill_path, 'wb').close()
+
+    def write_header(self, header: Dict[str, Any]):
+        self.header = header
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        if chunk_length(chunk):
+            self.chunks.append(chunk)
+
+    def write_footer(self, footer: Dict[str, Any]):
+        self.footer = footer
+
+    def close(self):
+        pass
+
+    def to_dict(self) -> Dict[str, list]:
+        """Timeline'ı kolon -> liste sözlüğü olarak döndürür."""
+        if not self.chunks:
+            return {name: [] for name in TIMELINE_COLUMNS}
+        return {
+            name: np.concatenate([c[name] for c in self.chunks]).tolist()
+            for name in self.chunks[0]
+        }
+
+    def state_dict(self) -> Dict[str, Any]:
+        """
+        Checkpoint için o ana kadar toplanan satırlar: spill dosyası varsa yalnızca yeni parçalar
+        dosyaya eklenir ve {"rows", "dtype"} döner, yoksa tüm satırlar tek parça halinde döner.
+        """
+        if self.spill_path is None:
+            if not self.chunks:
+                return {"columns": {}}
+            return {"columns": {name: np.concatenate([c[name] for c in self.chunks]) for name in self.chunks[0]}}
+
+        pending = self.chunks[self._spilled:]
+        if pending:
+            if self._dtype is None:
+                self._dtype = np.dtype([(name, values.dtype) for name, values in pending[0].items()])
+            with open(self.spill_path, 'ab') as f:
+                for chunk in pending:
+                    records = np.empty(chunk_length(chunk), dtype=self._dtype)
+                    for name in self._dtype.names:
+                        records[name] = chunk[name]
+                    records.tofile(f)
+                    self._spilled_rows += len(records)
+                f.flush()
+                os.fsync(f.fileno())
+            self._spilled = len(self.chunks)
+
+        state = {"rows": self._spilled_rows}
+        if self._dtype is not None:
+            state["dtype"] = json.dumps(self._dtype.descr)
+        return state
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """
+        state_dict() çıktısını geri yükler. Spill dosyası checkpoint'teki satır sayısına kırpılır;
+        checkpoint'ten sonra eklenmiş (yarım kalmış olabilecek) kayıtlar atılır.
+        """
+        if "columns" in state:
+            columns = state["columns"]
+            self.chunks = [dict(columns)] if columns else []
+            return
+
+        if self.spill_path is None:
+            raise ValueError("Checkpoint timeline satırları spill dosyasında; MemoryTimelineSink(spill_path=...) gerekli.")
+        rows = int(state["rows"])
+        self.chunks = []
+        self._dtype = None
+        if rows:
+            self._dtype = np.dtype([tuple(field) for field in json.loads(str(state["dtype"]))])
+            size = rows * self._dtype.itemsize
+            if not os.path.exists(self.spill_path) or os.path.getsize(self.spill_path) < size:
+                raise ValueError(f"Timeline spill dosyası checkpoint'ten kısa: {self.spill_path}")
+            records = np.fromfile(self.spill_path, dtype=self._dtype, count=rows)
+            self.chunks = [{name: np.ascontiguousarray(records[name]) for name in self._dtype.names}]
+        with open(self.spill_path, 'ab') as f:
+            f.truncate(rows * (self._dtype.itemsize if self._dtype is not None else 0))
+        self._spilled = len(self.chunks)
+        self._spilled_rows = rows
+
+
+class NDJSONTimelineWriter:
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Akış (streaming) çıktısı: her satır bağımsız bir JSON kaydıdır.
+            {"type": "header", ...}
+            {"type": "chunk", "start": 0, "step": [...], "cortisol": [...], ...}
+            {"type": "final_stats", ...}
+
+        Args:
+            resume: Var olan dosyaya devam et (başlık korunur, konum load_state_dict ile gelir).
+        """
+        self.path = path
+        self.resume = resume
+        if resume and not os.path.exists(path):
+            raise ValueError(f"Devam edilecek timeline dosyası bulunamadı: {path}")
+        self._file = open(path, 'r+' if resume else 'w')
+        self._written = 0
+
+    def _write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, separators=(',', ':')))
+        self._file.write('\n')
+        self._file.flush()
+
+    def write_header(self, header: Dict[str, Any]):
+        if not self.resume:
+            self._write({"type": "header", **header})
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        n = chunk_length(chunk)
+        if not n:
+            return
+        record = {"type": "chunk", "start": self._written}
+        record.update({name: values.tolist() for name, values in chunk.items()})
+        self._write(record)
+        self._written += n
+
+    def write_footer(self, footer: Dict[str, Any]):
+        self._write({"type": "final_stats", **footer})
+
+    def close(self):
+        self._file.close()
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Yazılan satır sayısı ve dosya konumu (bayt)."""
+        self._file.flush()
+        return {"rows": self._written, "offset": self._file.tell()}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """Dosyayı checkpoint anındaki konuma kırpar; sonrasındaki kayıtlar (ve yarım satırlar) atılır."""
+        offset = int(state["offset"])
+        if os.path.getsize(self.path) < offset:
+            raise ValueError(f"Timeline dosyası checkpoint'ten kısa: {self.path}")
+        self._file.seek(offset)
+        self._file.truncate()
+        self._written = int(state["rows"])
+
+
+BINARY_MAGIC = b"WNTL"
+BINARY_VERSION = 1
+_PREAMBLE = struct.Struct("<4sIQ")
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+class BinaryTimelineWriter:
+    def __init__(self, path: str, capacity: int, float_dtype: str = "float64",
+                 columns: Optional[Dict[str, Any]] = None, resume: bool = False):
+        """
+        Kolon tabanlı ikili (binary) timeline dosyası.
+
+        Dosya düzeni (tüm sayılar little-endian):
+            [0:4]    magic  b"WNTL"
+            [4:8]    uint32 sürüm
+            [8:16]   uint64 JSON başlık uzunluğu (bayt)
+            [16:...] UTF-8 JSON başlık (boşlukla doldurulmuş)
+            Her kolon, başlıktaki "offset"ten başlayan ve "rows" elemanlık tek parça bir dizidir.
+
+        Başlık: {"rows", "capacity", "columns": [{"name", "dtype", "offset"}], "parameters", "final_stats", ...}
+
+        Args:
+            capacity: Maksimum adım sayısı (kolonlar önceden ayrılır).
+            float_dtype: Ondalıklı kolonlar için 'float64' ya da 'float32'.
+            resume: Var olan dosyaya devam et (kolon düzeni dosyanın başlığından okunur,
+                    satır sayısı load_state_dict ile gelir).
+        """
+        self.path = path
+        self.capacity = int(capacity)
+        float_code = np.dtype(float_dtype).newbyteorder("<").str
+        int_codes = {"step": "<i8", "action": "<i4"}
+
+        self.columns = []
+        for name, dtype in (columns or TIMELINE_COLUMNS).items():
+            code = float_code if np.dtype(dtype).kind == "f" else int_codes.get(name, "<i8")
+            self.columns.append({"name": name, "dtype": code})
+
+        self.meta: Dict[str, Any] = {}
+        self.rows = 0
+
+        if resume:
+            if not os.path.exists(path):
+                raise ValueError(f"Devam edilecek timeline dosyası bulunamadı: {path}")
+            self._file = open(path, "r+b")
+            header = _read_header(self._file, path)
+            self.capacity = int(header["capacity"])
+            self.columns = header["columns"]
+            self._header_size = self.columns[0]["offset"]
+            return
+
+        self._header_size = _align(_PREAMBLE.size + len(self._encode_header()) + 8192, 4096)
+        offset = self._header_size
+        for col in self.columns:
+            col["offset"] = offset
+            offset = _align(offset + self.capacity * np.dtype(col["dtype"]).itemsize, 64)
+
+        self._file = open(path, "w+b")
+        self._file.truncate(offset)
+        self._write_header()
+
+    def _encode_header(self) -> bytes:
+        header = {
+            **self.meta,
+            "format": "wneura-timeline",
+            "version": BINARY_VERSION,
+            "byte_order": "little",
+            "rows": self.rows,
+            "capacity": self.capacity,
+            "columns": self.columns
+        }
+        return json.dumps(header, separators=(',', ':')).encode("utf-8")
+
+    def _write_header(self):
+        payload = self._encode_header()
+        if _PREAMBLE.size + len(payload) > self._header_size:
+            raise ValueError("Binary timeline başlığı ayrılan alana sığmıyor.")
+        self._file.seek(0)
+        self._file.write(_PREAMBLE.pack(BINARY_MAGIC, BINARY_VERSION, len(payload)))
+        self._file.write(payload.ljust(self._header_size - _PREAMBLE.size, b" "))
+
+    def write_header(self, header: Dict[str, Any]):
+        self.meta.update(header)
+        self._write_header()
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        n = chunk_length(chunk)
+        if not n:
+            return
+        if self.rows + n > self.capacity:
+            raise ValueError(f"Binary timeline kapasitesi aşıldı ({self.capacity}).")
+        for col in self.columns:
+            dtype = np.dtype(col["dtype"])
+            self._file.seek(col["offset"] + self.rows * dtype.itemsize)
+            self._file.write(np.ascontiguousarray(chunk[col["name"]], dtype=dtype).tobytes())
+        self.rows += n
+
+    def write_footer(self, footer: Dict[str, Any]):
+        self.meta.update(footer)
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Yazılan satır sayısı (kolonlar bu satırdan itibaren üzerine yazılır)."""
+        self._file.flush()
+        return {"rows": self.rows}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """state_dict() çıktısını geri yükler."""
+        rows = int(state["rows"])
+        if rows > self.capacity:
+            raise ValueError(f"Checkpoint satır sayısı ({rows}) timeline kapasitesini ({self.capacity}) aşıyor.")
+        self.rows = rows
+
+    def close(self):
+        """
+        Son satır sayısı ve final_stats ile başlığı günceller. Yazılan satır sayısı
+        kapasitenin altındaysa kolonlar bitişik hale getirilir ve dosya kırpılır.
+        """
+        if self.rows < self.capacity:
+            self._compact()
+        self._write_header()
+        self._file.close()
+
+    def _compact(self):
+        """[DAHİLİ] Kolonları 'rows' kapasitesine göre öne kaydırır (ör. seyreltilmiş timeline)."""
+        offset = self._header_size
+        for col in self.columns:
+            size = self.rows * np.dtype(col["dtype"]).itemsize
+            if col["offset"] != offset:
+                self._file.seek(col["offset"])
+                data = self._file.read(size)
+                self._file.seek(offset)
+                self._file.write(data)
+                col["offset"] = offset
+            offset = _align(offset + size, 64)
+        self._file.truncate(offset)
+        self.capacity = self.rows
+
+
+def _read_header(f, path: str) -> Dict[str, Any]:
+    """[DAHİLİ] Açık binary timeline dosyasının JSON başlığını okur ve doğrular."""
+    f.seek(0)
+    magic, version, length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"Geçersiz WNEURA timeline dosyası: {path}")
+    if version > BINARY_VERSION:
+        raise ValueError(f"Desteklenmeyen timeline sürümü: {version}")
+    return json.loads(f.read(length).decode("utf-8"))
+
+
+def copy_binary_timeline(src, out, fields: Dict[str, Any]):
+    """
+    Binary timeline dosyasını (açık ikili dosya nesneleri) başlık alanlarını güncelleyerek kopyalar;
+    kolon verisi olduğu gibi aktarılır. Başlık, ilk kolona kadar ayrılmış alana sığmalıdır.
+    """
+    header = _read_header(src, getattr(src, "name", "<stream>"))
+    header.update(fields)
+    payload = json.dumps(header, separators=(',', ':')).encode("utf-8")
+    header_size = header["columns"][0]["offset"]
+    if _PREAMBLE.size + len(payload) > header_size:
+        raise ValueError("Binary timeline başlığı ayrılan alana sığmıyor.")
+    out.write(_PREAMBLE.pack(BINARY_MAGIC, BINARY_VERSION, len(payload)))
+    out.write(payload.ljust(header_size - _PREAMBLE.size, b" "))
+    src.seek(header_size)
+    shutil.copyfileobj(src, out, 1 << 20)
+
+
+def read_binary_timeline(path: str):
+    """
+    Binary timeline dosyasını açar. Kolonlar np.memmap'tir (kopyasız, salt-okunur);
+    dosya tamamen belleğe yüklenmeden dilimlenebilir.
+
+    Returns:
+        (header sözlüğü, kolon adı -> np.memmap)
+    """
+    with open(path, "rb") as f:
+        header = _read_header(f, path)
+
+    rows = header["rows"]
+    columns = {
+        col["name"]: np.memmap(path, dtype=np.dtype(col["dtype"]), mode="r",
+                               offset=col["offset"], shape=(rows,))
+        for col in header["columns"]
+    } if rows else {col["name"]: np.empty(0, dtype=np.dtype(col["dtype"])) for col in header["columns"]}
+    return header, columns
+
+
+class BackgroundWriter:
+    _STOP = object()
+
+    def __init__(self, sink: Any, max_pending: int = 4):
+        """
+        Sink yazımlarını arka plan thread'ine taşır.
+
+        Args:
+            sink: write_header / write_chunk / write_footer / close metodlarına sahip nesne.
+            max_pending: Kuyrukta bekleyebilecek en fazla kayıt (bellek sınırı).
+        """
+        self.sink = sink
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="wneura-timeline-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                break
+            if self._error is None:
+                method, payload = item
+                try:
+                    getattr(self.sink, method)(payload)
+                except BaseException as e:
+                    self._error = e
+            self._queue.task_done()
+
+    def _submit(self, method: str, payload: Any):
+        if self._error is not None:
+            raise self._error
+        self._queue.put((method, payload))
+
+    def write_header(self, header: Dict[str, Any]):
+        self._submit("write_header", header)
+
+    def write_chunk(self, chunk: Dict[str, np.ndarray]):
+        self._submit("write_chunk", chunk)
+
+    def write_footer(self, footer: Dict[str, Any]):
+        self._submit("write_footer", footer)
+
+    def drain(self):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler (thread açık kalır)."""
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Kuyruğu boşaltır; checkpoint konumu yazılmış kayıtlara karşılık gelir."""
+        self.drain()
+        return self.sink.state_dict()
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.drain()
+        self.sink.load_state_dict(state)
+
+    def close(self):
+        """Kuyruğu boşaltır, thread'i durdurur ve sink'i kapatır."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self.sink.close()
+        if self._error is not None:
+            raise self._error